@@ -0,0 +1,5 @@
+# Admission Control Module
+
+from .cost_model import CostEstimate, CostModel, calibrate, get_cost_model
+from .controller import AdmissionController, AdmissionRejected, get_admission_controller
+from .single_flight import SingleFlight, get_single_flight, request_key
\ No newline at end of file
@@ -0,0 +1,137 @@
+# admission/controller.py
+
+import asyncio
+import contextlib
+import os
+from typing import Awaitable, Callable, Optional
+
+from .cost_model import CostEstimate
+
+
+class AdmissionRejected(Exception):
+    """A build was refused; carries the HTTP status and an optional Retry-After"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[int] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Admits worksheet builds against per-request and per-instance budgets.
+
+    Requests predicted to exceed the per-request limits (or the whole
+    memory budget) are rejected outright, even on an idle instance.
+    Expensive builds (CPU estimate at or above `expensive_cpu_ms`) share
+    `max_expensive` slots, and every build's predicted memory counts
+    against `memory_budget_mb`. A build that doesn't fit waits in a bounded
+    queue for up to `queue_timeout` seconds; cheap builds never wait on the
+    expensive slots, so ordinary requests keep their latency while a large
+    sheet renders.
+    """
+
+    def __init__(self, max_request_cpu_ms: float = 30000, max_request_memory_mb: float = 192,
+                 memory_budget_mb: float = 256, expensive_cpu_ms: float = 2000,
+                 max_expensive: int = 1, max_queued: int = 8, queue_timeout: float = 30):
+        self.max_request_cpu_ms = max_request_cpu_ms
+        self.max_request_memory_mb = max_request_memory_mb
+        self.memory_budget_mb = memory_budget_mb
+        self.expensive_cpu_ms = expensive_cpu_ms
+        self.max_expensive = max_expensive
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+
+        self.running_expensive = 0
+        self.reserved_mb = 0.0
+        self.queued = 0
+        # Created on first use so it binds to the server's event loop
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _fits(self, estimate: CostEstimate, expensive: bool) -> bool:
+        if expensive and self.running_expensive >= self.max_expensive:
+            return False
+        return self.reserved_mb + estimate.memory_mb <= self.memory_budget_mb
+
+    async def acquire(self, estimate: CostEstimate) -> Callable[[], Awaitable[None]]:
+        """
+        Reserve budget for one build, waiting if needed.
+
+        Returns the call that gives the budget back; calling it more than
+        once is harmless. Prefer `admit` unless the work outlives the block,
+        like a streamed response.
+        """
+        max_memory_mb = min(self.max_request_memory_mb, self.memory_budget_mb)
+        if estimate.cpu_ms > self.max_request_cpu_ms or estimate.memory_mb > max_memory_mb:
+            raise AdmissionRejected(
+                413, f"Worksheet too large: about {estimate.problems} problems, estimated"
+                     f" {estimate.cpu_ms / 1000:.1f}s and {estimate.memory_mb:.0f} MB to build."
+                     " Try fewer questions or students.")
+
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        condition = self._condition
+        expensive = estimate.cpu_ms >= self.expensive_cpu_ms
+
+        async with condition:
+            if not self._fits(estimate, expensive):
+                if self.queued >= self.max_queued:
+                    raise AdmissionRejected(503, "Server busy, try again shortly",
+                                            retry_after=max(1, int(estimate.cpu_ms / 1000)))
+                self.queued += 1
+                try:
+                    await asyncio.wait_for(condition.wait_for(lambda: self._fits(estimate, expensive)),
+                                           self.queue_timeout)
+                except asyncio.TimeoutError:
+                    raise AdmissionRejected(503, "Server busy, try again shortly",
+                                            retry_after=int(self.queue_timeout)) from None
+                finally:
+                    self.queued -= 1
+            self.reserved_mb += estimate.memory_mb
+            if expensive:
+                self.running_expensive += 1
+
+        released = False
+
+        async def release():
+            nonlocal released
+            if released:
+                return
+            released = True
+            async with condition:
+                self.reserved_mb = max(0.0, self.reserved_mb - estimate.memory_mb)
+                if expensive:
+                    self.running_expensive -= 1
+                condition.notify_all()
+
+        return release
+
+    @contextlib.asynccontextmanager
+    async def admit(self, estimate: CostEstimate):
+        """Hold budget for one build for the duration of the block, waiting if needed"""
+        release = await self.acquire(estimate)
+        try:
+            yield
+        finally:
+            await release()
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Return the process-wide controller, configured from the environment on first use"""
+    global _controller
+    if _controller is None:
+        env = os.environ.get
+        _controller = AdmissionController(
+            max_request_cpu_ms=float(env("MAX_REQUEST_CPU_MS", 30000)),
+            max_request_memory_mb=float(env("MAX_REQUEST_MEMORY_MB", 192)),
+            memory_budget_mb=float(env("BUILD_MEMORY_BUDGET_MB", 256)),
+            expensive_cpu_ms=float(env("EXPENSIVE_BUILD_CPU_MS", 2000)),
+            max_expensive=int(env("MAX_EXPENSIVE_BUILDS", 1)),
+            max_queued=int(env("MAX_QUEUED_BUILDS", 8)),
+            queue_timeout=float(env("ADMISSION_QUEUE_TIMEOUT", 30)),
+        )
+    return _controller
\ No newline at end of file
@@ -0,0 +1,238 @@
+# admission/cost_model.py
+
+import json
+import os
+import re
+from typing import Dict, Any, Optional, List, Tuple
+
+from problem_generators.problems import concept_category, expand_concepts
+
+# Calibration shipped with the backend; regenerate with `python -m benchmarks calibrate`
+CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cost_calibration.json")
+
+# Adaptive spiral worksheets can add up to this many review problems
+_SPIRAL_REVIEW_ALLOWANCE = 3
+
+# Estimates are scaled up by this much, so builds that run slower or larger
+# than the calibration machine measured still stay inside the limits
+SAFETY_MARGIN = 1.25
+
+# Problems a streamed export holds at once (iter_problems' chunk size)
+_STREAM_CHUNK = 100
+
+# Problems per fluency case in the benchmarks' generation suite
+GENERATION_CASE_PROBLEMS = 15
+
+
+class CostEstimate:
+    """Predicted size, CPU time and peak memory of one build"""
+
+    def __init__(self, problems: int, cpu_ms: float, memory_mb: float):
+        self.problems = problems
+        self.cpu_ms = cpu_ms
+        self.memory_mb = memory_mb
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"problems": self.problems, "cpu_ms": round(self.cpu_ms, 1),
+                "memory_mb": round(self.memory_mb, 1)}
+
+
+class CostModel:
+    """
+    Linear cost model for worksheet builds.
+
+    CPU time and memory grow with the number of problems, scaled by how
+    expensive each concept's problems are to lay out and draw (clocks,
+    coins and graphs cost more than vertical math) and by the answer key.
+    Long sheets also pay a quadratic term, as ReportLab re-measures the
+    rest of a long section at every page break; it isn't scaled by the
+    concept weights, which are fitted on short sheets. Memory is peak RSS,
+    not just the Python heap, and every estimate carries the safety margin.
+    """
+
+    def __init__(self, calibration: Dict[str, Any]):
+        self.base_ms = calibration["base_ms"]
+        self.per_problem_ms = calibration["per_problem_ms"]
+        self.per_problem_sq_ms = calibration.get("per_problem_sq_ms", 0.0)
+        self.answer_key_factor = calibration["answer_key_factor"]
+        self.base_mb = calibration["base_mb"]
+        self.per_problem_kb = calibration["per_problem_kb"]
+        self.generation_ms = calibration.get("generation_ms", 0.1)
+        self.safety_margin = calibration.get("safety_margin", SAFETY_MARGIN)
+        self.category_weights = calibration.get("category_weights", {})
+        self.memory_weights = calibration.get("memory_weights", {})
+
+    def _weight(self, weights: Dict[str, float], concepts: List[str]) -> float:
+        """Mean weight of the concepts' categories (unknown categories count as 1)"""
+        categories = [concept_category(c) for c in concepts]
+        values = [weights.get(c, 1.0) for c in categories if c]
+        return sum(values) / len(values) if values else 1.0
+
+    def _sheet(self, worksheet_type: str, concepts: List[str],
+               question_count: Optional[int]) -> Tuple[int, List[str]]:
+        """
+        Problems on one sheet and the concepts they come from.
+
+        Fluency sheets have `question_count` problems; spiral sheets get about
+        one problem per subconcept, plus possible adaptive review.
+        """
+        if worksheet_type == "fluency":
+            return max(0, question_count or 15), concepts
+        per_sheet_concepts = expand_concepts(concepts)
+        return len(per_sheet_concepts) + _SPIRAL_REVIEW_ALLOWANCE, per_sheet_concepts
+
+    def estimate(self, worksheet_type: str, concepts: List[str], question_count: Optional[int],
+                 include_answer_key: bool = False, copies: int = 1) -> CostEstimate:
+        """Predict the cost of building `copies` worksheets into one PDF"""
+        per_sheet, per_sheet_concepts = self._sheet(worksheet_type, concepts, question_count)
+        copies = max(1, copies)
+        problems = per_sheet * copies
+
+        key = self.answer_key_factor if include_answer_key else 1.0
+        weight = self._weight(self.category_weights, per_sheet_concepts)
+        layout_ms = copies * (per_sheet * self.per_problem_ms * weight + per_sheet ** 2 * self.per_problem_sq_ms)
+        cpu_ms = self.base_ms + layout_ms * key
+        memory_mb = self.base_mb + problems * self.per_problem_kb * self._weight(self.memory_weights, per_sheet_concepts) / 1024
+        return CostEstimate(problems, cpu_ms * self.safety_margin, memory_mb * self.safety_margin)
+
+    def estimate_generation(self, worksheet_type: str, concepts: List[str], question_count: Optional[int],
+                            streamed: bool = False) -> CostEstimate:
+        """
+        Predict the cost of generating a worksheet's problems without a PDF
+        (previews and problem exports). A streamed export holds one chunk
+        of problems at a time; otherwise the whole sheet is held, costing
+        about as much memory per problem as a PDF's layout.
+        """
+        problems, per_sheet_concepts = self._sheet(worksheet_type, concepts, question_count)
+        held = min(problems, _STREAM_CHUNK) if streamed else problems
+        cpu_ms = problems * self.generation_ms
+        memory_mb = held * self.per_problem_kb * self._weight(self.memory_weights, per_sheet_concepts) / 1024
+        return CostEstimate(problems, cpu_ms * self.safety_margin, memory_mb * self.safety_margin)
+
+    def estimate_separate(self, sheets: List[Tuple[List[str], int]], include_answer_key: bool = False,
+                          parallel: int = 1) -> CostEstimate:
+        """
+        Predict the cost of building each (concepts, problem count) sheet
+        into its own PDF, `parallel` at a time in separate processes (a
+        semester's days). CPU adds up across sheets; memory is the largest
+        sheets in flight at once.
+        """
+        estimates = [self.estimate("fluency", concepts, count, include_answer_key) for concepts, count in sheets]
+        largest = sorted((e.memory_mb for e in estimates), reverse=True)[:max(1, parallel)]
+        return CostEstimate(sum(e.problems for e in estimates), sum(e.cpu_ms for e in estimates), sum(largest))
+
+
+def _fit_line(points: List[Tuple[float, float]]) -> Tuple[float, float]:
+    """Least-squares (intercept, slope) through (x, y) points"""
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x if var_x else 0.0
+    return mean_y - slope * mean_x, slope
+
+
+def _fit_scale(points: List[Tuple[float, float]]) -> float:
+    """Least-squares slope of a line through the origin"""
+    denominator = sum(x * x for x, _ in points)
+    return sum(x * y for x, y in points) / denominator if denominator else 0.0
+
+
+def calibrate(results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fit cost model coefficients from a benchmark results document.
+
+    Needs the pdf suite's fluency cases at two or more sizes; per-category
+    weights come from the pdf/category cases and generation speed from the
+    generation suite when present. Memory is fitted to the rss suite's
+    isolated fluency builds, and the quadratic layout term to all its
+    builds (every category it covers); without them memory falls back to
+    the traced heap plus a fixed process overhead, which underestimates
+    large sheets.
+    """
+    cases = results["results"]
+    timings: Dict[bool, List[Tuple[int, float]]] = {False: [], True: []}
+    heap: List[Tuple[int, float]] = []
+    isolated: List[Tuple[int, Dict[str, Any]]] = []
+    long_sheets: List[Tuple[Optional[str], int, float]] = []
+    generation: List[float] = []
+    for name, stats in cases.items():
+        match = re.fullmatch(r"pdf/fluency/(\d+)/(key|nokey)", name)
+        if match:
+            size, with_key = int(match.group(1)), match.group(2) == "key"
+            timings[with_key].append((size, stats["p50_ms"]))
+            if not with_key and "traced_peak_kb" in stats:
+                heap.append((size, stats["traced_peak_kb"]))
+        match = re.fullmatch(r"rss/(?:fluency|category/(\w+))/(\d+)/key", name)
+        if match:
+            long_sheets.append((match.group(1), int(match.group(2)), stats["p50_ms"]))
+            if match.group(1) is None and stats.get("child_peak_rss_mb"):
+                isolated.append((int(match.group(2)), stats))
+        if re.fullmatch(r"generate/\w+/\w+/\w+", name):
+            generation.append(stats["p50_ms"] / GENERATION_CASE_PROBLEMS)
+    if len(timings[False]) < 2:
+        raise ValueError("Calibration needs pdf/fluency results at two or more sizes")
+
+    base_ms, per_problem_ms = _fit_line(timings[False])
+    no_key = dict(timings[False])
+    ratios = [ms / no_key[size] for size, ms in timings[True] if no_key.get(size)]
+    answer_key_factor = sum(ratios) / len(ratios) if ratios else 1.0
+    base_kb, heap_per_problem_kb = _fit_line(heap) if len(heap) >= 2 else (0.0, 0.0)
+
+    if len(isolated) >= 2:
+        base_mb, rss_per_problem_mb = _fit_line([(size, stats["child_peak_rss_mb"]) for size, stats in isolated])
+        per_problem_kb = rss_per_problem_mb * 1024
+    else:
+        # Process overhead on top of the traced Python heap (fonts, interpreter, allocator slack)
+        base_mb, per_problem_kb = 40 + max(0.0, base_kb) / 1024, heap_per_problem_kb
+
+    category_weights, memory_weights = {}, {}
+    for name, stats in cases.items():
+        match = re.fullmatch(r"pdf/category/(\w+)/(\d+)", name)
+        if not match:
+            continue
+        category, size = match.group(1), int(match.group(2))
+        category_weights[category] = round(max(0.1, (stats["p50_ms"] - base_ms) / (size * per_problem_ms)), 2)
+        if heap_per_problem_kb > 0 and "traced_peak_kb" in stats:
+            memory_weights[category] = round(
+                max(0.1, (stats["traced_peak_kb"] - base_kb) / (size * heap_per_problem_kb)), 2)
+
+    # Whatever the isolated builds took beyond the linear fit is the page-break
+    # re-measuring, which doesn't shrink with a category's short-sheet weight.
+    # Fitted to the category that needs the most, so none is underestimated.
+    per_problem_sq_ms = 0.0
+    if long_sheets:
+        excess: Dict[Optional[str], List[Tuple[float, float]]] = {}
+        for category, size, ms in long_sheets:
+            linear_ms = base_ms + size * per_problem_ms * category_weights.get(category, 1.0)
+            excess.setdefault(category, []).append((size ** 2, ms / answer_key_factor - linear_ms))
+        per_problem_sq_ms = max(0.0, max(_fit_scale(points) for points in excess.values()))
+
+    calibration = {
+        "base_ms": round(max(0.0, base_ms), 2),
+        "per_problem_ms": round(per_problem_ms, 3),
+        "per_problem_sq_ms": round(per_problem_sq_ms, 7),
+        "answer_key_factor": round(answer_key_factor, 3),
+        "base_mb": round(max(0.0, base_mb), 1),
+        "per_problem_kb": round(per_problem_kb, 2),
+        "safety_margin": SAFETY_MARGIN,
+        "category_weights": category_weights,
+        "memory_weights": memory_weights,
+        "source": {"created": results.get("created"), "python": results.get("python"),
+                   "platform": results.get("platform")},
+    }
+    if generation:
+        calibration["generation_ms"] = round(sum(generation) / len(generation), 4)
+    return calibration
+
+
+_cost_model: Optional[CostModel] = None
+
+
+def get_cost_model() -> CostModel:
+    """Return the process-wide cost model, loading the shipped calibration on first use"""
+    global _cost_model
+    if _cost_model is None:
+        with open(os.environ.get("COST_CALIBRATION", CALIBRATION_PATH)) as f:
+            _cost_model = CostModel(json.load(f))
+    return _cost_model
\ No newline at end of file
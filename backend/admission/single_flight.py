@@ -0,0 +1,62 @@
+# admission/single_flight.py
+
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+def request_key(kind: str, settings: Dict[str, Any]) -> str:
+    """Stable key for a build: the endpoint kind plus its settings, independent of field order"""
+    encoded = json.dumps([kind, settings], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SingleFlight:
+    """
+    Collapses identical concurrent builds into one.
+
+    The first caller for a key starts the build as its own task; callers that
+    arrive while it runs await the same task. Each caller waits through
+    `asyncio.shield`, so a client disconnecting cancels only its own wait,
+    never the build the others are waiting on. Once the build finishes the
+    key is released; later requests start a fresh build.
+    """
+
+    def __init__(self):
+        self._builds: Dict[str, "asyncio.Task"] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def _release(self, key: str, task: "asyncio.Task") -> None:
+        if self._builds.get(key) is task:
+            del self._builds[key]
+        # Nobody may be left waiting; mark a failure as retrieved so it isn't logged as lost
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, build: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the result of `build()`, sharing it with concurrent callers of the same key"""
+        task = self._builds.get(key)
+        if task is None:
+            task = asyncio.ensure_future(build())
+            self._builds[key] = task
+            task.add_done_callback(lambda t: self._release(key, t))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self._builds), "started": self.started, "coalesced": self.coalesced}
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight group, creating it on first use"""
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
\ No newline at end of file
@@ -0,0 +1,4 @@
+# Benchmark Suite Module
+
+from .harness import measure, compare_results
+from .suites import SUITES, run_suites
\ No newline at end of file
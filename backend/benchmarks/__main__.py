@@ -0,0 +1,257 @@
+# benchmarks/__main__.py
+"""
+Benchmark CLI. Run from the backend directory:
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks run --suite pdf --quick --baseline baseline.json
+    python -m benchmarks compare baseline.json results.json
+    python -m benchmarks run --suite generation pdf rss --output results.json
+    python -m benchmarks calibrate results.json
+    python -m benchmarks importtime --budget-ms 600 --forbid reportlab
+    python -m benchmarks load --spawn --concurrency 8 --duration 30
+    python -m benchmarks load --url http://127.0.0.1:8000 --rate 5 --duration 60
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from .harness import compare_results
+from .suites import SUITES, run_suites
+
+
+def _report_regressions(baseline, current, threshold) -> int:
+    regressions = compare_results(baseline, current, threshold)
+    if not regressions:
+        print(f"No regressions over {threshold:.0%} against the baseline", file=sys.stderr)
+        return 0
+    print(f"{len(regressions)} case(s) regressed over {threshold:.0%}:", file=sys.stderr)
+    for r in regressions:
+        print(f"  {r['case']:<60} {r['baseline_p50_ms']:>8.2f} -> {r['current_p50_ms']:>8.2f} ms"
+              f"  (+{r['change']:.0%})", file=sys.stderr)
+    return 1
+
+
+def _run(args) -> int:
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    # Generators and the app write scratch files relative to the working
+    # directory; keep them out of the source tree
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="k2_bench_") as workdir:
+        os.chdir(workdir)
+        try:
+            results = run_suites(args.suite, quick=args.quick, workdir=workdir, case_filter=args.filter)
+        finally:
+            os.chdir(original_dir)
+
+    document = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": results,
+    }
+    if output:
+        with open(output, "w") as f:
+            json.dump(document, f, indent=2)
+        print(f"Results saved to {output}", file=sys.stderr)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+
+    return _report_regressions(baseline, document, args.threshold) if baseline else 0
+
+
+def _compare(args) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    return _report_regressions(baseline, current, args.threshold)
+
+
+def _calibrate(args) -> int:
+    from admission.cost_model import CALIBRATION_PATH, calibrate
+
+    with open(args.results) as f:
+        results = json.load(f)
+    try:
+        calibration = calibrate(results)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    output = args.output or CALIBRATION_PATH
+    with open(output, "w") as f:
+        json.dump(calibration, f, indent=2)
+    print(f"Calibration saved to {output}: {calibration['base_ms']} ms +"
+          f" {calibration['per_problem_ms']} ms/problem", file=sys.stderr)
+    return 0
+
+
+def _importtime(args) -> int:
+    from .importtime import check_import_budget, measure_imports
+
+    profile = measure_imports(args.module, args.runs)
+    print(f"import {args.module}: {profile['total_ms']:.1f} ms median of {args.runs}"
+          f" (runs {profile['runs_ms']}), {profile['modules']} modules", file=sys.stderr)
+    for entry in profile["packages"][:args.top]:
+        print(f"  {entry['package']:<30} {entry['self_ms']:>8.1f} ms", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(profile, f, indent=2)
+
+    violations = check_import_budget(profile, args.budget_ms, args.forbid)
+    for violation in violations:
+        print(f"FAIL: {violation}", file=sys.stderr)
+    return 1 if violations else 0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _spawn_server(workers: int, workdir: str):
+    """Start uvicorn on a free local port; returns (process, base URL) once it answers"""
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", backend_dir,
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=workdir, stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(base_url + "/", timeout=1).close()
+            return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start within 30 seconds")
+
+
+def _print_load_summary(summary):
+    print(f"{summary['elapsed_s']:.1f}s against {summary['base_url']}"
+          f" (concurrency {summary['concurrency']}, rate {summary['rate'] or 'closed loop'}),"
+          f" {summary['dropped']} arrivals dropped", file=sys.stderr)
+    for endpoint, s in summary["endpoints"].items():
+        print(f"  {endpoint:<10} {s['requests']:>6} req  {s['throughput_rps']:>7.2f} req/s"
+              f"  errors {s['error_rate']:>6.1%}  p50 {s['p50_ms']:>8.1f}  p95 {s['p95_ms']:>8.1f}"
+              f"  p99 {s['p99_ms']:>8.1f}  max {s['max_ms']:>8.1f} ms", file=sys.stderr)
+        if s["errors"]:
+            print(f"             {s['errors']}", file=sys.stderr)
+
+
+def _load(args) -> int:
+    from .load import RequestMix, run_load
+
+    mix_options = {}
+    if args.mix:
+        with open(args.mix) as f:
+            mix_options = json.load(f)
+    if args.spiral_ratio is not None:
+        mix_options["spiral_ratio"] = args.spiral_ratio
+    if args.answer_key_rate is not None:
+        mix_options["answer_key_rate"] = args.answer_key_rate
+    mix = RequestMix.from_dict(mix_options)
+
+    if not args.url and not args.spawn:
+        print("Pass --url of a running server or --spawn to start one", file=sys.stderr)
+        return 2
+
+    with tempfile.TemporaryDirectory(prefix="k2_load_") as workdir:
+        process = None
+        base_url = args.url
+        if args.spawn:
+            process, base_url = _spawn_server(args.workers, workdir)
+        try:
+            summary = asyncio.run(run_load(base_url, mix, args.duration, args.concurrency,
+                                           args.rate, args.seed))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=10)
+
+    _print_load_summary(summary)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Worksheet generation and rendering benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmark suites")
+    run.add_argument("--suite", nargs="+", choices=list(SUITES), default=list(SUITES),
+                     help="suites to run (default: all)")
+    run.add_argument("--quick", action="store_true", help="smaller sizes and shorter runs")
+    run.add_argument("--filter", help="only run cases whose name contains this text")
+    run.add_argument("--output", help="write results JSON here (default: stdout)")
+    run.add_argument("--baseline", help="results JSON to check for regressions against")
+    run.add_argument("--threshold", type=float, default=0.10,
+                     help="allowed p50 slowdown before a case counts as regressed (default: 0.10)")
+    run.set_defaults(handler=_run)
+
+    compare = commands.add_parser("compare", help="compare two results files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.10)
+    compare.set_defaults(handler=_compare)
+
+    calibration = commands.add_parser("calibrate", help="fit the admission cost model to benchmark results")
+    calibration.add_argument("results", help="results JSON from a full (not --quick) generation, pdf and rss run")
+    calibration.add_argument("--output", help="where to write the calibration (default: the shipped file)")
+    calibration.set_defaults(handler=_calibrate)
+
+    importtime = commands.add_parser("importtime", help="profile cold imports (python -X importtime)")
+    importtime.add_argument("--module", default="main", help="module to import (default: main)")
+    importtime.add_argument("--runs", type=int, default=5, help="fresh interpreters to run (default: 5)")
+    importtime.add_argument("--top", type=int, default=12, help="packages to list by self time")
+    importtime.add_argument("--budget-ms", type=float, help="fail if the median import takes longer")
+    importtime.add_argument("--forbid", action="append", default=[],
+                            help="fail if this package is loaded by the import (repeatable)")
+    importtime.add_argument("--output", help="write the median profile JSON here")
+    importtime.set_defaults(handler=_importtime)
+
+    load = commands.add_parser("load", help="generate HTTP load against a local server")
+    load.add_argument("--url", help="base URL of a running server, e.g. http://127.0.0.1:8000")
+    load.add_argument("--spawn", action="store_true", help="start a local uvicorn for the run")
+    load.add_argument("--workers", type=int, default=1, help="uvicorn workers with --spawn")
+    load.add_argument("--duration", type=float, default=30, help="seconds to run (default: 30)")
+    load.add_argument("--concurrency", type=int, default=4,
+                      help="simulated users, or connection limit with --rate (default: 4)")
+    load.add_argument("--rate", type=float, help="open loop: sessions started per second")
+    load.add_argument("--mix", help="JSON file of RequestMix options")
+    load.add_argument("--spiral-ratio", type=float, help="share of spiral worksheets")
+    load.add_argument("--answer-key-rate", type=float, help="share of requests with an answer key")
+    load.add_argument("--seed", type=int, help="seed for a repeatable request sequence")
+    load.add_argument("--output", help="write the summary JSON here")
+    load.set_defaults(handler=_load)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
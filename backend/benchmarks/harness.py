@@ -0,0 +1,123 @@
+# benchmarks/harness.py
+
+import math
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Any, Optional, List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MiB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def child_peak_rss_mb() -> Optional[float]:
+    """Largest peak RSS of any finished child process so far, in MiB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def traced_peak_kb(fn: Callable[[], Any]) -> float:
+    """Peak Python heap growth during one call of `fn`, via tracemalloc (slow)"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(fn: Callable[[], Any], min_time: float = 1.0, min_iterations: int = 3,
+            max_iterations: int = 1000, warmup: int = 1, trace_memory: bool = False,
+            child_memory: bool = False) -> Dict[str, Any]:
+    """
+    Time repeated calls of `fn`.
+
+    Runs `warmup` untimed calls, then keeps calling until both `min_time`
+    seconds and `min_iterations` calls have passed (or `max_iterations` is hit).
+    With `trace_memory`, one extra untimed call measures the heap peak;
+    with `child_memory`, the peak RSS of child processes is recorded.
+
+    Returns:
+        Latency percentiles and mean in milliseconds, ops/sec, iteration
+        count, the process's peak RSS after the run and (if traced) the
+        call's traced heap peak or the children's peak RSS
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_iterations:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+        if len(samples) >= min_iterations and time.perf_counter() - started >= min_time:
+            break
+
+    samples.sort()
+    total = sum(samples)
+    stats = {
+        "iterations": len(samples),
+        "ops_per_sec": len(samples) / total if total else 0.0,
+        "mean_ms": total / len(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if trace_memory:
+        stats["traced_peak_kb"] = traced_peak_kb(fn)
+    if child_memory:
+        stats["child_peak_rss_mb"] = child_peak_rss_mb()
+    return stats
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Find cases whose median latency regressed against a baseline run.
+
+    Args:
+        baseline, current: result documents written by the benchmark CLI
+        threshold: allowed slowdown as a fraction of the baseline p50
+
+    Returns:
+        One entry per regressed case, worst first
+    """
+    regressions = []
+    base_cases = baseline.get("results", {})
+    for name, result in current.get("results", {}).items():
+        base = base_cases.get(name)
+        if not base or not base.get("p50_ms"):
+            continue
+        change = result["p50_ms"] / base["p50_ms"] - 1
+        if change > threshold:
+            regressions.append({
+                "case": name,
+                "baseline_p50_ms": base["p50_ms"],
+                "current_p50_ms": result["p50_ms"],
+                "change": change,
+            })
+    regressions.sort(key=lambda r: -r["change"])
+    return regressions
\ No newline at end of file
@@ -0,0 +1,107 @@
+# benchmarks/httpclient.py
+
+import asyncio
+import json
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class HTTPConnection:
+    """
+    A keep-alive HTTP/1.1 connection built on asyncio streams.
+
+    Just enough client for load testing the local server: requests are sent
+    one at a time, bodies are read by Content-Length or chunked encoding, and
+    the connection is reopened transparently if the server closed it while
+    idle. A request is only resent if no part of its response arrived.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 60.0):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http":
+            raise ValueError("Only plain http:// URLs are supported")
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # Set once a response's status line has been read
+        self._response_started = False
+
+    async def _connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self._reader = self._writer = None
+
+    async def request(self, method: str, path: str, json_body: Optional[Any] = None,
+                      headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """Send a request and return (status, lower-cased headers, body)"""
+        body = json.dumps(json_body).encode() if json_body is not None else b""
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                 f"Content-Length: {len(body)}"]
+        if json_body is not None:
+            lines.append("Content-Type: application/json")
+        lines.extend(f"{k}: {v}" for k, v in (headers or {}).items())
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+        # A kept-alive connection may have been closed by the server while idle;
+        # retry once then, but never once any of the response has arrived
+        for attempt in (0, 1):
+            reused = self._writer is not None
+            if not reused:
+                await self._connect()
+            self._response_started = False
+            try:
+                self._writer.write(payload)
+                await self._writer.drain()
+                return await asyncio.wait_for(self._read_response(method), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                await self.close()
+                received = self._response_started or bool(getattr(e, "partial", b""))
+                if attempt or not reused or received:
+                    raise
+            except asyncio.TimeoutError:
+                await self.close()
+                raise
+
+    async def _read_response(self, method: str) -> Tuple[int, Dict[str, str], bytes]:
+        reader = self._reader
+        status_line = await reader.readuntil(b"\r\n")
+        self._response_started = True
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if status in (204, 304) or method == "HEAD":
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readuntil(b"\r\n")
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, headers, body
\ No newline at end of file
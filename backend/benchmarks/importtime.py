@@ -0,0 +1,83 @@
+# benchmarks/importtime.py
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, Any, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _run_importtime(module: str, cwd: str) -> str:
+    """stderr of a fresh interpreter importing `module` under -X importtime"""
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=cwd, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return result.stderr
+
+
+def parse_importtime(stderr: str, module: str) -> Dict[str, Any]:
+    """
+    Summarize `-X importtime` output for one import.
+
+    Returns:
+        The module's cumulative import time, the number of modules loaded,
+        self time per top-level package (descending) and the names loaded
+    """
+    self_us: Dict[str, int] = {}
+    names: List[str] = []
+    total_us = 0
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        own, cumulative, indent, name = int(match.group(1)), int(match.group(2)), match.group(3), match.group(4)
+        names.append(name)
+        root = name.split(".")[0]
+        self_us[root] = self_us.get(root, 0) + own
+        if name == module and len(indent) == 1:
+            total_us = cumulative
+    packages = sorted(self_us.items(), key=lambda item: -item[1])
+    return {
+        "module": module,
+        "total_ms": total_us / 1000,
+        "modules": len(names),
+        "packages": [{"package": p, "self_ms": us / 1000} for p, us in packages],
+        "loaded": names,
+    }
+
+
+def measure_imports(module: str = "main", runs: int = 5, cwd: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Import `module` in `runs` fresh interpreters and report the median run.
+
+    Bytecode caches are left as they are, so warm the tree once (any prior
+    import does) before comparing numbers across commits.
+    """
+    cwd = cwd or BACKEND_DIR
+    profiles = sorted((parse_importtime(_run_importtime(module, cwd), module) for _ in range(runs)),
+                      key=lambda p: p["total_ms"])
+    median = dict(profiles[len(profiles) // 2])
+    median["runs_ms"] = [round(p["total_ms"], 1) for p in profiles]
+    median["stdev_ms"] = statistics.pstdev(p["total_ms"] for p in profiles)
+    return median
+
+
+def check_import_budget(profile: Dict[str, Any], budget_ms: Optional[float] = None,
+                        forbidden: Optional[List[str]] = None) -> List[str]:
+    """Budget violations: over `budget_ms`, or any `forbidden` package loaded at import"""
+    problems = []
+    if budget_ms is not None and profile["total_ms"] > budget_ms:
+        problems.append(f"import {profile['module']} took {profile['total_ms']:.1f} ms"
+                        f" (budget {budget_ms:.0f} ms)")
+    loaded_roots = {name.split(".")[0] for name in profile["loaded"]}
+    for package in forbidden or []:
+        if package in loaded_roots:
+            problems.append(f"import {profile['module']} loads {package}")
+    return problems
\ No newline at end of file
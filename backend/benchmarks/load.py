@@ -0,0 +1,186 @@
+# benchmarks/load.py
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from typing import Dict, Any, Optional, List
+
+from .harness import percentile
+from .httpclient import HTTPConnection
+
+CATEGORIES = [
+    "number_sense", "addition", "subtraction", "time_telling", "money_counting",
+    "place_value", "word_problems", "shapes", "skip_counting", "fractions",
+    "measurement", "patterns", "graphing", "odd_even",
+]
+
+FLUENCY_CONCEPTS = [
+    "add_one", "near_doubles", "subtract_one", "whole_hours", "mixed_coins",
+    "ones_tens", "by_fives_tens", "halves_wholes", "abab_patterns",
+]
+
+
+class RequestMix:
+    """
+    The shape of simulated traffic.
+
+    Attributes:
+        spiral_ratio: share of requests for spiral (vs fluency) worksheets
+        difficulties: {difficulty: weight}
+        concept_counts: spiral concept counts to pick from uniformly
+        question_counts: fluency question counts to pick from uniformly
+        answer_key_rate: share of requests that include the answer key
+        download_rate: share of generated worksheets that are then downloaded
+    """
+
+    def __init__(self, spiral_ratio: float = 0.5,
+                 difficulties: Optional[Dict[str, float]] = None,
+                 concept_counts: Optional[List[int]] = None,
+                 question_counts: Optional[List[int]] = None,
+                 answer_key_rate: float = 0.3, download_rate: float = 1.0):
+        self.spiral_ratio = spiral_ratio
+        self.difficulties = difficulties or {"beginner": 1, "intermediate": 1, "advanced": 1}
+        self.concept_counts = concept_counts or [1, 2, 3, 4, 6]
+        self.question_counts = question_counts or [15, 20, 30]
+        self.answer_key_rate = answer_key_rate
+        self.download_rate = download_rate
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RequestMix":
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+    def sample(self, rng: random.Random) -> Dict[str, Any]:
+        """Draw one /api/generate-worksheet request body"""
+        difficulty = rng.choices(list(self.difficulties), weights=list(self.difficulties.values()))[0]
+        body = {"difficulty": difficulty, "include_answer_key": rng.random() < self.answer_key_rate}
+        if rng.random() < self.spiral_ratio:
+            count = min(rng.choice(self.concept_counts), len(CATEGORIES))
+            body.update(worksheet_type="spiral", concepts=rng.sample(CATEGORIES, count))
+        else:
+            body.update(worksheet_type="fluency", concepts=[rng.choice(FLUENCY_CONCEPTS)],
+                        question_count=rng.choice(self.question_counts))
+        return body
+
+
+class LoadStats:
+    """Latencies, status codes and errors per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Counter] = {}
+        self.errors: Dict[str, Counter] = {}
+        self.dropped = 0
+
+    def record(self, endpoint: str, latency: float, status: Optional[int] = None,
+               error: Optional[str] = None):
+        self.latencies.setdefault(endpoint, []).append(latency)
+        if status is not None:
+            self.statuses.setdefault(endpoint, Counter())[str(status)] += 1
+        if error is not None:
+            self.errors.setdefault(endpoint, Counter())[error] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        endpoints = {}
+        for endpoint, samples in self.latencies.items():
+            samples = sorted(samples)
+            errors = sum(self.errors.get(endpoint, Counter()).values())
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+                "error_rate": errors / len(samples) if samples else 0.0,
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p90_ms": percentile(samples, 90) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000,
+                "max_ms": samples[-1] * 1000 if samples else 0.0,
+                "statuses": dict(self.statuses.get(endpoint, {})),
+                "errors": dict(self.errors.get(endpoint, {})),
+            }
+        return {"elapsed_s": elapsed, "dropped": self.dropped, "endpoints": endpoints}
+
+
+async def _timed(stats: LoadStats, endpoint: str, conn: HTTPConnection, method: str, path: str,
+                 body: Optional[Dict[str, Any]] = None):
+    """Send one request, recording its latency and outcome; returns the response or None"""
+    t0 = time.perf_counter()
+    try:
+        status, headers, payload = await conn.request(method, path, body)
+    except Exception as e:
+        stats.record(endpoint, time.perf_counter() - t0, error=type(e).__name__)
+        return None
+    stats.record(endpoint, time.perf_counter() - t0, status,
+                 error=f"HTTP {status}" if status >= 400 else None)
+    return status, headers, payload
+
+
+async def _session(conn: HTTPConnection, mix: RequestMix, rng: random.Random, stats: LoadStats):
+    """One user action: generate a worksheet, then (usually) download it"""
+    response = await _timed(stats, "generate", conn, "POST", "/api/generate-worksheet", mix.sample(rng))
+    if response is None or response[0] != 200 or rng.random() >= mix.download_rate:
+        return
+    url = json.loads(response[2])["download_url"]
+    await _timed(stats, "download", conn, "GET", url)
+
+
+async def run_load(base_url: str, mix: RequestMix, duration: float, concurrency: int = 4,
+                   rate: Optional[float] = None, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Drive the API for `duration` seconds and summarize what happened.
+
+    With `rate` unset this is a closed loop: `concurrency` simulated users
+    each start a new session as soon as their last one finishes. With `rate`
+    set, sessions start as a Poisson process at that many per second on up to
+    `concurrency` connections; arrivals with no free connection are dropped
+    and counted, so an overloaded server shows up as drops rather than an
+    ever-growing client backlog.
+    """
+    rng = random.Random(seed)
+    stats = LoadStats()
+    connections = [HTTPConnection(base_url) for _ in range(concurrency)]
+    started = time.perf_counter()
+    deadline = started + duration
+
+    if rate is None:
+        async def user(conn):
+            while time.perf_counter() < deadline:
+                await _session(conn, mix, rng, stats)
+        await asyncio.gather(*(user(conn) for conn in connections))
+    else:
+        idle = asyncio.Queue()
+        for conn in connections:
+            idle.put_nowait(conn)
+        in_flight = set()
+
+        async def arrival(conn):
+            try:
+                await _session(conn, mix, rng, stats)
+            finally:
+                idle.put_nowait(conn)
+
+        next_arrival = started
+        while True:
+            next_arrival += rng.expovariate(rate)
+            if next_arrival >= deadline:
+                break
+            await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+            if idle.empty():
+                stats.dropped += 1
+                continue
+            task = asyncio.ensure_future(arrival(idle.get_nowait()))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    elapsed = time.perf_counter() - started
+    for conn in connections:
+        await conn.close()
+
+    summary = stats.summary(elapsed)
+    summary.update(base_url=base_url, concurrency=concurrency, rate=rate, mix=mix.to_dict())
+    return summary
\ No newline at end of file
@@ -0,0 +1,211 @@
+# benchmarks/suites.py
+
+import contextlib
+import itertools
+import json
+import os
+import subprocess
+import sys
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+from problem_generators.base import BEGINNER, INTERMEDIATE, ADVANCED
+from problem_generators.problems import _generators, expand_concepts, generate_problems
+from pdf_reporting.pdf_generator import create_worksheet_pdf
+
+from .harness import measure
+
+DIFFICULTIES = [BEGINNER, INTERMEDIATE, ADVANCED]
+PDF_SIZES = [15, 100, 500, 1000]
+QUICK_PDF_SIZES = [15, 100]
+CATEGORY_PDF_SIZE = 100
+# Fluency sheets built in a fresh interpreter, for the cost model's memory and long-sheet fit
+RSS_PDF_SIZES = [1000, 4000, 10000]
+QUICK_RSS_PDF_SIZES = [1000]
+# Categories also built at the rss sizes, so the long-sheet term isn't fitted to one concept alone
+RSS_CATEGORIES = ["money_counting", "time_telling", "place_value", "graphing"]
+
+# Concept used for fluency PDF and endpoint cases
+FLUENCY_CONCEPT = "add_one"
+
+# (name, setup, measure options); setup runs untimed and returns the call to time
+Case = Tuple[str, Callable[[], Callable[[], Any]], Dict[str, Any]]
+
+
+def _quiet(fn: Callable[[], Any]) -> Callable[[], Any]:
+    """Wrap a call so the generators' progress prints don't reach the terminal"""
+    def run():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            return fn()
+    return run
+
+
+def generation_cases(quick: bool = False) -> Iterator[Case]:
+    """generate_problems for each category (spiral) and subcategory (15-problem fluency) per difficulty"""
+    for category, generator in _generators.items():
+        for difficulty in DIFFICULTIES:
+            yield (f"generate/{category}/*/{difficulty}",
+                   lambda c=category, d=difficulty: _quiet(lambda: generate_problems("spiral", d, [c])),
+                   {"min_time": 0.1 if quick else 0.25})
+            if quick:
+                continue
+            # Most generators list subcategories per difficulty; a few share one list
+            subcategories = generator.subcategories
+            if isinstance(subcategories, dict):
+                subcategories = subcategories.get(difficulty, [])
+            for subcategory in subcategories:
+                yield (f"generate/{category}/{subcategory}/{difficulty}",
+                       lambda s=subcategory, d=difficulty: _quiet(lambda: generate_problems("fluency", d, [s], 15)),
+                       {"min_time": 0.25})
+
+
+def _problem_set(worksheet_type: str, count: int) -> List[Dict[str, Any]]:
+    """A fixed problem list of the given size, generated outside the timed region"""
+    if worksheet_type == "fluency":
+        return _quiet(lambda: generate_problems("fluency", INTERMEDIATE, [FLUENCY_CONCEPT], count))()
+    # Spiral sheets have one problem per subcategory; cycle a full set to the size
+    full = _quiet(lambda: generate_problems("spiral", INTERMEDIATE, list(_generators)))()
+    return list(itertools.islice(itertools.cycle(full), count))
+
+
+def pdf_cases(quick: bool = False, workdir: str = ".") -> Iterator[Case]:
+    """create_worksheet_pdf by worksheet type, size and answer key"""
+    output_path = os.path.join(workdir, "bench_worksheet.pdf")
+    for worksheet_type in ("spiral", "fluency"):
+        for size in (QUICK_PDF_SIZES if quick else PDF_SIZES):
+            for answer_key in (False, True):
+                def setup(t=worksheet_type, n=size, k=answer_key):
+                    problems = _problem_set(t, n)
+                    return lambda: create_worksheet_pdf(problems, t, INTERMEDIATE, [], output_path,
+                                                        include_answer_key=k)
+                yield (f"pdf/{worksheet_type}/{size}/{'key' if answer_key else 'nokey'}", setup,
+                       {"min_time": 0.5 if quick else 1.0, "min_iterations": 3,
+                        "trace_memory": size <= 100})
+
+    # Per-category sheets, cycling through each category's subcategories, so
+    # the admission cost model can weight visual-heavy concepts
+    if quick:
+        return
+    for category in _generators:
+        def setup(c=category):
+            problems = []
+            for subcategory in expand_concepts([c]):
+                problems.extend(_quiet(lambda: generate_problems("fluency", INTERMEDIATE, [subcategory],
+                                                                 CATEGORY_PDF_SIZE))())
+            problems = problems[::max(1, len(problems) // CATEGORY_PDF_SIZE)][:CATEGORY_PDF_SIZE]
+            return lambda: create_worksheet_pdf(problems, "fluency", INTERMEDIATE, [], output_path)
+        yield (f"pdf/category/{category}/{CATEGORY_PDF_SIZE}", setup,
+               {"min_time": 0.5, "min_iterations": 3, "trace_memory": True})
+
+
+def rss_cases(quick: bool = False, workdir: str = ".") -> Iterator[Case]:
+    """
+    Generate and render a fluency PDF with answer key in a fresh interpreter.
+
+    Each build runs in its own process, so its peak RSS is measured alone;
+    sizes ascend, as the children's peak only ever grows (memory is fitted
+    to the FLUENCY_CONCEPT builds, which run first). Per-category builds
+    cycle through the category's subcategories.
+    """
+    from .importtime import BACKEND_DIR
+
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    output_path = os.path.join(workdir, "bench_rss.pdf")
+    sheets = [("fluency", [FLUENCY_CONCEPT])]
+    if not quick:
+        sheets += [(f"category/{category}", expand_concepts([category])) for category in RSS_CATEGORIES]
+    for label, concepts in sheets:
+        for size in (QUICK_RSS_PDF_SIZES if quick else RSS_PDF_SIZES):
+            script = ("import itertools\n"
+                      "from problem_generators.problems import generate_problems\n"
+                      "from pdf_reporting.pdf_generator import create_worksheet_pdf\n"
+                      f"problems = [generate_problems('fluency', {INTERMEDIATE!r}, [c], {-(-size // len(concepts))})"
+                      f" for c in {concepts!r}]\n"
+                      "problems = [p for p in itertools.chain(*itertools.zip_longest(*problems)) if p]\n"
+                      f"problems = list(itertools.islice(itertools.cycle(problems), {size}))\n"
+                      f"create_worksheet_pdf(problems, 'fluency', {INTERMEDIATE!r}, [], {output_path!r},"
+                      " include_answer_key=True)\n")
+            command = [sys.executable, "-c", script]
+            yield (f"rss/{label}/{size}/key",
+                   lambda c=command: lambda: subprocess.run(c, cwd=workdir, env=env, check=True,
+                                                            stdout=subprocess.DEVNULL),
+                   {"min_time": 0, "min_iterations": 1, "warmup": 0, "child_memory": True})
+
+
+def endpoint_cases(quick: bool = False, workdir: str = ".") -> Iterator[Case]:
+    """POST /api/generate-worksheet then GET the PDF, through an in-process ASGI client"""
+    from main import app
+    from .asgi import ASGIClient
+
+    client = ASGIClient(app)
+    requests = [
+        ("spiral", {"worksheet_type": "spiral", "difficulty": INTERMEDIATE,
+                    "concepts": list(_generators), "include_answer_key": True}),
+        ("fluency-15", {"worksheet_type": "fluency", "difficulty": INTERMEDIATE,
+                        "concepts": [FLUENCY_CONCEPT], "question_count": 15}),
+    ]
+    if not quick:
+        requests.append(("fluency-100", {"worksheet_type": "fluency", "difficulty": INTERMEDIATE,
+                                         "concepts": [FLUENCY_CONCEPT], "question_count": 100,
+                                         "include_answer_key": True}))
+
+    def round_trip(body):
+        status, _, payload = client.request("POST", "/api/generate-worksheet", body)
+        if status != 200:
+            raise RuntimeError(f"generate-worksheet returned {status}: {payload[:200]!r}")
+        url = json.loads(payload)["download_url"]
+        status, _, pdf = client.request("GET", url)
+        if status != 200:
+            raise RuntimeError(f"download returned {status}")
+        return len(pdf)
+
+    for name, body in requests:
+        yield (f"endpoint/{name}", lambda b=body: _quiet(lambda: round_trip(b)),
+               {"min_time": 0.5 if quick else 1.0, "min_iterations": 3})
+
+
+def import_cases(quick: bool = False, workdir: str = ".") -> Iterator[Case]:
+    """Cold `import` of the app and the generators, each in a fresh interpreter (startup included)"""
+    from .importtime import BACKEND_DIR
+
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    for module in ("main", "problem_generators.problems"):
+        command = [sys.executable, "-c", f"import {module}"]
+        yield (f"import/{module}",
+               lambda c=command: lambda: subprocess.run(c, cwd=workdir, env=env, check=True),
+               {"min_time": 1.0 if quick else 3.0, "min_iterations": 5})
+
+
+SUITES = {
+    "generation": generation_cases,
+    "pdf": pdf_cases,
+    "rss": rss_cases,
+    "endpoint": endpoint_cases,
+    "imports": import_cases,
+}
+
+
+def run_suites(names: List[str], quick: bool = False, workdir: str = ".",
+               case_filter: Optional[str] = None, log=sys.stderr) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the named suites and return {case name: stats}.
+
+    Args:
+        names: suite names from SUITES
+        quick: smaller sizes and shorter runs, for a fast smoke check
+        workdir: where PDFs and other scratch files are written
+        case_filter: only run cases whose name contains this substring
+        log: stream for one progress line per case
+    """
+    results = {}
+    for suite in names:
+        factory = SUITES[suite]
+        cases = factory(quick) if suite == "generation" else factory(quick, workdir)
+        for name, setup, options in cases:
+            if case_filter and case_filter not in name:
+                continue
+            stats = measure(setup(), **options)
+            results[name] = stats
+            print(f"{name:<60} {stats['ops_per_sec']:>9.1f} ops/s"
+                  f"  p50 {stats['p50_ms']:>8.2f} ms  p95 {stats['p95_ms']:>8.2f} ms"
+                  f"  p99 {stats['p99_ms']:>8.2f} ms", file=log)
+    return results
\ No newline at end of file
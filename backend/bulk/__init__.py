@@ -0,0 +1,4 @@
+# Bulk Worksheet Generation Module
+
+from .manifest import WorksheetSpec, load_manifest
+from .runner import build_library
\ No newline at end of file
@@ -0,0 +1,53 @@
+# bulk/__main__.py
+"""
+Offline bulk worksheet builds. Run from the backend directory:
+
+    python -m bulk worksheets.csv library/
+    python -m bulk worksheets.json library/ --workers 8
+    python -m bulk worksheets.json library/ --dry-run
+
+Rerunning with the same output directory resumes: worksheets already built
+(recorded in library/manifest.jsonl with a matching file hash) are skipped.
+"""
+
+import argparse
+import os
+import sys
+
+from .manifest import load_manifest
+from .runner import build_library, completed_entries
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bulk",
+                                     description="Build a library of worksheet PDFs from a manifest")
+    parser.add_argument("manifest", help="JSON or CSV file of worksheet specs")
+    parser.add_argument("output_dir", help="directory for the PDFs and manifest.json")
+    parser.add_argument("--workers", type=int, help="render processes (default: one per CPU)")
+    parser.add_argument("--dry-run", action="store_true", help="list what would be built and exit")
+    args = parser.parse_args(argv)
+
+    try:
+        specs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Could not read manifest: {e}", file=sys.stderr)
+        return 2
+
+    if args.dry_run:
+        done = completed_entries(args.output_dir) if os.path.isdir(args.output_dir) else {}
+        for spec in {spec.key: spec for spec in specs}.values():
+            print(f"{'skip ' if spec.key in done else 'build'} {spec.filename}")
+        return 0
+
+    try:
+        summary = build_library(specs, args.output_dir, workers=args.workers)
+    except KeyboardInterrupt:
+        return 130
+    print(f"Built {summary['built']}, skipped {summary['skipped']}, failed {summary['failed']}"
+          f" of {summary['total']}; manifest in {os.path.join(args.output_dir, 'manifest.json')}",
+          file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,134 @@
+# bulk/manifest.py
+
+import csv
+import hashlib
+import json
+import re
+from typing import Dict, Any, Optional, List
+
+WORKSHEET_TYPES = ("spiral", "fluency")
+DIFFICULTIES = ("beginner", "intermediate", "advanced")
+
+# Separator between concepts in a CSV cell
+CSV_CONCEPT_SEPARATOR = ";"
+
+
+class WorksheetSpec:
+    """One worksheet to build; `key` identifies its exact settings"""
+
+    def __init__(self, worksheet_type: str, difficulty: str, concepts: List[str],
+                 question_count: Optional[int] = 15, include_answer_key: bool = False,
+                 seed: Optional[int] = None, name: Optional[str] = None):
+        self.worksheet_type = worksheet_type
+        self.difficulty = difficulty
+        self.concepts = concepts
+        self.question_count = question_count if worksheet_type == "fluency" else None
+        self.include_answer_key = include_answer_key
+        self.name = name
+        self.seed = seed
+
+        settings = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
+        self.key = hashlib.sha256(settings.encode("utf-8")).hexdigest()[:16]
+        # Without an explicit seed, derive one from the settings so a rebuild reproduces the library
+        if self.seed is None:
+            self.seed = int(self.key, 16) % (2 ** 31)
+
+    @property
+    def filename(self) -> str:
+        """Output file name: the spec's name, or one built from its settings, plus its key"""
+        stem = self.name or f"{self.worksheet_type}_{self.difficulty}_{'-'.join(self.concepts)}"
+        stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", stem).strip("._")[:80] or "worksheet"
+        return f"{stem}_{self.key}.pdf"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "worksheet_type": self.worksheet_type,
+            "difficulty": self.difficulty,
+            "concepts": self.concepts,
+            "question_count": self.question_count,
+            "include_answer_key": self.include_answer_key,
+            "seed": self.seed,
+            "name": self.name,
+        }
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def _spec_from_dict(raw: Dict[str, Any], where: str) -> WorksheetSpec:
+    """Validate one manifest entry (the same rules as the API) and build its spec"""
+    worksheet_type = str(raw.get("worksheet_type", "")).strip()
+    difficulty = str(raw.get("difficulty", "")).strip()
+    concepts = raw.get("concepts") or []
+    if isinstance(concepts, str):
+        concepts = [c.strip() for c in concepts.split(CSV_CONCEPT_SEPARATOR) if c.strip()]
+    if not isinstance(concepts, list) or not all(isinstance(c, str) for c in concepts):
+        raise ValueError(f"{where}: concepts must be a list of concept names")
+
+    if worksheet_type not in WORKSHEET_TYPES:
+        raise ValueError(f"{where}: invalid worksheet_type {worksheet_type!r}")
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"{where}: invalid difficulty {difficulty!r}")
+    if not concepts:
+        raise ValueError(f"{where}: no concepts")
+    if worksheet_type == "fluency" and len(concepts) > 1:
+        raise ValueError(f"{where}: fluency worksheets can only target one concept")
+
+    def optional_int(field: str, default: Optional[int]) -> Optional[int]:
+        value = raw.get(field)
+        if value is None or value == "":
+            return default
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{where}: {field} must be an integer") from None
+
+    question_count = optional_int("question_count", 15)
+    if worksheet_type == "fluency" and question_count < 1:
+        raise ValueError(f"{where}: question_count must be at least 1")
+
+    return WorksheetSpec(
+        worksheet_type, difficulty, list(concepts),
+        question_count=question_count,
+        include_answer_key=_parse_bool(raw.get("include_answer_key", False)),
+        seed=optional_int("seed", None),
+        name=(str(raw["name"]).strip() or None) if raw.get("name") else None,
+    )
+
+
+def load_manifest(path: str) -> List[WorksheetSpec]:
+    """
+    Read worksheet specs from a JSON or CSV manifest.
+
+    JSON is a list of specs, or {"defaults": {...}, "worksheets": [...]} where
+    each worksheet overrides the defaults. CSV has a header row with the same
+    field names and concepts separated by ";". Fields: worksheet_type,
+    difficulty, concepts, question_count, include_answer_key, seed, name.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        # Header is line 1
+        return [_spec_from_dict(row, f"{path}:{i}") for i, row in enumerate(rows, start=2)]
+
+    with open(path) as f:
+        data = json.load(f)
+    defaults: Dict[str, Any] = {}
+    if isinstance(data, dict):
+        defaults = data.get("defaults", {})
+        data = data.get("worksheets", [])
+        if not isinstance(defaults, dict):
+            raise ValueError(f"{path}: defaults must be an object")
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a list of worksheets")
+
+    specs = []
+    for i, entry in enumerate(data):
+        where = f"{path}[{i}]"
+        if not isinstance(entry, dict):
+            raise ValueError(f"{where}: each worksheet must be an object")
+        specs.append(_spec_from_dict({**defaults, **entry}, where))
+    return specs
\ No newline at end of file
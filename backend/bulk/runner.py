@@ -0,0 +1,150 @@
+# bulk/runner.py
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List
+
+from problem_generators.problems import iter_problems
+
+from .manifest import WorksheetSpec
+
+# Appended to (and flushed) as each worksheet finishes, so an interrupted run can resume
+JOURNAL_NAME = "manifest.jsonl"
+# Written at the end of a run: every finished worksheet, in manifest order
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _build_one(spec: Dict[str, Any], key: str, filename: str, output_dir: str) -> Dict[str, Any]:
+    """Generate and render one worksheet (runs in a worker process)"""
+    from pdf_reporting.pdf_generator import create_worksheet_pdf
+
+    problems = list(iter_problems(
+        worksheet_type=spec["worksheet_type"],
+        number_range=spec["difficulty"],
+        concepts=spec["concepts"],
+        problem_count=spec["question_count"],
+        seed=spec["seed"]
+    ))
+    if not problems:
+        raise ValueError("no problems could be generated for these concepts")
+
+    # Render under a temporary name so a killed worker never leaves a file that looks finished
+    path = os.path.join(output_dir, filename)
+    tmp_path = path + ".tmp"
+    try:
+        create_worksheet_pdf(
+            problems=problems,
+            worksheet_type=spec["worksheet_type"],
+            number_range=spec["difficulty"],
+            concepts=spec["concepts"],
+            output_path=tmp_path,
+            include_answer_key=spec["include_answer_key"]
+        )
+        os.replace(tmp_path, path)
+    finally:
+        # Only left behind if rendering failed
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return {"key": key, "file": filename, "sha256": file_sha256(path),
+            "bytes": os.path.getsize(path), "problems": len(problems)}
+
+
+def completed_entries(output_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Journal entries, by spec key, whose file is still present with the recorded hash"""
+    journal_path = os.path.join(output_dir, JOURNAL_NAME)
+    entries: Dict[str, Dict[str, Any]] = {}
+    if not os.path.exists(journal_path):
+        return entries
+    with open(journal_path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A line cut short by an interruption
+                continue
+            if not isinstance(entry, dict) or not all(isinstance(entry.get(field), str)
+                                                      for field in ("key", "file", "sha256")):
+                continue
+            entries[entry["key"]] = entry
+
+    completed = {}
+    for key, entry in entries.items():
+        path = os.path.join(output_dir, entry["file"])
+        if os.path.exists(path) and file_sha256(path) == entry["sha256"]:
+            completed[key] = entry
+    return completed
+
+
+def build_library(specs: List[WorksheetSpec], output_dir: str, workers: Optional[int] = None,
+                  log=sys.stderr) -> Dict[str, Any]:
+    """
+    Build every spec's PDF into `output_dir` across a pool of worker processes.
+
+    Specs already in the journal with an intact file are skipped, so rerunning
+    after an interruption only builds what is missing. Identical specs are
+    built once. Ends by writing manifest.json (spec, file, SHA-256, size and
+    problem count per worksheet, plus any failures).
+
+    Returns:
+        Counts of total, skipped, built and failed worksheets
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    unique = list({spec.key: spec for spec in specs}.values())
+    done = completed_entries(output_dir)
+    pending = [spec for spec in unique if spec.key not in done]
+    skipped = len(unique) - len(pending)
+    print(f"{len(unique)} worksheets, {skipped} already built, {len(pending)} to build", file=log)
+
+    failures: Dict[str, str] = {}
+    built = 0
+    started = time.perf_counter()
+    if pending:
+        with open(os.path.join(output_dir, JOURNAL_NAME), "a") as journal, \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_build_one, spec.to_dict(), spec.key, spec.filename, output_dir): spec
+                       for spec in pending}
+            try:
+                for future in as_completed(futures):
+                    spec = futures[future]
+                    try:
+                        entry = future.result()
+                    except Exception as e:
+                        failures[spec.key] = f"{type(e).__name__}: {e}"
+                        print(f"  failed {spec.filename}: {failures[spec.key]}", file=log)
+                        continue
+                    entry["spec"] = spec.to_dict()
+                    journal.write(json.dumps(entry) + "\n")
+                    journal.flush()
+                    done[spec.key] = entry
+                    built += 1
+                    if built % 50 == 0 or built == len(pending):
+                        rate = built / (time.perf_counter() - started)
+                        print(f"  {built}/{len(pending)} built ({rate:.1f}/s)", file=log)
+            except KeyboardInterrupt:
+                pool.shutdown(wait=False, cancel_futures=True)
+                print(f"Interrupted after {built} worksheets; rerun to resume", file=log)
+                raise
+
+    manifest = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "worksheets": [done[spec.key] for spec in unique if spec.key in done],
+        "failed": [{"key": key, "error": error} for key, error in failures.items()],
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return {"total": len(unique), "skipped": skipped, "built": built, "failed": len(failures)}
\ No newline at end of file
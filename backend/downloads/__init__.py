@@ -0,0 +1,7 @@
+# Downloads Module
+
+from .artifacts import artifact_etag, is_content_addressed, publish_artifact
+from .responses import (
+    artifact_response, html_response, image_response, json_response, ndjson_response, not_modified, parse_range,
+)
+from .thumbnails import ThumbnailCache, load_thumbnail_source, save_thumbnail_source, thumbnail_digest
\ No newline at end of file
@@ -0,0 +1,55 @@
+# downloads/artifacts.py
+
+import hashlib
+import os
+import re
+from typing import Dict, Tuple
+
+# Hex digits of the SHA-256 content hash kept in artifact names and ETags
+DIGEST_LENGTH = 32
+
+_CONTENT_ADDRESSED = re.compile(r"_([0-9a-f]{%d})\.pdf$" % DIGEST_LENGTH)
+
+# ETags of files without a hash in their name, by (path, size, mtime)
+_etag_cache: Dict[Tuple[str, int, int], str] = {}
+_ETAG_CACHE_SIZE = 1024
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:DIGEST_LENGTH]
+
+
+def publish_artifact(path: str, prefix: str) -> str:
+    """
+    Rename a finished file to `{prefix}_{content hash}.pdf` in the same directory.
+
+    The name then changes whenever the bytes do, so downloads can be cached
+    as immutable. Returns the new file name.
+    """
+    filename = f"{prefix}_{_file_digest(path)}.pdf"
+    os.replace(path, os.path.join(os.path.dirname(path), filename))
+    return filename
+
+
+def is_content_addressed(filename: str) -> bool:
+    return _CONTENT_ADDRESSED.search(filename) is not None
+
+
+def artifact_etag(path: str) -> str:
+    """Strong ETag for a file: the hash in its name, or its content hash (cached per version)"""
+    match = _CONTENT_ADDRESSED.search(os.path.basename(path))
+    if match:
+        return f'"{match.group(1)}"'
+
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    etag = _etag_cache.get(key)
+    if etag is None:
+        if len(_etag_cache) >= _ETAG_CACHE_SIZE:
+            _etag_cache.clear()
+        etag = _etag_cache[key] = f'"{_file_digest(path)}"'
+    return etag
\ No newline at end of file
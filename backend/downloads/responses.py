@@ -0,0 +1,216 @@
+# downloads/responses.py
+
+import gzip
+import json
+import os
+import re
+import zlib
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from starlette.background import BackgroundTask
+from starlette.concurrency import iterate_in_threadpool
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response, StreamingResponse
+
+from .artifacts import artifact_etag, is_content_addressed
+
+# Content-addressed files never change; anything else is revalidated by ETag
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+_CHUNK_SIZE = 64 * 1024
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Uncompressed bytes collected before each write of an NDJSON stream
+_STREAM_BUFFER = 32 * 1024
+
+# JSON bodies smaller than this go out uncompressed
+_GZIP_MIN_SIZE = 1024
+
+_BYTE_RANGE = re.compile(r"(\d*)-(\d*)")
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into an inclusive (start, end) within `size`.
+
+    Returns None for headers to ignore (other units, several ranges, malformed)
+    and raises ValueError for a well-formed range the file can't satisfy.
+    """
+    unit, _, spec = header.partition("=")
+    match = _BYTE_RANGE.fullmatch(spec.strip())
+    if unit.strip().lower() != "bytes" or not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start > end:
+        return None
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    return start, min(end, size - 1)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Whether an If-None-Match header (a list of ETags, or *) matches `etag`"""
+    if header.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in header.split(","))
+    return any((tag[2:] if tag.startswith("W/") else tag) == etag for tag in tags)
+
+
+def _read_range(path: str, start: int, end: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining:
+            chunk = f.read(min(_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def artifact_response(request: Request, path: str, download_name: str,
+                      media_type: str = "application/pdf") -> Response:
+    """
+    Serve a generated file with validators, conditional GET and byte ranges.
+
+    Sends 304 when If-None-Match matches the strong ETag, 206 for a single
+    satisfiable range (honoring If-Range), 416 for an unsatisfiable one and
+    the whole file otherwise.
+    """
+    etag = artifact_etag(path)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if is_content_addressed(path) else REVALIDATE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        size = os.path.getsize(path)
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            headers.update({
+                "Content-Range": f"bytes {start}-{end}/{size}",
+                "Content-Length": str(end - start + 1),
+                "Content-Disposition": f'attachment; filename="{download_name}"',
+            })
+            return StreamingResponse(_read_range(path, start, end), status_code=206,
+                                     media_type=media_type, headers=headers)
+
+    return FileResponse(path=path, filename=download_name, media_type=media_type, headers=headers)
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names `etag`"""
+    if_none_match = request.headers.get("if-none-match")
+    return if_none_match is not None and _etag_matches(if_none_match, etag)
+
+
+def image_response(request: Request, path: str, etag: str, immutable: bool,
+                   media_type: str = "image/png") -> Response:
+    """Serve a generated image inline with its ETag, sending 304 when the client has it"""
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+    }
+    if not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path=path, media_type=media_type, headers=headers)
+
+
+def accepts_gzip(request: Request) -> bool:
+    """Whether the client's Accept-Encoding allows gzip"""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _compressible_response(request: Request, body: bytes, media_type: str) -> Response:
+    """A response for a complete body, gzipped when the client accepts it and it's worth it"""
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= _GZIP_MIN_SIZE and accepts_gzip(request):
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, media_type=media_type, headers=headers)
+
+
+def json_response(request: Request, payload: Dict[str, Any]) -> Response:
+    """A compact JSON response, gzipped when the client accepts it and it's worth it"""
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return _compressible_response(request, body, "application/json")
+
+
+def html_response(request: Request, page: str) -> Response:
+    """An HTML page, gzipped when the client accepts it and it's worth it"""
+    return _compressible_response(request, page.encode("utf-8"), "text/html; charset=utf-8")
+
+
+def _ndjson_chunks(items: Iterable[Any], compress: bool) -> Iterator[bytes]:
+    """Encode items one JSON document per line, in buffered (optionally gzip) chunks"""
+    # wbits 31 writes a gzip header; each sync flush lets the client decode what it has so far
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    buffer, size = [], 0
+    for item in items:
+        line = json.dumps(item, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= _STREAM_BUFFER:
+            data = b"".join(buffer)
+            buffer, size = [], 0
+            yield compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH) if compressor else data
+    data = b"".join(buffer)
+    if compressor:
+        yield compressor.compress(data) + compressor.flush()
+    elif data:
+        yield data
+
+
+async def _closing(chunks: Iterator[bytes], on_close: Callable[[], Awaitable[None]]) -> AsyncIterator[bytes]:
+    """Yield chunks (produced in the threadpool), then call `on_close` however the stream ends"""
+    try:
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+    finally:
+        await on_close()
+
+
+def ndjson_response(request: Request, items: Iterable[Any],
+                    on_close: Optional[Callable[[], Awaitable[None]]] = None) -> StreamingResponse:
+    """
+    Stream items as newline-delimited JSON while they are produced.
+
+    Only one buffer of encoded lines is held at a time, so memory doesn't grow
+    with the number of items. Gzipped when the client accepts it. `on_close`
+    runs once the stream has finished, failed or been dropped by the client;
+    it may run more than once, so it must be idempotent.
+    """
+    compress = accepts_gzip(request)
+    headers = {"Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    chunks = _ndjson_chunks(items, compress)
+    if on_close is None:
+        return StreamingResponse(chunks, media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    # The background task covers a client that leaves before the first chunk
+    return StreamingResponse(_closing(chunks, on_close), media_type=NDJSON_MEDIA_TYPE, headers=headers,
+                             background=BackgroundTask(on_close))
\ No newline at end of file
@@ -0,0 +1,120 @@
+# downloads/thumbnails.py
+
+import hashlib
+import json
+import os
+from typing import Dict, Any, Optional
+
+from .artifacts import DIGEST_LENGTH
+
+# Thumbnails kept on disk; past this the oldest are removed
+THUMBNAIL_CACHE_FILES = 2000
+
+# Removed at once when the cache is full, so pruning doesn't run on every write
+_PRUNE_FRACTION = 0.1
+
+
+def _source_path(pdf_path: str) -> str:
+    return os.path.splitext(pdf_path)[0] + ".json"
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def save_thumbnail_source(pdf_path: str, source: Dict[str, Any]) -> str:
+    """
+    Record what a generated PDF's first page shows, next to the PDF.
+
+    Thumbnails are drawn from this rather than from the PDF, so they can be
+    made (or remade after the cache drops them) without re-rendering. The
+    record's content hash goes on its first line, so requests can be
+    answered from the cache without reading the rest. Returns the hash.
+    """
+    body = json.dumps(source, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:DIGEST_LENGTH]
+    _write_atomic(_source_path(pdf_path), digest.encode("ascii") + b"\n" + body)
+    return digest
+
+
+def thumbnail_digest(pdf_path: str) -> Optional[str]:
+    """Content hash of a PDF's recorded first page (equal for identical worksheets), or None"""
+    try:
+        with open(_source_path(pdf_path), encoding="utf-8") as f:
+            digest = f.readline(DIGEST_LENGTH + 1).strip()
+    except OSError:
+        return None
+    return digest if len(digest) == DIGEST_LENGTH else None
+
+
+def load_thumbnail_source(pdf_path: str) -> Optional[Dict[str, Any]]:
+    """The recorded first page of a PDF, or None if there is none"""
+    try:
+        with open(_source_path(pdf_path), encoding="utf-8") as f:
+            f.readline()
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class ThumbnailCache:
+    """
+    Rendered thumbnails on disk, by worksheet content hash and width.
+
+    Every PDF of the same worksheet shares one file. When more than
+    `max_files` are stored, the least recently written are removed.
+    """
+
+    def __init__(self, directory: str, max_files: int = THUMBNAIL_CACHE_FILES):
+        self.directory = directory
+        self.max_files = max_files
+        self._count: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, digest: str, width: int) -> str:
+        return os.path.join(self.directory, f"{digest}_{width}.png")
+
+    def get(self, digest: str, width: int) -> Optional[str]:
+        """Path of a cached thumbnail, or None"""
+        path = self.path(digest, width)
+        return path if os.path.isfile(path) else None
+
+    def put(self, digest: str, width: int, png: bytes) -> str:
+        """Store a thumbnail and return its path"""
+        path = self.path(digest, width)
+        _write_atomic(path, png)
+        if self._count is None:
+            self._count = sum(1 for name in os.listdir(self.directory) if name.endswith(".png"))
+        else:
+            self._count += 1
+        if self._count > self.max_files:
+            self._prune()
+        return path
+
+    def _prune(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+        entries.sort()
+        excess = len(entries) - int(self.max_files * (1 - _PRUNE_FRACTION))
+        for _, path in entries[:max(0, excess)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._count = len(entries) - max(0, excess)
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+        self._count = 0
\ No newline at end of file
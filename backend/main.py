@@ -1,16 +1,30 @@
-from fastapi import FastAPI, HTTPException, Query
+# Imported first so it can time the app's imports
+from startup import mark_imports_done, readiness, start_warmup
+from fastapi import FastAPI, HTTPException, Query, BackgroundTasks, Request
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+from concurrent.futures.process import BrokenProcessPool
 import os
+import secrets
+import time
 import uuid
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
+from datetime import date
 import tempfile
 import sys
 import os
 # sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from pdf_reporting.pdf_generator import create_worksheet_pdf
-from problem_generators.problems import generate_problems
+from problem_generators.problems import generate_problems, generate_class_problems, expand_concepts, iter_problems
+from problem_generators.mastery import get_mastery_store
+from scheduling import SpiralScheduler, build_semester
+from profiling import PROFILE_HEADER, should_profile, memory_profile, profile_stage, note, memory_metrics
+from downloads import artifact_response, html_response, image_response, json_response, ndjson_response, not_modified, publish_artifact
+from downloads import ThumbnailCache, is_content_addressed, load_thumbnail_source, save_thumbnail_source, thumbnail_digest
+from admission import AdmissionRejected, get_admission_controller, get_cost_model, get_single_flight, request_key
+from pdf_reporting.render_pool import PARALLEL_MIN_STUDENTS, WORKER_MEMORY_MB, get_render_pool, render_workers, shutdown_render_pool
+mark_imports_done()
 
 app = FastAPI(title="Math Worksheet Generator API")
 
@@ -24,17 +38,87 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST"],                                     # Limit to methods you actually use
     allow_headers=["Content-Type", "Authorization"],                   # Common required headers
+    expose_headers=["X-Worksheet-Seed"],                               # Lets the frontend reuse a preview's seed
 )
 
+@app.middleware("http")
+async def memory_profiling(request: Request, call_next):
+    """Profile sampled (or X-Memory-Profile: 1) requests with tracemalloc"""
+    header = request.headers.get(PROFILE_HEADER)
+    enabled = should_profile(header)
+    with memory_profile(f"{request.method} {request.url.path}", enabled, forced=header is not None) as profile:
+        response = await call_next(request)
+    if profile is not None:
+        # Process-wide: includes any request that overlapped this one
+        response.headers["X-Memory-Peak-KB"] = str(round(profile.peak_bytes / 1024))
+        if profile.overlapped:
+            response.headers["X-Memory-Profile-Overlapped"] = "1"
+    return response
+
 # Create temp directory if it doesn't exist
 os.makedirs("temp_pdfs", exist_ok=True)
 
+# First-page thumbnails, shared by every PDF of the same worksheet
+thumbnail_cache = ThumbnailCache(os.path.join("temp_pdfs", "thumbnails"))
+
 class WorksheetRequest(BaseModel):
     worksheet_type: str  # "spiral" or "fluency"
     difficulty: str  # "beginner", "intermediate", or "advanced" (instead of number_range)
     concepts: List[str]  # List of selected math concepts
     include_answer_key: bool = False  # Added to match frontend
     question_count: Optional[int] = 15  # Changed from problem_count to question_count
+    student_id: Optional[str] = None  # Skips problems this student has seen recently
+    adaptive: bool = False  # Adjust difficulty to the student's mastery (needs student_id)
+    seed: Optional[int] = None  # Same settings and seed give the same worksheet
+
+class ClassWorksheetRequest(BaseModel):
+    worksheet_type: str  # "spiral" or "fluency"
+    difficulty: str  # Base difficulty; adaptive worksheets shift it per student
+    concepts: List[str]
+    student_ids: List[str]  # One worksheet per student, in this order
+    include_answer_key: bool = False
+    question_count: Optional[int] = 15
+    adaptive: bool = True
+
+class ProblemsRequest(BaseModel):
+    worksheet_type: str  # "spiral" or "fluency"
+    difficulty: str
+    concepts: List[str]
+    question_count: Optional[int] = 15  # Fluency only
+    student_id: Optional[str] = None
+    adaptive: bool = False
+    seed: Optional[int] = None  # Same settings and seed give the same problems
+
+# Most questions on one fluency PDF, whatever the cost model predicts
+MAX_WORKSHEET_PROBLEMS = 5000
+# Most problems returned in one JSON body; larger exports use format=ndjson
+MAX_JSON_PROBLEMS = 1000
+# Small enough that a stream's estimate stays below the expensive-build threshold
+MAX_STREAM_PROBLEMS = 20000
+
+# Response header carrying the seed a preview was generated with
+SEED_HEADER = "X-Worksheet-Seed"
+
+# Default and allowed thumbnail widths, in pixels
+THUMBNAIL_WIDTH = 240
+MIN_THUMBNAIL_WIDTH = 64
+MAX_THUMBNAIL_WIDTH = 800
+
+class SemesterRequest(BaseModel):
+    concepts: List[str]  # Concepts in teaching order (categories expand to their subcategories)
+    start_date: date  # First day of the term; weekends are skipped
+    difficulty: str
+    school_days: int = 90
+    problems_per_day: int = 12
+    include_answer_key: bool = False
+
+class ProblemResult(BaseModel):
+    student_id: str
+    subcategory: str
+    correct: bool
+
+class ResultsRequest(BaseModel):
+    results: List[ProblemResult]  # Graded problems, usually a whole class at once
 
 @app.get("/")
 async def root():
@@ -60,53 +144,214 @@ async def get_concepts():
         "odd_even": ["identifying", "sorting", "problem_solving"]
     }
 
-@app.post("/api/generate-worksheet")
-async def generate_worksheet(request: WorksheetRequest):
-    """Generates a math worksheet based on user specifications"""
-
-    # Map difficulty to number_range (they're the same in this case)
-    number_range = request.difficulty
-
-    # Validate request
-    if request.worksheet_type not in ["spiral", "fluency"]:
+def validate_worksheet_settings(worksheet_type: str, number_range: str, concepts: List[str]):
+    """Raise a 400 error for settings no worksheet can be built from"""
+    if worksheet_type not in ["spiral", "fluency"]:
         raise HTTPException(status_code=400, detail="Invalid worksheet type")
 
     if number_range not in ["beginner", "intermediate", "advanced"]:
         raise HTTPException(status_code=400, detail="Invalid number range")
 
-    if not request.concepts:
+    if not concepts:
         raise HTTPException(status_code=400, detail="No concepts selected")
 
-    if request.worksheet_type == "fluency" and len(request.concepts) > 1:
+    if worksheet_type == "fluency" and len(concepts) > 1:
         raise HTTPException(status_code=400, detail="Fluency worksheets can only target one concept")
 
-    # Generate problems
+def validate_question_count(worksheet_type: str, question_count: Optional[int],
+                            limit: int = MAX_WORKSHEET_PROBLEMS):
+    """Raise a 400 error for a fluency worksheet without any questions, and a 413 past `limit`"""
+    if worksheet_type != "fluency" or question_count is None:
+        return
+    if question_count < 1:
+        raise HTTPException(status_code=400, detail="question_count must be at least 1")
+    if question_count > limit:
+        raise HTTPException(status_code=413, detail=f"At most {limit} questions per worksheet")
+
+def admission_error(e: AdmissionRejected) -> HTTPException:
+    """The HTTP error for a build the admission controller refused"""
+    headers = {"Retry-After": str(e.retry_after)} if e.retry_after else None
+    return HTTPException(status_code=e.status_code, detail=e.detail, headers=headers)
+
+def discard_partial(filepath: str):
+    """Remove a failed build's unfinished PDF, if it got that far"""
+    try:
+        os.remove(filepath)
+    except OSError:
+        pass
+
+def build_worksheet(request: WorksheetRequest, number_range: str, filepath: str) -> str:
+    """Generate problems and render the worksheet PDF (blocking); returns the published file name"""
+    # Imported here so JSON-only and health-check requests never load ReportLab
+    from pdf_reporting.pdf_generator import create_worksheet_pdf
+    from pdf_reporting.thumbnail import thumbnail_source
+
     try:
-        problems = generate_problems(
+        with profile_stage("generate_problems"):
+            problems = generate_problems(
+                worksheet_type=request.worksheet_type,
+                number_range=number_range,
+                concepts=request.concepts,
+                problem_count=request.question_count if request.worksheet_type == "fluency" else None,
+                student_id=request.student_id,
+                adaptive=request.adaptive,
+                seed=request.seed
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating problems: {str(e)}")
+
+    try:
+        create_worksheet_pdf(
+            problems=problems,
             worksheet_type=request.worksheet_type,
             number_range=number_range,
             concepts=request.concepts,
-            problem_count=request.question_count if request.worksheet_type == "fluency" else None
+            output_path=filepath,
+            include_answer_key=request.include_answer_key
         )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error generating problems: {str(e)}")
+        discard_partial(filepath)
+        raise HTTPException(status_code=500, detail=f"Error creating PDF: {str(e)}")
+    note("question_count", len(problems))
+    note("pdf_bytes", os.path.getsize(filepath))
+    filename = publish_artifact(filepath, "math_worksheet")
+    # Lets /api/thumbnail draw the first page later without re-rendering
+    save_thumbnail_source(os.path.join(os.path.dirname(filepath), filename),
+                          thumbnail_source(problems, request.worksheet_type, number_range))
+    return filename
 
-    # Create a unique filename for the PDF
-    filename = f"math_worksheet_{uuid.uuid4()}.pdf"
-    filepath = os.path.join("temp_pdfs", filename)
+def build_class_packet(request: ClassWorksheetRequest, number_range: str, filepath: str) -> str:
+    """Generate every student's problems and render the packet PDF (blocking); returns the published file name"""
+    from pdf_reporting.pdf_generator import create_class_packet_pdf
+    from pdf_reporting.thumbnail import thumbnail_source
 
-    # Generate PDF
     try:
-        create_worksheet_pdf(
-            problems=problems,
+        with profile_stage("generate_problems"):
+            worksheets = generate_class_problems(
+                worksheet_type=request.worksheet_type,
+                number_range=number_range,
+                concepts=request.concepts,
+                student_ids=request.student_ids,
+                problem_count=request.question_count if request.worksheet_type == "fluency" else None,
+                adaptive=request.adaptive
+            )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating problems: {str(e)}")
+
+    # Large packets render one page group per student across the render pool
+    executor = get_render_pool() if len(worksheets) >= PARALLEL_MIN_STUDENTS else None
+    try:
+        create_class_packet_pdf(
+            worksheets=worksheets,
             worksheet_type=request.worksheet_type,
             number_range=number_range,
             concepts=request.concepts,
             output_path=filepath,
-            include_answer_key=request.include_answer_key
+            include_answer_key=request.include_answer_key,
+            executor=executor
         )
+    except BrokenProcessPool as e:
+        # A render worker died (e.g. out of memory); start a fresh pool next time
+        shutdown_render_pool()
+        discard_partial(filepath)
+        raise HTTPException(status_code=500, detail=f"Error creating PDF: {str(e)}")
     except Exception as e:
+        discard_partial(filepath)
         raise HTTPException(status_code=500, detail=f"Error creating PDF: {str(e)}")
+    filename = publish_artifact(filepath, "math_class_packet")
+    # The packet opens with the first student's worksheet
+    first_student, first_problems = next(iter(worksheets.items()))
+    save_thumbnail_source(os.path.join(os.path.dirname(filepath), filename),
+                          thumbnail_source(first_problems, request.worksheet_type, number_range,
+                                           student_name=first_student))
+    return filename
+
+def render_preview(request: WorksheetRequest, number_range: str, seed: int) -> str:
+    """Generate problems and render the HTML preview (blocking); the student's history is left as it was"""
+    from pdf_reporting.preview import render_worksheet_html
+
+    try:
+        problems = list(iter_problems(
+            worksheet_type=request.worksheet_type,
+            number_range=number_range,
+            concepts=request.concepts,
+            problem_count=request.question_count if request.worksheet_type == "fluency" else None,
+            student_id=request.student_id,
+            adaptive=request.adaptive,
+            seed=seed,
+            save_history=False
+        ))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating problems: {str(e)}")
+    return render_worksheet_html(problems, request.worksheet_type, number_range,
+                                 include_answer_key=request.include_answer_key)
+
+def render_thumbnail_png(source: Dict[str, Any], width: int) -> bytes:
+    """Draw a worksheet's first page from its recorded source (blocking)"""
+    from pdf_reporting.thumbnail import render_thumbnail
+
+    return render_thumbnail(source["problems"], source["worksheet_type"], source["number_range"],
+                            student_name=source.get("student_name"), width=width,
+                            problem_count=source["problem_count"], long_sections=source["long_sections"])
+
+def worksheet_settings(request: WorksheetRequest) -> Dict[str, Any]:
+    """The settings that determine a seeded worksheet, normalized for coalescing identical requests"""
+    return {
+        "worksheet_type": request.worksheet_type,
+        "difficulty": request.difficulty,
+        "concepts": request.concepts,
+        "include_answer_key": request.include_answer_key,
+        "question_count": request.question_count if request.worksheet_type == "fluency" else None,
+        "student_id": request.student_id,
+        "adaptive": request.adaptive and request.student_id is not None,
+        "seed": request.seed,
+    }
+
+def class_settings(request: ClassWorksheetRequest) -> Dict[str, Any]:
+    """The settings that determine a class packet, normalized for coalescing identical requests"""
+    return {
+        "worksheet_type": request.worksheet_type,
+        "difficulty": request.difficulty,
+        "concepts": request.concepts,
+        "student_ids": request.student_ids,
+        "include_answer_key": request.include_answer_key,
+        "question_count": request.question_count if request.worksheet_type == "fluency" else None,
+        "adaptive": request.adaptive,
+    }
+
+async def run_build(estimate, build, *args):
+    """Run a blocking build in the threadpool once the admission controller has room for it"""
+    try:
+        async with get_admission_controller().admit(estimate):
+            return await run_in_threadpool(build, *args)
+    except AdmissionRejected as e:
+        raise admission_error(e)
+
+@app.post("/api/generate-worksheet")
+async def generate_worksheet(request: WorksheetRequest):
+    """Generates a math worksheet based on user specifications"""
+
+    # Map difficulty to number_range (they're the same in this case)
+    number_range = request.difficulty
+
+    # Validate request
+    validate_worksheet_settings(request.worksheet_type, number_range, request.concepts)
+    validate_question_count(request.worksheet_type, request.question_count)
+
+    estimate = get_cost_model().estimate(request.worksheet_type, request.concepts,
+                                         request.question_count, request.include_answer_key)
+
+    async def build():
+        # Render under a unique name; the finished file is renamed to its content hash
+        filepath = os.path.join("temp_pdfs", f"math_worksheet_{uuid.uuid4()}.pdf.part")
+        return await run_build(estimate, build_worksheet, request, number_range, filepath)
+
+    if request.seed is None:
+        # Without a seed every sheet is meant to differ, so identical requests aren't shared
+        filename = await build()
+    else:
+        # Identical seeded requests already in flight (a class clicking at once) share one build
+        filename = await get_single_flight().do(request_key("worksheet", worksheet_settings(request)), build)
 
     # Return a download URL instead of the file directly
     # For Cloud Run, we'll need the full URL with the appropriate host
@@ -114,28 +359,281 @@ async def generate_worksheet(request: WorksheetRequest):
     download_url = f"/api/download/{filename}"
     return {"download_url": download_url}
 
+@app.post("/api/preview")
+async def preview_worksheet(request: WorksheetRequest, http_request: Request):
+    """
+    Returns an HTML preview (inline SVG drawings) of the worksheet
+    /api/generate-worksheet would build, without rendering a PDF.
+
+    The seed used (the request's, or a fresh one) comes back in the
+    X-Worksheet-Seed header; sending it with /api/generate-worksheet builds
+    exactly the previewed sheet.
+    """
+    number_range = request.difficulty
+    validate_worksheet_settings(request.worksheet_type, number_range, request.concepts)
+    validate_question_count(request.worksheet_type, request.question_count)
+    if request.worksheet_type == "fluency" and (request.question_count or 0) > MAX_JSON_PROBLEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_JSON_PROBLEMS} problems per preview")
+
+    estimate = get_cost_model().estimate_generation(request.worksheet_type, request.concepts,
+                                                    request.question_count)
+    seed = request.seed if request.seed is not None else secrets.randbelow(2 ** 31)
+    page = await run_build(estimate, render_preview, request, number_range, seed)
+    response = html_response(http_request, page)
+    response.headers[SEED_HEADER] = str(seed)
+    return response
+
+@app.post("/api/generate-class-worksheets")
+async def generate_class_worksheets(request: ClassWorksheetRequest):
+    """Generates one PDF packet with a (optionally adaptive) worksheet per student"""
+    number_range = request.difficulty
+    validate_worksheet_settings(request.worksheet_type, number_range, request.concepts)
+    validate_question_count(request.worksheet_type, request.question_count)
+
+    if not request.student_ids:
+        raise HTTPException(status_code=400, detail="No students selected")
+
+    if len(set(request.student_ids)) != len(request.student_ids):
+        raise HTTPException(status_code=400, detail="Each student can only be selected once")
+
+    estimate = get_cost_model().estimate(request.worksheet_type, request.concepts, request.question_count,
+                                         request.include_answer_key, copies=len(request.student_ids))
+    workers = render_workers()
+    if len(request.student_ids) >= PARALLEL_MIN_STUDENTS and workers > 1:
+        # Rendered across the pool, whose worker processes hold memory of their own
+        estimate.memory_mb += workers * WORKER_MEMORY_MB
+
+    async def build():
+        filepath = os.path.join("temp_pdfs", f"math_class_packet_{uuid.uuid4()}.pdf.part")
+        return await run_build(estimate, build_class_packet, request, number_range, filepath)
+
+    filename = await get_single_flight().do(request_key("class", class_settings(request)), build)
+    return {"download_url": f"/api/download/{filename}"}
+
+@app.post("/api/problems")
+async def get_problems(request: ProblemsRequest, http_request: Request,
+                       response_format: str = Query("json", alias="format")):
+    """
+    Returns generated problems without rendering a PDF.
+
+    format=json (default) returns {"problems": [...], "count": n};
+    format=ndjson streams one problem per line as they are generated, in
+    constant memory. Both are gzipped when the client sends Accept-Encoding: gzip.
+    """
+    if response_format not in ["json", "ndjson"]:
+        raise HTTPException(status_code=400, detail="format must be json or ndjson")
+
+    number_range = request.difficulty
+    validate_worksheet_settings(request.worksheet_type, number_range, request.concepts)
+    validate_question_count(request.worksheet_type, request.question_count, limit=MAX_STREAM_PROBLEMS)
+
+    limit = MAX_STREAM_PROBLEMS if response_format == "ndjson" else MAX_JSON_PROBLEMS
+    if request.worksheet_type == "fluency" and (request.question_count or 0) > limit:
+        hint = "" if response_format == "ndjson" else "; use format=ndjson for larger exports"
+        raise HTTPException(status_code=413, detail=f"At most {limit} problems per request{hint}")
+
+    problems = iter_problems(
+        worksheet_type=request.worksheet_type,
+        number_range=number_range,
+        concepts=request.concepts,
+        problem_count=request.question_count if request.worksheet_type == "fluency" else None,
+        student_id=request.student_id,
+        adaptive=request.adaptive,
+        seed=request.seed
+    )
+    if response_format == "ndjson":
+        # Admitted like a build, and holds its budget until the stream ends
+        estimate = get_cost_model().estimate_generation(request.worksheet_type, request.concepts,
+                                                        request.question_count, streamed=True)
+        try:
+            release = await get_admission_controller().acquire(estimate)
+        except AdmissionRejected as e:
+            raise admission_error(e)
+        return ndjson_response(http_request, problems, on_close=release)
+
+    problem_list = await run_in_threadpool(list, problems)
+    return json_response(http_request, {"problems": problem_list, "count": len(problem_list)})
+
+# Background semester builds, by job ID (in memory; lost on restart)
+_semester_jobs: Dict[str, Dict[str, Any]] = {}
+
+# Render processes per semester build; each holds one day's PDF against the admission budget
+SEMESTER_RENDER_WORKERS = 2
+
+# Semester builds running at once; each starts its own render processes
+MAX_RUNNING_SEMESTER_JOBS = 1
+
+# Finished jobs are kept this long (seconds) for their status to be read, and at most this many
+SEMESTER_JOB_TTL = 3600
+MAX_FINISHED_SEMESTER_JOBS = 100
+
+def _prune_semester_jobs():
+    """Forget finished semester jobs that have expired, then the oldest past the limit"""
+    now = time.monotonic()
+    finished = sorted((job["finished_at"], job_id) for job_id, job in _semester_jobs.items()
+                      if job["status"] != "running")
+    expired = [job_id for finished_at, job_id in finished if now - finished_at > SEMESTER_JOB_TTL]
+    excess = [job_id for _, job_id in finished[:max(0, len(finished) - MAX_FINISHED_SEMESTER_JOBS)]]
+    for job_id in set(expired + excess):
+        del _semester_jobs[job_id]
+
+async def _run_semester_job(job_id: str, days, number_range: str, include_answer_key: bool, release):
+    """Build a planned term's worksheets, recording progress on the job, then give back its admission"""
+    job = _semester_jobs[job_id]
+
+    def on_day_done(iso_date: str, filename: str):
+        job["worksheets"][iso_date] = f"/api/download/{filename}"
+
+    try:
+        await run_in_threadpool(build_semester, days, number_range, "temp_pdfs",
+                                include_answer_key=include_answer_key, max_workers=SEMESTER_RENDER_WORKERS,
+                                on_day_done=on_day_done)
+        job["status"] = "complete"
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = str(e)
+    finally:
+        job["finished_at"] = time.monotonic()
+        await release()
+
+@app.post("/api/semester")
+async def create_semester(request: SemesterRequest, background_tasks: BackgroundTasks):
+    """Plans a term of spaced spiral review and builds every day's worksheet in the background"""
+    number_range = request.difficulty
+    validate_worksheet_settings("spiral", number_range, request.concepts)
+
+    if not 1 <= request.school_days <= 200:
+        raise HTTPException(status_code=400, detail="school_days must be between 1 and 200")
+
+    if not 1 <= request.problems_per_day <= 40:
+        raise HTTPException(status_code=400, detail="problems_per_day must be between 1 and 40")
+
+    concepts = expand_concepts(request.concepts)
+    if not concepts:
+        raise HTTPException(status_code=400, detail="No valid concepts selected")
+
+    days = SpiralScheduler(
+        concepts, request.start_date,
+        school_days=request.school_days,
+        problems_per_day=request.problems_per_day
+    ).plan()
+
+    # Admitted as one build for the whole term, released when the job finishes
+    sheets = [([concept for concept, _ in day.concepts], day.problem_count) for day in days]
+    estimate = get_cost_model().estimate_separate(sheets, request.include_answer_key,
+                                                  parallel=SEMESTER_RENDER_WORKERS)
+    try:
+        release = await get_admission_controller().acquire(estimate)
+    except AdmissionRejected as e:
+        raise admission_error(e)
+
+    _prune_semester_jobs()
+    if sum(job["status"] == "running" for job in _semester_jobs.values()) >= MAX_RUNNING_SEMESTER_JOBS:
+        await release()
+        raise HTTPException(status_code=503, detail="A semester build is already running, try again shortly",
+                            headers={"Retry-After": "30"})
+
+    job_id = uuid.uuid4().hex
+    _semester_jobs[job_id] = {
+        "status": "running",
+        "total": len(days),
+        "plan": [day.to_dict() for day in days],
+        "worksheets": {},
+    }
+    background_tasks.add_task(_run_semester_job, job_id, days, number_range, request.include_answer_key, release)
+
+    return {"job_id": job_id, "status_url": f"/api/semester/{job_id}"}
+
+@app.get("/api/semester/{job_id}")
+async def get_semester(job_id: str):
+    """Reports a semester build's progress and the download URLs of finished days"""
+    job = _semester_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Semester job not found")
+
+    return {
+        "status": job["status"],
+        "completed": len(job["worksheets"]),
+        "total": job["total"],
+        "error": job.get("error"),
+        "plan": job["plan"],
+        "worksheets": dict(sorted(job["worksheets"].items())),
+    }
+
+@app.post("/api/results")
+async def record_results(request: ResultsRequest):
+    """Records graded problems so adaptive worksheets can follow each student's mastery"""
+    recorded = get_mastery_store().record_results(
+        (r.student_id, r.subcategory, r.correct) for r in request.results
+    )
+    return {"recorded": recorded}
+
 @app.get("/api/download/{filename}")
-async def download_file(filename: str):
-    """Endpoint to download the generated PDF file"""
+async def download_file(filename: str, request: Request):
+    """Endpoint to download the generated PDF file (supports If-None-Match and Range)"""
     filepath = os.path.join("temp_pdfs", filename)
     
-    if not os.path.exists(filepath):
+    if not filename.endswith(".pdf") or not os.path.isfile(filepath):
         raise HTTPException(status_code=404, detail="File not found")
     
-    return FileResponse(
-        path=filepath,
-        filename=f"math_worksheet.pdf",
-        media_type="application/pdf"
-    )
+    return artifact_response(request, filepath, "math_worksheet.pdf")
+
+@app.get("/api/thumbnail/{filename}")
+async def get_thumbnail(filename: str, request: Request,
+                        width: int = Query(THUMBNAIL_WIDTH, ge=MIN_THUMBNAIL_WIDTH, le=MAX_THUMBNAIL_WIDTH)):
+    """
+    PNG of a generated PDF's first page, `width` pixels wide.
+
+    Drawn once per worksheet content and width, then served from the cache;
+    cached by clients like the PDF itself (immutable for content-hashed names).
+    """
+    pdf_path = os.path.join("temp_pdfs", filename)
+    digest = thumbnail_digest(pdf_path) if filename.endswith(".pdf") else None
+    if digest is None:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+
+    etag = f'"{digest}-{width}"'
+    # The recorded source is only read when the thumbnail has to be drawn
+    if not not_modified(request, etag) and thumbnail_cache.get(digest, width) is None:
+        async def render():
+            source = load_thumbnail_source(pdf_path)
+            if source is None:
+                raise HTTPException(status_code=404, detail="Thumbnail not found")
+            png = await run_in_threadpool(render_thumbnail_png, source, width)
+            return thumbnail_cache.put(digest, width, png)
+
+        # A page of thumbnails requested at once draws each worksheet once
+        await get_single_flight().do(request_key("thumbnail", {"digest": digest, "width": width}), render)
+
+    return image_response(request, thumbnail_cache.path(digest, width), etag,
+                          immutable=is_content_addressed(filename))
+
+@app.get("/api/metrics/memory")
+async def get_memory_metrics():
+    """Per-stage memory peaks from profiled requests (MEMORY_PROFILE=1 or X-Memory-Profile: 1)"""
+    return memory_metrics()
 
 # Add a health check endpoint for Cloud Run
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def ready_check():
+    """Ready once the startup warmup has run (use as the startup probe); reports import and warmup times"""
+    state = readiness()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+@app.on_event("startup")
+def warm_up():
+    """Warm generators, styles and the PDF renderer in the background so the first request doesn't pay for it"""
+    start_warmup()
+
 @app.on_event("shutdown")
 def cleanup():
-    """Clean up temporary files on shutdown"""
+    """Stop the render pool and clean up temporary files on shutdown"""
+    shutdown_render_pool()
+    thumbnail_cache.clear()
     for file in os.listdir("temp_pdfs"):
         try:
             os.remove(os.path.join("temp_pdfs", file))
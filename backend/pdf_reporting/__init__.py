@@ -1,3 +1,21 @@
 # PDF Reporting Module
+#
+# The builders and the preview and thumbnail renderers load on first use, so
+# importing this package (or a light submodule) doesn't import ReportLab.
 
-from .pdf_generator import create_worksheet_pdf
+import importlib
+
+# Public name: submodule it lives in
+_EXPORTS = {
+    "create_worksheet_pdf": "pdf_generator",
+    "create_class_packet_pdf": "pdf_generator",
+    "render_worksheet_html": "preview",
+    "render_thumbnail": "thumbnail",
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
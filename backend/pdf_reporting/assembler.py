@@ -0,0 +1,157 @@
+# pdf_reporting/assembler.py
+
+import hashlib
+import re
+from typing import Dict, List, Tuple
+
+# Objects 1 and 2 of the assembled file; written last, once every page is known
+PAGES_NUM = 1
+CATALOG_NUM = 2
+
+_REF = re.compile(rb"(\d+) 0 R")
+_PARENT = re.compile(rb"/Parent \d+ 0 R")
+_STREAM = re.compile(rb">>\s*stream\r?\n")
+
+
+def _parse_fragment(data: bytes) -> Tuple[Dict[int, bytes], List[int]]:
+    """
+    Split a single-revision PDF (as ReportLab writes them) into its objects.
+
+    Returns:
+        ({object number: body between "obj" and "endobj"}, page object numbers in order)
+    """
+    startxref = int(data[data.rindex(b"startxref") + 9:].split()[0])
+    lines = data[startxref:].split(b"\n")
+    if lines[0].strip() != b"xref":
+        raise ValueError("fragment has no classic xref table")
+    first, count = (int(v) for v in lines[1].split())
+    offsets = {}
+    for i, line in enumerate(lines[2:2 + count]):
+        offset, _, kind = line.split()[:3]
+        if kind == b"n":
+            offsets[first + i] = int(offset)
+
+    # Each object runs to the next one (or the xref table); this never scans
+    # stream data for "endobj"
+    objects = {}
+    starts = sorted(offsets.values())
+    ends = dict(zip(starts, starts[1:] + [startxref]))
+    for num, offset in offsets.items():
+        chunk = data[offset:ends[offset]]
+        body = chunk[chunk.index(b"obj") + 3:chunk.rindex(b"endobj")]
+        objects[num] = body.strip(b"\r\n")
+
+    trailer = data[data.rindex(b"trailer"):]
+    root = int(re.search(rb"/Root (\d+) 0 R", trailer).group(1))
+    pages = int(_REF.search(objects[root][objects[root].index(b"/Pages"):]).group(1))
+    kids = objects[pages][objects[pages].index(b"/Kids"):]
+    kids = kids[:kids.index(b"]")]
+    return objects, [int(n) for n in _REF.findall(kids)]
+
+
+def _split_stream(body: bytes) -> Tuple[bytes, bytes]:
+    """(dictionary, stream section) of an object body; the stream section is empty for plain objects"""
+    match = _STREAM.search(body)
+    if match is None:
+        return body, b""
+    return body[:match.start() + 2], body[match.start() + 2:]
+
+
+class PdfAssembler:
+    """
+    Writes one PDF from independently rendered fragments, page by page.
+
+    Each fragment's pages and everything they reference (content streams,
+    fonts, forms) are renumbered and written to the output as soon as the
+    fragment is added, so memory holds one fragment at a time plus an offset
+    and a digest per object. Objects identical to one already written (the
+    fonts and forms every fragment carries) are shared rather than copied.
+    Nothing is re-rendered. Fragments are expected to be our own
+    ReportLab output: one revision, a classic xref table, and no references
+    inside string literals.
+    """
+
+    def __init__(self, out):
+        self._out = out
+        self._offsets: Dict[int, int] = {}
+        self._pages: List[int] = []
+        self._shared: Dict[bytes, int] = {}
+        self._next_num = CATALOG_NUM + 1
+        self._position = 0
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pages)
+
+    def _write(self, data: bytes):
+        self._out.write(data)
+        self._position += len(data)
+
+    def _new_num(self) -> int:
+        self._next_num += 1
+        return self._next_num - 1
+
+    def _write_object(self, num: int, body: bytes):
+        self._offsets[num] = self._position
+        self._write(b"%d 0 obj\n" % num + body + b"\nendobj\n")
+
+    def add_fragment(self, data: bytes):
+        """Append every page of a rendered PDF"""
+        objects, pages = _parse_fragment(data)
+        page_set = set(pages)
+        renumber: Dict[int, int] = {}
+
+        def relink(match):
+            return b"%d 0 R" % renumber[int(match.group(1))]
+
+        # Place objects children-first, so each body can be relinked (and
+        # compared with what earlier fragments wrote) once its references
+        # are final. The fragment's own page tree is skipped; pages are
+        # re-parented onto ours.
+        for page in pages:
+            stack = [(page, False)]
+            visiting = set()
+            while stack:
+                num, expanded = stack.pop()
+                if num in renumber:
+                    continue
+                head, stream = _split_stream(objects[num])
+                if num in page_set:
+                    head = _PARENT.sub(b"", head)
+                if not expanded:
+                    if num in visiting:
+                        raise ValueError(f"reference cycle through object {num}")
+                    visiting.add(num)
+                    stack.append((num, True))
+                    stack.extend((int(ref), False) for ref in _REF.findall(head) if int(ref) not in renumber)
+                    continue
+
+                body = _REF.sub(relink, head) + stream
+                if num in page_set:
+                    renumber[num] = self._new_num()
+                    self._write_object(renumber[num], body.replace(b"<<", b"<< /Parent %d 0 R" % PAGES_NUM, 1))
+                    continue
+                # Fonts, forms and resource dictionaries repeat in every fragment;
+                # write each distinct one once
+                digest = hashlib.blake2b(body, digest_size=16).digest()
+                if digest not in self._shared:
+                    self._shared[digest] = self._new_num()
+                    self._write_object(self._shared[digest], body)
+                renumber[num] = self._shared[digest]
+
+        self._pages.extend(renumber[num] for num in pages)
+
+    def close(self):
+        """Write the page tree, catalog, xref table and trailer"""
+        kids = b" ".join(b"%d 0 R" % num for num in self._pages)
+        self._write_object(PAGES_NUM, b"<< /Count %d /Kids [ %s ] /Type /Pages >>" % (len(self._pages), kids))
+        self._write_object(CATALOG_NUM, b"<< /Pages %d 0 R /Type /Catalog >>" % PAGES_NUM)
+
+        xref_at = self._position
+        size = self._next_num
+        rows = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        rows.extend(b"%010d 00000 n \n" % self._offsets[num] for num in range(1, size))
+        self._write(b"".join(rows))
+        self._write(b"trailer\n<< /Root %d 0 R /Size %d >>\nstartxref\n%d\n%%%%EOF\n"
+                    % (CATALOG_NUM, size, xref_at))
\ No newline at end of file
@@ -0,0 +1,280 @@
+# pdf_reporting/layout.py
+#
+# What goes on a worksheet, independent of how it is drawn. Each problem
+# becomes a list of blocks, which the PDF builder turns into flowables and
+# the HTML preview into markup:
+#
+#   ('text', markup, style)      Paragraph markup (<b>, <br/>, &nbsp;, <font>) in a named style
+#   ('space', height)            a vertical gap, in points
+#   ('vmath', op, top, bottom)   vertical arithmetic over an answer bar
+#   ('visual', kind, *args)      a drawing; kind is one of VISUAL_KINDS
+#
+# Nothing here imports ReportLab.
+
+from xml.sax.saxutils import escape as xml_escape
+
+CATEGORY_NAMES = {
+    'addition':       'Add.',
+    'subtraction':    'Subtract.',
+    'number_sense':   'Number Sense.',
+    'skip_counting':  'Skip count.',
+    'place_value':    'Place Value.',
+    'time_telling':   'Write the time.',
+    'money_counting': 'Count the money.',
+    'word_problems':  'Solve the word problem.',
+    'shapes':         'Shapes.',
+    'fractions':      'Fractions.',
+    'measurement':    'Measurement.',
+    'patterns':       'Find the pattern.',
+    'graphing':       'Data & Graphing.',
+    'odd_even':       'Odd or Even?',
+    'general':        'Solve.',
+}
+
+# Drawings a block can ask for, with the arguments that follow the kind
+VISUAL_KINDS = {
+    'bar_graph':   ('items', 'values'),
+    'pictograph':  ('items', 'values'),
+    'base_ten':    ('number',),
+    'number_line': ('number', 'blank_offset'),
+    'clock':       ('hour', 'minute'),
+    'coins':       ('coins',),
+    'fraction':    ('shape', 'total_parts', 'shaded_parts'),
+    'ruler':       ('unit', 'measurement'),
+}
+
+
+def escape_markup(text):
+    """Escape XML special chars and convert newlines to <br/>."""
+    return xml_escape(str(text)).replace('\n', '<br/>')
+
+
+_e = escape_markup
+
+
+def worksheet_title(worksheet_type, number_range):
+    """Title line of a worksheet."""
+    type_label = 'Spiral Review' if worksheet_type == 'spiral' else 'Fluency Practice'
+    return f'Math {type_label}  \u2014  {number_range.capitalize()}'
+
+
+def section_label(category):
+    """Instruction label at the top of a category's section box."""
+    return CATEGORY_NAMES.get(category, category.replace('_', ' ').title() + '.')
+
+
+def group_by_category(problems):
+    """Problems grouped by category, in order of first appearance."""
+    seen = {}
+    for p in problems:
+        cat = p.get('category', 'general')
+        seen.setdefault(cat, []).append(p)
+    return seen
+
+
+def problem_blocks(problem, num):
+    """The blocks for one problem (see the module comment)."""
+    prob_type = problem.get('type', '')
+    category  = problem.get('category', '')
+
+    # ── Vertical math ─────────────────────────────────────────────────────────
+    if category in ('addition', 'subtraction') or prob_type in ('addition', 'subtraction'):
+        op = '+' if (category == 'addition' or prob_type == 'addition') else '-'
+        n1 = str(problem.get('first_number',  '?'))
+        n2 = str(problem.get('second_number', '?'))
+        return [('vmath', op, n1, n2), ('space', 4)]
+
+    # ── Graphs ────────────────────────────────────────────────────────────────
+    display = problem.get('display_type')
+    if display in ('pictograph', 'bar_graph') and 'items' in problem:
+        return [
+            ('visual', display, problem['items'], problem.get('values', {})),
+            ('space', 4),
+            ('text', f'{num}. {_e(problem.get("question", ""))}', 'q'),
+            ('text', 'Answer: _______________', 'ans'),
+        ]
+
+    # Expanded form carries a prebuilt question; show the blocks alongside it
+    if prob_type == 'expanded_form' and isinstance(problem.get('number'), int):
+        return [
+            ('text', f'{num}. {_e(problem.get("question", ""))}', 'q'),
+            ('visual', 'base_ten', problem['number']),
+            ('text', 'Answer: _______________', 'ans'),
+        ]
+
+    # ── Pre-built question fields ─────────────────────────────────────────────
+    if 'text' in problem:        # word_problems
+        return [
+            ('text', _e(problem['text']), 'q'),
+            ('space', 6),
+            ('text', 'Answer: _______________________________', 'ans'),
+        ]
+    if 'question' in problem:
+        return [
+            ('text', f'{num}. {_e(problem["question"])}', 'q'),
+            ('text', 'Answer: _______________', 'ans'),
+        ]
+
+    # ── Number sense ──────────────────────────────────────────────────────────
+    if prob_type == 'comparison':
+        return [('text',
+            f'{num}.&nbsp;&nbsp;'
+            f'<b>{_e(problem.get("first_number","?"))}</b>'
+            f'&nbsp;&nbsp;[ ]&nbsp;&nbsp;'
+            f'<b>{_e(problem.get("second_number","?"))}</b>'
+            f'&nbsp;&nbsp;<font size="9" color="grey">(write &lt;, &gt;, or =)</font>',
+            'q')]
+
+    if prob_type == 'ordering':
+        nums = ',&nbsp;&nbsp;'.join(str(n) for n in problem.get('numbers', []))
+        return [
+            ('text', f'{num}. Order from least to greatest:', 'q'),
+            ('text', f'&nbsp;&nbsp;&nbsp;&nbsp;{nums}', 'q'),
+            ('text', '___________________________', 'ans'),
+        ]
+
+    if prob_type == 'before_after':
+        question_type = problem.get('question_type', 'before')
+        elements = [
+            ('text',
+                f'{num}. What comes <b>{_e(question_type)}</b>'
+                f' {_e(problem.get("number","?"))}?',
+                'q'),
+        ]
+        if isinstance(problem.get('number'), int):
+            elements.append(('visual', 'number_line', problem['number'], -1 if question_type == 'before' else 1))
+        elements.append(('text', '_______', 'ans'))
+        return elements
+
+    if prob_type == 'missing_numbers':
+        seq = problem.get('sequence', problem.get('numbers', []))
+        fmt = ',&nbsp;&nbsp;'.join('______' if n is None else str(n) for n in seq)
+        return [('text', f'{num}. {fmt}', 'q')]
+
+    # ── Skip counting ─────────────────────────────────────────────────────────
+    if prob_type in ('by_ones_twos', 'by_fives_tens', 'by_hundreds'):
+        seq = problem.get('sequence', [])
+        fmt = ',&nbsp;&nbsp;'.join('______' if n is None else str(n) for n in seq)
+        return [('text', f'{num}. {fmt}', 'q')]
+
+    # ── Place value ───────────────────────────────────────────────────────────
+    if prob_type in ('ones_tens', 'ones_tens_hundreds'):
+        return [
+            ('text',
+                f'{num}. What digit is in the <b>{_e(problem.get("place",""))}</b> place?',
+                'q'),
+            ('text',
+                f'&nbsp;&nbsp;&nbsp;&nbsp;Number: <b>{_e(problem.get("number",""))}</b>',
+                'q'),
+            ('visual', 'base_ten', problem.get('number', 0)),
+            ('text', '_______', 'ans'),
+        ]
+
+    # ── Time telling ──────────────────────────────────────────────────────────
+    if prob_type in ('whole_hours', 'half_hours', 'quarter_hours', 'five_minute_increments'):
+        h = problem.get('hour', 0)
+        m = problem.get('minute', 0)
+        return [
+            ('text', f'{num}. What time does the clock show?', 'q'),
+            ('visual', 'clock', h, m),
+            ('text', '_______', 'ans'),
+        ]
+
+    # ── Money ─────────────────────────────────────────────────────────────────
+    if prob_type == 'identifying_coins':
+        return [
+            ('text', f'{num}. What coin is this?', 'q'),
+            ('visual', 'coins', [problem.get('coin_type', 'penny')]),
+            ('text', '_______', 'ans'),
+        ]
+    if prob_type == 'counting_pennies_nickels':
+        coin = problem.get('coin_type', 'penny')
+        plural = 'pennies' if coin == 'penny' else coin + 's'
+        return [
+            ('text', f'{num}. Count the {_e(plural)}:', 'q'),
+            ('visual', 'coins', [coin] * problem.get('count', 0)),
+            ('text', 'Total = ______ cents', 'q'),
+        ]
+    if prob_type == 'mixed_coins':
+        return [
+            ('text', f'{num}. Count the money:', 'q'),
+            ('visual', 'coins', problem.get('coins', [])),
+            ('text', 'Total = ______ cents', 'q'),
+        ]
+    if prob_type == 'making_change':
+        return [('text',
+            f'{num}. Cost: {_e(problem.get("cost",""))}c'
+            f'&nbsp;&nbsp;Paid: {_e(problem.get("payment",""))}c<br/>'
+            f'Change = ______ cents',
+            'q')]
+
+    # ── Fractions ─────────────────────────────────────────────────────────────
+    if prob_type in ('halves_wholes', 'thirds_fourths'):
+        return [
+            ('text', f'{num}. What fraction is shaded?', 'q'),
+            ('visual', 'fraction', problem.get('shape', 'square'),
+             problem.get('total_parts', 1), problem.get('shaded_parts', 0)),
+            ('text', '_______', 'ans'),
+        ]
+    if prob_type == 'comparing_fractions':
+        return [('text',
+            f'{num}.&nbsp;&nbsp;'
+            f'<b>{_e(problem.get("fraction1",""))}</b>'
+            f'&nbsp;&nbsp;[ ]&nbsp;&nbsp;'
+            f'<b>{_e(problem.get("fraction2",""))}</b>'
+            f'&nbsp;&nbsp;<font size="9" color="grey">(write &lt;, &gt;, or =)</font>',
+            'q')]
+
+    # ── Measurement ───────────────────────────────────────────────────────────
+    if prob_type == 'comparing_objects':
+        return [
+            ('text',
+                f'{num}. Which is {_e(problem.get("property",""))}er?<br/>'
+                f'{_e(problem.get("object1",""))}'
+                f'&nbsp;&nbsp;or&nbsp;&nbsp;'
+                f'{_e(problem.get("object2",""))}',
+                'q'),
+            ('text', '_______', 'ans'),
+        ]
+    if prob_type == 'non_standard_units':
+        return [('text',
+            f'{num}. How long is the {_e(problem.get("item_to_measure",""))}?<br/>'
+            f'About ______ {_e(problem.get("measuring_object",""))}s long',
+            'q')]
+    if prob_type == 'rulers_inches_cm':
+        return [
+            ('text', f'{num}. How long is the line?', 'q'),
+            ('visual', 'ruler', problem.get('unit', 'inches'), problem.get('measurement', 0)),
+            ('text', f'______ {_e(problem.get("unit",""))}', 'q'),
+        ]
+
+    # ── Patterns ─────────────────────────────────────────────────────────────
+    if prob_type == 'abab_patterns':
+        pat = ',&nbsp;&nbsp;'.join(str(p) for p in problem.get('pattern', []))
+        return [('text', f'{num}. What comes next?<br/>&nbsp;&nbsp;{pat}, ______', 'q')]
+    if prob_type == 'extending_patterns':
+        pat = ',&nbsp;&nbsp;'.join(str(p) for p in problem.get('pattern', []))
+        return [('text', f'{num}. Extend the pattern:<br/>&nbsp;&nbsp;{pat}, ______', 'q')]
+    if prob_type == 'creating_patterns':
+        seq = problem.get('pattern', [])
+        fmt = ',&nbsp;&nbsp;'.join('______' if n is None else str(n) for n in seq)
+        return [('text', f'{num}. Fill in:<br/>&nbsp;&nbsp;{fmt}', 'q')]
+
+    # ── Shapes ────────────────────────────────────────────────────────────────
+    if prob_type == 'basic_2d_3d':
+        kind = '2D' if problem.get('shape_type') == '2d' else '3D'
+        return [
+            ('text', f'{num}. Name this {kind} shape:', 'q'),
+            ('text', '_______', 'ans'),
+        ]
+    if prob_type == 'edges_faces_vertices':
+        return [
+            ('text',
+                f'{num}. How many <b>{_e(problem.get("question_type",""))}</b>'
+                f' does a {_e(problem.get("shape_name",""))} have?',
+                'q'),
+            ('text', '_______', 'ans'),
+        ]
+
+    # ── Fallback ──────────────────────────────────────────────────────────────
+    return [('text', f'{num}. ______', 'q')]
\ No newline at end of file
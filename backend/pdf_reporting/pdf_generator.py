@@ -1,5 +1,8 @@
 # pdf_generator.py
 
+import io
+from collections import deque
+from functools import lru_cache, partial
 from xml.sax.saxutils import escape as xml_escape
 
 from reportlab.lib import colors
@@ -12,6 +15,16 @@ from reportlab.platypus import (
     Paragraph, Spacer, Table, TableStyle, HRFlowable, PageBreak,
 )
 
+from profiling import profile_stage
+
+from .assembler import PdfAssembler
+from .render_pool import render_workers
+from .layout import escape_markup as _e, group_by_category, problem_blocks, section_label, worksheet_title
+from .visuals import (
+    ClockFace, CoinRow, FractionShape, BarGraph, Pictograph, NumberLine, Ruler,
+    BaseTenBlocks,
+)
+
 # ── Colors ────────────────────────────────────────────────────────────────────
 BLACK    = colors.black
 DARK_GRAY = colors.HexColor('#333333')
@@ -19,32 +32,9 @@ MID_GRAY  = colors.HexColor('#666666')
 WHITE     = colors.white
 TITLE_CLR = colors.HexColor('#1A237E')   # deep navy for page title
 
-CATEGORY_NAMES = {
-    'addition':       'Add.',
-    'subtraction':    'Subtract.',
-    'number_sense':   'Number Sense.',
-    'skip_counting':  'Skip count.',
-    'place_value':    'Place Value.',
-    'time_telling':   'Write the time.',
-    'money_counting': 'Count the money.',
-    'word_problems':  'Solve the word problem.',
-    'shapes':         'Shapes.',
-    'fractions':      'Fractions.',
-    'measurement':    'Measurement.',
-    'patterns':       'Find the pattern.',
-    'graphing':       'Data & Graphing.',
-    'odd_even':       'Odd or Even?',
-    'general':        'Solve.',
-}
-
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def _e(text):
-    """Escape XML special chars and convert newlines to <br/>."""
-    return xml_escape(str(text)).replace('\n', '<br/>')
-
-
 def _vertical_math(op_char, n1_str, n2_str, styles):
     """Return a Table Flowable for a vertical math problem.
 
@@ -79,190 +69,39 @@ def _vertical_math(op_char, n1_str, n2_str, styles):
     return tbl
 
 
+# Flowable class for each visual kind in the layout blocks
+_VISUALS = {
+    'bar_graph':   BarGraph,
+    'pictograph':  Pictograph,
+    'base_ten':    BaseTenBlocks,
+    'number_line': NumberLine,
+    'clock':       ClockFace,
+    'coins':       CoinRow,
+    'fraction':    FractionShape,
+    'ruler':       Ruler,
+}
+
+
+def _flowable(block, styles):
+    """The Flowable for one layout block."""
+    kind = block[0]
+    if kind == 'text':
+        return Paragraph(block[1], styles[block[2]])
+    if kind == 'space':
+        return Spacer(1, block[1])
+    if kind == 'vmath':
+        return _vertical_math(*block[1:], styles)
+    return _VISUALS[block[1]](*block[2:])
+
+
 def _format_problem(problem, num, styles):
     """Return a list of Flowables for one problem."""
-    prob_type = problem.get('type', '')
-    category  = problem.get('category', '')
-
-    # ── Vertical math ─────────────────────────────────────────────────────────
-    if category in ('addition', 'subtraction') or prob_type in ('addition', 'subtraction'):
-        op = '+' if (category == 'addition' or prob_type == 'addition') else '-'
-        n1 = str(problem.get('first_number',  '?'))
-        n2 = str(problem.get('second_number', '?'))
-        return [_vertical_math(op, n1, n2, styles), Spacer(1, 4)]
-
-    # ── Pre-built question fields ─────────────────────────────────────────────
-    if 'text' in problem:        # word_problems
-        return [
-            Paragraph(_e(problem['text']), styles['q']),
-            Spacer(1, 6),
-            Paragraph('Answer: _______________________________', styles['ans']),
-        ]
-    if 'question' in problem:
-        return [
-            Paragraph(f'{num}. {_e(problem["question"])}', styles['q']),
-            Paragraph('Answer: _______________', styles['ans']),
-        ]
-
-    # ── Number sense ──────────────────────────────────────────────────────────
-    if prob_type == 'comparison':
-        return [Paragraph(
-            f'{num}.&nbsp;&nbsp;'
-            f'<b>{_e(problem.get("first_number","?"))}</b>'
-            f'&nbsp;&nbsp;[ ]&nbsp;&nbsp;'
-            f'<b>{_e(problem.get("second_number","?"))}</b>'
-            f'&nbsp;&nbsp;<font size="9" color="grey">(write &lt;, &gt;, or =)</font>',
-            styles['q'])]
-
-    if prob_type == 'ordering':
-        nums = ',&nbsp;&nbsp;'.join(str(n) for n in problem.get('numbers', []))
-        return [
-            Paragraph(f'{num}. Order from least to greatest:', styles['q']),
-            Paragraph(f'&nbsp;&nbsp;&nbsp;&nbsp;{nums}', styles['q']),
-            Paragraph('___________________________', styles['ans']),
-        ]
-
-    if prob_type == 'before_after':
-        return [
-            Paragraph(
-                f'{num}. What comes <b>{_e(problem.get("question_type","before"))}</b>'
-                f' {_e(problem.get("number","?"))}?',
-                styles['q']),
-            Paragraph('_______', styles['ans']),
-        ]
-
-    if prob_type == 'missing_numbers':
-        seq = problem.get('sequence', problem.get('numbers', []))
-        fmt = ',&nbsp;&nbsp;'.join('______' if n is None else str(n) for n in seq)
-        return [Paragraph(f'{num}. {fmt}', styles['q'])]
-
-    # ── Skip counting ─────────────────────────────────────────────────────────
-    if prob_type in ('by_ones_twos', 'by_fives_tens', 'by_hundreds'):
-        seq = problem.get('sequence', [])
-        fmt = ',&nbsp;&nbsp;'.join('______' if n is None else str(n) for n in seq)
-        return [Paragraph(f'{num}. {fmt}', styles['q'])]
-
-    # ── Place value ───────────────────────────────────────────────────────────
-    if prob_type in ('ones_tens', 'ones_tens_hundreds'):
-        return [
-            Paragraph(
-                f'{num}. What digit is in the <b>{_e(problem.get("place",""))}</b> place?',
-                styles['q']),
-            Paragraph(
-                f'&nbsp;&nbsp;&nbsp;&nbsp;Number: <b>{_e(problem.get("number",""))}</b>',
-                styles['q']),
-            Paragraph('_______', styles['ans']),
-        ]
-
-    # ── Time telling ──────────────────────────────────────────────────────────
-    if prob_type in ('whole_hours', 'half_hours', 'quarter_hours', 'five_minute_increments'):
-        h = problem.get('hour', 0)
-        m = problem.get('minute', 0)
-        return [
-            Paragraph(f'{num}. What time does the clock show?', styles['q']),
-            Paragraph(f'The clock shows <b>{h}:{m:02d}</b>', styles['q']),
-            Paragraph('_______', styles['ans']),
-        ]
-
-    # ── Money ─────────────────────────────────────────────────────────────────
-    if prob_type == 'identifying_coins':
-        return [
-            Paragraph(f'{num}. What coin is this?', styles['q']),
-            Paragraph('_______', styles['ans']),
-        ]
-    if prob_type == 'counting_pennies_nickels':
-        return [Paragraph(
-            f'{num}. Count the {_e(problem.get("coin_type",""))}s:<br/>'
-            f'&nbsp;&nbsp;{_e(problem.get("count",""))} coins = ______ cents',
-            styles['q'])]
-    if prob_type == 'mixed_coins':
-        coins = ', '.join(problem.get('coins', []))
-        return [Paragraph(
-            f'{num}. Count: {_e(coins)}<br/>Total = ______ cents',
-            styles['q'])]
-    if prob_type == 'making_change':
-        return [Paragraph(
-            f'{num}. Cost: {_e(problem.get("cost",""))}c'
-            f'&nbsp;&nbsp;Paid: {_e(problem.get("payment",""))}c<br/>'
-            f'Change = ______ cents',
-            styles['q'])]
-
-    # ── Fractions ─────────────────────────────────────────────────────────────
-    if prob_type in ('halves_wholes', 'thirds_fourths'):
-        return [
-            Paragraph(
-                f'{num}. What fraction is shaded?<br/>'
-                f'({_e(problem.get("shaded_parts",""))} of'
-                f' {_e(problem.get("total_parts",""))} parts)',
-                styles['q']),
-            Paragraph('_______', styles['ans']),
-        ]
-    if prob_type == 'comparing_fractions':
-        return [Paragraph(
-            f'{num}.&nbsp;&nbsp;'
-            f'<b>{_e(problem.get("fraction1",""))}</b>'
-            f'&nbsp;&nbsp;[ ]&nbsp;&nbsp;'
-            f'<b>{_e(problem.get("fraction2",""))}</b>'
-            f'&nbsp;&nbsp;<font size="9" color="grey">(write &lt;, &gt;, or =)</font>',
-            styles['q'])]
-
-    # ── Measurement ───────────────────────────────────────────────────────────
-    if prob_type == 'comparing_objects':
-        return [
-            Paragraph(
-                f'{num}. Which is {_e(problem.get("property",""))}er?<br/>'
-                f'{_e(problem.get("object1",""))}'
-                f'&nbsp;&nbsp;or&nbsp;&nbsp;'
-                f'{_e(problem.get("object2",""))}',
-                styles['q']),
-            Paragraph('_______', styles['ans']),
-        ]
-    if prob_type == 'non_standard_units':
-        return [Paragraph(
-            f'{num}. How long is the {_e(problem.get("item_to_measure",""))}?<br/>'
-            f'About ______ {_e(problem.get("measuring_object",""))}s long',
-            styles['q'])]
-    if prob_type == 'rulers_inches_cm':
-        return [Paragraph(
-            f'{num}. Measure the line ({_e(problem.get("unit",""))}):<br/>'
-            f'______ {_e(problem.get("unit",""))}',
-            styles['q'])]
-
-    # ── Patterns ─────────────────────────────────────────────────────────────
-    if prob_type == 'abab_patterns':
-        pat = ',&nbsp;&nbsp;'.join(str(p) for p in problem.get('pattern', []))
-        return [Paragraph(f'{num}. What comes next?<br/>&nbsp;&nbsp;{pat}, ______', styles['q'])]
-    if prob_type == 'extending_patterns':
-        pat = ',&nbsp;&nbsp;'.join(str(p) for p in problem.get('pattern', []))
-        return [Paragraph(f'{num}. Extend the pattern:<br/>&nbsp;&nbsp;{pat}, ______', styles['q'])]
-    if prob_type == 'creating_patterns':
-        seq = problem.get('pattern', [])
-        fmt = ',&nbsp;&nbsp;'.join('______' if n is None else str(n) for n in seq)
-        return [Paragraph(f'{num}. Fill in:<br/>&nbsp;&nbsp;{fmt}', styles['q'])]
-
-    # ── Shapes ────────────────────────────────────────────────────────────────
-    if prob_type == 'basic_2d_3d':
-        kind = '2D' if problem.get('shape_type') == '2d' else '3D'
-        return [
-            Paragraph(f'{num}. Name this {kind} shape:', styles['q']),
-            Paragraph('_______', styles['ans']),
-        ]
-    if prob_type == 'edges_faces_vertices':
-        return [
-            Paragraph(
-                f'{num}. How many <b>{_e(problem.get("question_type",""))}</b>'
-                f' does a {_e(problem.get("shape_name",""))} have?',
-                styles['q']),
-            Paragraph('_______', styles['ans']),
-        ]
-
-    # ── Fallback ──────────────────────────────────────────────────────────────
-    return [Paragraph(f'{num}. ______', styles['q'])]
+    return [_flowable(block, styles) for block in problem_blocks(problem, num)]
 
 
 def _make_section(category, problems, col_w, styles):
     """Build one section box: small instruction label + problems, black border."""
-    label = CATEGORY_NAMES.get(category, category.replace('_', ' ').title() + '.')
+    label = section_label(category)
 
     inner = [Paragraph(label, styles['sec_label']), Spacer(1, 6)]
     for i, prob in enumerate(problems):
@@ -286,6 +125,36 @@ def _make_section(category, problems, col_w, styles):
     return section
 
 
+def _make_long_section(category, problems, width, styles):
+    """Full-width section for sheets too tall for one box.
+
+    Problems flow in two columns, one table row per pair, so the section can
+    split across pages; the instruction label repeats at the top of each page.
+    """
+    label = section_label(category)
+
+    cells = [_format_problem(prob, i + 1, styles) + [Spacer(1, 6)]
+             for i, prob in enumerate(problems)]
+    if len(cells) % 2:
+        cells.append('')
+
+    rows = [[Paragraph(label, styles['sec_label']), '']]
+    rows += [[cells[i], cells[i + 1]] for i in range(0, len(cells), 2)]
+
+    section = Table(rows, colWidths=[width / 2, width / 2], repeatRows=1)
+    section.setStyle(TableStyle([
+        ('SPAN',          (0, 0), (-1, 0)),
+        ('BACKGROUND',    (0, 0), (-1, -1), WHITE),
+        ('TOPPADDING',    (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ('LEFTPADDING',   (0, 0), (-1, -1), 10),
+        ('RIGHTPADDING',  (0, 0), (-1, -1), 10),
+        ('VALIGN',        (0, 0), (-1, -1), 'TOP'),
+        ('BOX',           (0, 0), (-1, -1), 1.5, BLACK),
+    ]))
+    return section
+
+
 # ── Page border ───────────────────────────────────────────────────────────────
 
 def _draw_page_border(canvas, doc):
@@ -298,29 +167,35 @@ def _draw_page_border(canvas, doc):
     canvas.restoreState()
 
 
-# ── Main PDF builder ──────────────────────────────────────────────────────────
+# ── Document, styles and content ──────────────────────────────────────────────
 
-def create_worksheet_pdf(problems, worksheet_type, number_range, concepts,
-                         output_path, include_answer_key=False):
-    """Generate a K-2 spiral review worksheet."""
+MARGIN = 0.5 * inch
+PAGE_W, PAGE_H = letter
+CONTENT_W = PAGE_W - 2 * MARGIN
+
+# Students per page group when a class packet is streamed to disk (or rendered in parallel)
+PACKET_GROUP_SIZE = 1
 
-    MARGIN    = 0.5 * inch
-    PAGE_W, PAGE_H = letter
-    content_w = PAGE_W - 2 * MARGIN
 
+def _new_doc(output_path):
+    """Letter-size document with one full-page frame and the page border."""
     doc = BaseDocTemplate(
         output_path, pagesize=letter,
         leftMargin=MARGIN, rightMargin=MARGIN,
         topMargin=MARGIN, bottomMargin=MARGIN,
     )
     frame = Frame(
-        MARGIN, MARGIN, content_w, PAGE_H - 2 * MARGIN,
+        MARGIN, MARGIN, CONTENT_W, PAGE_H - 2 * MARGIN,
         leftPadding=0, rightPadding=0, topPadding=0, bottomPadding=0,
     )
     doc.addPageTemplates([PageTemplate(
         id='main', frames=[frame], onPage=_draw_page_border)])
+    return doc
 
-    # ── Styles ────────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def _build_styles():
+    """Paragraph styles shared by worksheets and answer keys (built once, never mutated)."""
     base = getSampleStyleSheet()['Normal']
 
     def S(name, **kw):
@@ -329,7 +204,7 @@ def create_worksheet_pdf(problems, worksheet_type, number_range, concepts,
             setattr(p, k, v)
         return p
 
-    styles = {
+    return {
         # Page title
         'title':     S('title',     fontName='Helvetica-Bold', fontSize=16,
                         textColor=TITLE_CLR, alignment=TA_CENTER, spaceAfter=2),
@@ -355,17 +230,21 @@ def create_worksheet_pdf(problems, worksheet_type, number_range, concepts,
                         textColor=DARK_GRAY, leading=22),
     }
 
+
+def _worksheet_elements(problems, worksheet_type, number_range, styles,
+                        student_name=None):
+    """Flowables for one worksheet: title, name line and the section grid."""
+    content_w = CONTENT_W
     elements = []
 
     # ── Page title & header ───────────────────────────────────────────────────
-    type_label = 'Spiral Review' if worksheet_type == 'spiral' else 'Fluency Practice'
-    elements.append(Paragraph(
-        f'Math {type_label}  \u2014  {number_range.capitalize()}',
-        styles['title']))
+    elements.append(Paragraph(worksheet_title(worksheet_type, number_range), styles['title']))
     elements.append(Spacer(1, 4))
 
+    name_field = (f'Name: <b>{_e(student_name)}</b>' if student_name
+                  else 'Name: ____________________________________')
     info = Table(
-        [[Paragraph('Name: ____________________________________', styles['name']),
+        [[Paragraph(name_field, styles['name']),
           Paragraph('Date: _________________', styles['name']),
           Paragraph(f'Score: _____ / {len(problems)}', styles['name'])]],
         colWidths=[content_w * 0.45, content_w * 0.33, content_w * 0.22],
@@ -380,61 +259,181 @@ def create_worksheet_pdf(problems, worksheet_type, number_range, concepts,
         width='100%', thickness=1.5, color=DARK_GRAY, spaceAfter=6))
 
     # ── Group problems by category ────────────────────────────────────────────
-    seen = {}
-    for p in problems:
-        cat = p.get('category', 'general')
-        seen.setdefault(cat, []).append(p)
+    seen = group_by_category(problems)
 
     col_w = (content_w - 4) / 2   # 4 pt gap between columns
+    max_section_h = PAGE_H - 2 * MARGIN - 8
 
-    sections = [_make_section(cat, probs, col_w, styles)
-                for cat, probs in seen.items()]
-
-    if not sections:
+    if not seen:
         elements.append(Paragraph('No problems generated.', styles['q']))
-    else:
-        if len(sections) % 2:
-            sections.append(Spacer(1, 1))
-
-        rows = [[sections[i], sections[i + 1]] for i in range(0, len(sections), 2)]
-        grid = Table(rows, colWidths=[col_w, col_w], spaceAfter=0)
-        grid.setStyle(TableStyle([
-            ('VALIGN',        (0, 0), (-1, -1), 'TOP'),
-            ('TOPPADDING',    (0, 0), (-1, -1), 2),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ('LEFTPADDING',   (0, 0), (-1, -1), 2),
-            ('RIGHTPADDING',  (0, 0), (-1, -1), 2),
-        ]))
-        elements.append(grid)
-
-    # ── Answer key ────────────────────────────────────────────────────────────
-    if include_answer_key:
-        elements.append(PageBreak())
-        elements.append(Paragraph('Answer Key', styles['ak_head']))
-        elements.append(HRFlowable(
-            width='100%', thickness=1.5, color=DARK_GRAY, spaceAfter=10))
-
-        em_dash = '\u2014'
-        ak_cells = [
-            Paragraph(
-                f'<b>{i + 1}.</b>  {_e(p.get("answer", em_dash))}',
-                styles['ak_item'])
-            for i, p in enumerate(problems)
-        ]
-        if len(ak_cells) % 2:
-            ak_cells.append(Paragraph('', styles['ak_item']))
-
-        ak_rows = [[ak_cells[j], ak_cells[j + 1]] for j in range(0, len(ak_cells), 2)]
-        ak_table = Table(ak_rows, colWidths=[content_w / 2, content_w / 2])
-        ak_table.setStyle(TableStyle([
-            ('VALIGN',        (0, 0), (-1, -1), 'TOP'),
-            ('TOPPADDING',    (0, 0), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-            ('LEFTPADDING',   (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING',  (0, 0), (-1, -1), 6),
-            ('LINEBELOW',     (0, 0), (-1, -2), 0.5, colors.HexColor('#DDDDDD')),
-        ]))
-        elements.append(ak_table)
-
-    doc.build(elements)
+        return elements
+
+    # Boxes that fit on a page go in the two-column grid; taller ones can't
+    # split inside a grid cell, so they become full-width flowing sections
+    sections = []
+    for cat, probs in seen.items():
+        section = _make_section(cat, probs, col_w, styles)
+        if section.wrap(col_w, PAGE_H)[1] <= max_section_h:
+            sections.append(section)
+            continue
+        elements.extend(_section_grid(sections, col_w))
+        sections = []
+        elements.append(_make_long_section(cat, probs, content_w, styles))
+    elements.extend(_section_grid(sections, col_w))
+
+    return elements
+
+
+def _section_grid(sections, col_w):
+    """Lay section boxes out two per row; returns a (possibly empty) flowable list."""
+    if not sections:
+        return []
+    if len(sections) % 2:
+        sections = sections + [Spacer(1, 1)]
+
+    rows = [[sections[i], sections[i + 1]] for i in range(0, len(sections), 2)]
+    grid = Table(rows, colWidths=[col_w, col_w], spaceAfter=0)
+    grid.setStyle(TableStyle([
+        ('VALIGN',        (0, 0), (-1, -1), 'TOP'),
+        ('TOPPADDING',    (0, 0), (-1, -1), 2),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ('LEFTPADDING',   (0, 0), (-1, -1), 2),
+        ('RIGHTPADDING',  (0, 0), (-1, -1), 2),
+    ]))
+    return [grid]
+
+
+def _answer_key_elements(problems, styles, student_name=None):
+    """Flowables for an answer key, starting on a new page."""
+    content_w = CONTENT_W
+    heading = f'Answer Key \u2014 {_e(student_name)}' if student_name else 'Answer Key'
+    elements = [
+        PageBreak(),
+        Paragraph(heading, styles['ak_head']),
+        HRFlowable(width='100%', thickness=1.5, color=DARK_GRAY, spaceAfter=10),
+    ]
+
+    em_dash = '\u2014'
+    ak_cells = [
+        Paragraph(
+            f'<b>{i + 1}.</b>  {_e(p.get("answer", em_dash))}',
+            styles['ak_item'])
+        for i, p in enumerate(problems)
+    ]
+    if len(ak_cells) % 2:
+        ak_cells.append(Paragraph('', styles['ak_item']))
+
+    ak_rows = [[ak_cells[j], ak_cells[j + 1]] for j in range(0, len(ak_cells), 2)]
+    ak_table = Table(ak_rows, colWidths=[content_w / 2, content_w / 2])
+    ak_table.setStyle(TableStyle([
+        ('VALIGN',        (0, 0), (-1, -1), 'TOP'),
+        ('TOPPADDING',    (0, 0), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ('LEFTPADDING',   (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING',  (0, 0), (-1, -1), 6),
+        ('LINEBELOW',     (0, 0), (-1, -2), 0.5, colors.HexColor('#DDDDDD')),
+    ]))
+    elements.append(ak_table)
+    return elements
+
+
+# ── Main PDF builders ─────────────────────────────────────────────────────────
+
+def create_worksheet_pdf(problems, worksheet_type, number_range, concepts,
+                         output_path, include_answer_key=False):
+    """Generate a K-2 spiral review worksheet."""
+    doc = _new_doc(output_path)
+    styles = _build_styles()
+
+    with profile_stage('flowables'):
+        elements = _worksheet_elements(problems, worksheet_type, number_range, styles)
+        if include_answer_key:
+            elements.extend(_answer_key_elements(problems, styles))
+
+    with profile_stage('doc.build'):
+        doc.build(elements)
     return output_path
+
+
+def _packet_elements(students, worksheet_type, number_range, styles, include_answer_key):
+    """Flowables for a run of (student, problems) pairs, each starting on a new page."""
+    elements = []
+    for student, problems in students:
+        if elements:
+            elements.append(PageBreak())
+        elements.extend(_worksheet_elements(
+            problems, worksheet_type, number_range, styles, student_name=student))
+        if include_answer_key:
+            elements.extend(_answer_key_elements(problems, styles, student_name=student))
+    return elements
+
+
+def _render_fragment(elements):
+    """Build flowables into an in-memory PDF and return its bytes."""
+    buffer = io.BytesIO()
+    _new_doc(buffer).build(elements)
+    return buffer.getvalue()
+
+
+def _render_group(students, worksheet_type, number_range, include_answer_key):
+    """Render one page group of a class packet to PDF bytes (runs in a worker process when parallel)."""
+    return _render_fragment(_packet_elements(
+        students, worksheet_type, number_range, _build_styles(), include_answer_key))
+
+
+def _render_in_order(executor, render, groups, max_pending):
+    """Yield each group's fragment in order, with at most `max_pending` groups submitted but not yet taken."""
+    pending = deque()
+    for group in groups:
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(render, group))
+    while pending:
+        yield pending.popleft().result()
+
+
+def create_class_packet_pdf(worksheets, worksheet_type, number_range, concepts,
+                            output_path, include_answer_key=False,
+                            group_size=PACKET_GROUP_SIZE, executor=None, max_pending=None):
+    """Generate one PDF holding a worksheet per student.
+
+    `worksheets` maps each student's name or ID to their problems; every
+    worksheet (and its answer key, if requested) starts on a new page.
+
+    Every `group_size` students are rendered as a separate page group whose
+    pages are written to the file before the next group is laid out, so peak
+    memory follows the group rather than the whole packet. Given an
+    `executor` (a process pool), the groups are rendered in parallel and
+    merged in order without re-rendering; only `max_pending` groups (two
+    per render worker by default) are in flight, so finished fragments
+    waiting on a slow earlier group don't pile up. With `group_size` None
+    the packet is built in a single pass.
+    """
+    styles = _build_styles()
+    students = list(worksheets.items())
+
+    if group_size and students:
+        groups = [students[start:start + group_size] for start in range(0, len(students), group_size)]
+        render = partial(_render_group, worksheet_type=worksheet_type, number_range=number_range,
+                         include_answer_key=include_answer_key)
+        with profile_stage('doc.build'), open(output_path, 'wb') as out:
+            assembler = PdfAssembler(out)
+            if executor:
+                fragments = _render_in_order(executor, render, groups, max_pending or 2 * render_workers())
+            else:
+                fragments = map(render, groups)
+            for fragment in fragments:
+                assembler.add_fragment(fragment)
+            assembler.close()
+        return output_path
+
+    doc = _new_doc(output_path)
+    with profile_stage('flowables'):
+        elements = _packet_elements(students, worksheet_type, number_range, styles, include_answer_key)
+
+    if not elements:
+        elements.append(Paragraph('No problems generated.', styles['q']))
+
+    with profile_stage('doc.build'):
+        doc.build(elements)
+    return output_path
\ No newline at end of file
@@ -0,0 +1,200 @@
+# pdf_reporting/preview.py
+
+import re
+from html import escape
+from typing import Dict, Any, List, Optional
+
+from .layout import escape_markup, group_by_category, problem_blocks, section_label, worksheet_title
+from .pdf_generator import CONTENT_W, DARK_GRAY, MID_GRAY, PAGE_W, MARGIN, TITLE_CLR
+from .scene import hex_color, symbol_shapes, visual_scene, wedge_points
+
+# Categories with more problems than this span the page in two columns, like
+# the PDF's long sections (the PDF decides by measured height)
+LONG_SECTION_PROBLEMS = 12
+
+# Room inside a section box for drawings that fill the width
+SECTION_INNER_W = (CONTENT_W - 4) / 2 - 20
+LONG_SECTION_INNER_W = CONTENT_W / 2 - 20
+
+EM_DASH = '\u2014'
+
+_FONT_TAG = re.compile(r'<font size="(\d+)" color="(\w+)">')
+
+
+def _n(value: float) -> str:
+    """A coordinate with at most two decimals"""
+    return f'{value:.2f}'.rstrip('0').rstrip('.')
+
+
+CSS = f'''
+body {{ margin: 0; background: #e8e8e8; color: {hex_color(DARK_GRAY)};
+        font-family: Helvetica, Arial, sans-serif; }}
+.page {{ position: relative; box-sizing: border-box; width: {_n(PAGE_W)}pt; margin: 12pt auto;
+         padding: {_n(MARGIN)}pt; background: #fff; }}
+.page::before {{ content: ''; position: absolute; inset: 25.2pt; border: 2pt solid #000;
+                 pointer-events: none; }}
+h1, h2 {{ margin: 0 0 6pt; font-size: 16pt; color: {hex_color(TITLE_CLR)}; text-align: center; }}
+hr {{ border: 0; border-top: 1.5pt solid {hex_color(DARK_GRAY)}; margin: 2pt 0 6pt; }}
+.info {{ display: grid; grid-template-columns: 45% 33% 22%; font-size: 12pt; }}
+.grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 4pt; align-items: start; }}
+.section {{ border: 1.5pt solid #000; padding: 8pt 10pt; }}
+.section.long {{ grid-column: 1 / -1; }}
+.section.long .problems {{ display: grid; grid-template-columns: 1fr 1fr; column-gap: 20pt; }}
+.label {{ font-size: 11pt; font-weight: bold; margin-bottom: 8pt; }}
+.problem {{ margin-bottom: 6pt; }}
+.q {{ font-size: 13pt; line-height: 21pt; margin-bottom: 2pt; }}
+.ans {{ font-size: 10pt; color: {hex_color(MID_GRAY)}; margin-bottom: 2pt; }}
+.vmath {{ font: bold 20pt/26pt Courier, monospace; white-space: pre; }}
+.vmath .bar {{ border-top: 2pt solid #000; height: 18pt; margin-top: 2pt; }}
+.answers {{ display: grid; grid-template-columns: 1fr 1fr; font-size: 12pt; line-height: 22pt; }}
+.answers div {{ padding: 0 6pt; border-bottom: 0.5pt solid #ddd; }}
+svg {{ display: block; overflow: visible; }}
+svg text {{ font-family: Helvetica, Arial, sans-serif; }}
+'''
+
+
+class _Defs:
+    """
+    Shared SVG symbols for one document, the preview's counterpart of the
+    PDF's form XObjects: each is defined once and placed with <use>.
+    """
+
+    def __init__(self):
+        self._symbols: Dict[str, str] = {}
+
+    def use(self, symbol: str, x: float, y: float) -> str:
+        symbol_id = symbol.replace(':', '_')
+        if symbol_id not in self._symbols:
+            body = ''.join(_shape_svg(shape) for shape in symbol_shapes(symbol))
+            self._symbols[symbol_id] = f'<g id="{symbol_id}">{body}</g>'
+        return f'<use href="#{symbol_id}" x="{_n(x)}" y="{_n(y)}"/>'
+
+    def render(self) -> str:
+        if not self._symbols:
+            return ''
+        return ('<svg width="0" height="0" style="position:absolute"><defs>'
+                + ''.join(self._symbols.values()) + '</defs></svg>')
+
+
+def _paint(fill, stroke, stroke_width) -> str:
+    paint = f' fill="{fill or "none"}"'
+    if stroke:
+        paint += f' stroke="{stroke}" stroke-width="{_n(stroke_width)}"'
+    return paint
+
+
+def _shape_svg(shape) -> str:
+    """One scene shape (see scene.py) as an SVG element"""
+    kind = shape[0]
+    if kind == 'line':
+        _, x0, y0, x1, y1, color, width, round_cap = shape
+        cap = ' stroke-linecap="round"' if round_cap else ''
+        return (f'<line x1="{_n(x0)}" y1="{_n(y0)}" x2="{_n(x1)}" y2="{_n(y1)}" '
+                f'stroke="{color}" stroke-width="{_n(width)}"{cap}/>')
+    if kind == 'circle':
+        _, cx, cy, r, fill, stroke, stroke_width = shape
+        return f'<circle cx="{_n(cx)}" cy="{_n(cy)}" r="{_n(r)}"{_paint(fill, stroke, stroke_width)}/>'
+    if kind == 'rect':
+        _, x, y, w, h, fill, stroke, stroke_width = shape
+        return (f'<rect x="{_n(x)}" y="{_n(y)}" width="{_n(w)}" height="{_n(h)}"'
+                f'{_paint(fill, stroke, stroke_width)}/>')
+    if kind == 'polygon':
+        _, points, fill, stroke, stroke_width = shape
+        points = ' '.join(f'{_n(x)},{_n(y)}' for x, y in points)
+        return f'<polygon points="{points}"{_paint(fill, stroke, stroke_width)}/>'
+    if kind == 'wedge':
+        _, cx, cy, r, start, extent, fill = shape
+        (x0, y0), (x1, y1) = wedge_points(cx, cy, r, start, extent)
+        large = 1 if extent > 180 else 0
+        return (f'<path d="M{_n(cx)},{_n(cy)} L{_n(x0)},{_n(y0)} A{_n(r)},{_n(r)} 0 {large} 0 '
+                f'{_n(x1)},{_n(y1)} Z" fill="{fill}"/>')
+    if kind == 'text':
+        _, x, y, text, size, anchor, bold, color = shape
+        weight = ' font-weight="bold"' if bold else ''
+        return (f'<text x="{_n(x)}" y="{_n(y)}" font-size="{_n(size)}" text-anchor="{anchor}"'
+                f'{weight} fill="{color}">{escape(text)}</text>')
+    raise ValueError(f"Unknown shape: {kind}")
+
+
+def _visual_svg(defs: _Defs, kind: str, args, width: float) -> str:
+    svg_w, svg_h, shapes = visual_scene(kind, args, width)
+    if not shapes:
+        return ''
+    body = ''.join(defs.use(shape[1], shape[2], shape[3]) if shape[0] == 'use' else _shape_svg(shape)
+                   for shape in shapes)
+    return (f'<svg width="{_n(svg_w)}pt" height="{_n(svg_h)}pt" '
+            f'viewBox="0 0 {_n(svg_w)} {_n(svg_h)}">{body}</svg>')
+
+
+# ── Problems, sections and pages ──────────────────────────────────────────────
+
+def _markup(text: str) -> str:
+    """Paragraph markup as HTML; only the <font> tag differs"""
+    return _FONT_TAG.sub(r'<span style="font-size:\1pt;color:\2">', text).replace('</font>', '</span>')
+
+
+def _vertical_math(op_char: str, top: str, bottom: str) -> str:
+    w = max(len(top), len(bottom))
+    rows = ''.join(f'<div>{escape(row)}</div>' for row in (top.rjust(w + 1), op_char + bottom.rjust(w)))
+    return f'<div class="vmath" style="width:{_n((w + 3) * 12.5)}pt">{rows}<div class="bar"></div></div>'
+
+
+def _block_html(block, defs: _Defs, width: float) -> str:
+    kind = block[0]
+    if kind == 'text':
+        return f'<div class="{block[2]}">{_markup(block[1])}</div>'
+    if kind == 'space':
+        return f'<div style="height:{_n(block[1])}pt"></div>'
+    if kind == 'vmath':
+        return _vertical_math(*block[1:])
+    return _visual_svg(defs, block[1], block[2:], width)
+
+
+def _section_html(category: str, problems: List[Dict[str, Any]], defs: _Defs) -> str:
+    long = len(problems) > LONG_SECTION_PROBLEMS
+    width = LONG_SECTION_INNER_W if long else SECTION_INNER_W
+    items = ''.join(
+        '<div class="problem">' + ''.join(_block_html(b, defs, width) for b in problem_blocks(problem, i + 1))
+        + '</div>'
+        for i, problem in enumerate(problems))
+    return (f'<div class="section{" long" if long else ""}">'
+            f'<div class="label">{escape_markup(section_label(category))}</div>'
+            f'<div class="problems">{items}</div></div>')
+
+
+def _answer_key_html(problems: List[Dict[str, Any]], student_name: Optional[str]) -> str:
+    heading = f'Answer Key {EM_DASH} {escape(student_name)}' if student_name else 'Answer Key'
+    answers = ''.join(f'<div><b>{i + 1}.</b>&nbsp; {escape_markup(p.get("answer", EM_DASH))}</div>'
+                      for i, p in enumerate(problems))
+    return f'<div class="page"><h2>{heading}</h2><hr><div class="answers">{answers}</div></div>'
+
+
+def render_worksheet_html(problems: List[Dict[str, Any]], worksheet_type: str, number_range: str,
+                          include_answer_key: bool = False, student_name: Optional[str] = None) -> str:
+    """
+    A standalone HTML page previewing a worksheet, with inline SVG drawings.
+
+    Uses the same layout blocks and drawing geometry as the PDF, so it
+    matches the printed sheet without running ReportLab's layout; pages
+    aren't broken, and long sections are chosen by problem count rather
+    than measured height.
+    """
+    defs = _Defs()
+    title = escape_markup(worksheet_title(worksheet_type, number_range))
+    name = f'Name: <b>{escape(student_name)}</b>' if student_name else 'Name: ____________________'
+
+    sections = group_by_category(problems)
+    if sections:
+        grid = ''.join(_section_html(category, probs, defs) for category, probs in sections.items())
+    else:
+        grid = '<div class="q">No problems generated.</div>'
+
+    page = (f'<div class="page"><h1>{title}</h1>'
+            f'<div class="info"><div>{name}</div><div>Date: ____________</div>'
+            f'<div>Score: _____ / {len(problems)}</div></div><hr>'
+            f'<div class="grid">{grid}</div></div>')
+    if include_answer_key:
+        page += _answer_key_html(problems, student_name)
+
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title>'
+            f'<style>{CSS}</style></head><body>{defs.render()}{page}</body></html>')
\ No newline at end of file
@@ -0,0 +1,62 @@
+# pdf_reporting/render_pool.py
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# Class packets with at least this many students are rendered across the pool
+PARALLEL_MIN_STUDENTS = 4
+
+# Most render processes started by default; more rarely pays for their memory
+MAX_DEFAULT_WORKERS = 4
+
+# Resident memory of one render worker (interpreter, ReportLab and fonts)
+WORKER_MEMORY_MB = 32
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def render_workers() -> int:
+    """
+    Render processes to run: RENDER_WORKERS if set, else one per CPU this
+    process may run on (not every CPU on the host), up to MAX_DEFAULT_WORKERS.
+    """
+    configured = os.environ.get("RENDER_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS and Windows
+        cpus = os.cpu_count() or 1
+    return max(1, min(cpus, MAX_DEFAULT_WORKERS))
+
+
+def get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    The process-wide pool for rendering page groups, started on first use.
+
+    Sized by render_workers(); None when that is 1, so single-core
+    instances render in-process, which beats shipping page groups to
+    processes competing for the same core.
+    """
+    global _pool
+    with _lock:
+        if _pool is None:
+            workers = render_workers()
+            if workers <= 1:
+                return None
+            # Spawned rather than forked: the server process has threads running
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the pool's workers; the next get_render_pool() starts a fresh one"""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
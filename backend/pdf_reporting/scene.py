@@ -0,0 +1,267 @@
+# pdf_reporting/scene.py
+#
+# The worksheet drawings as plain shapes, for renderers other than the PDF
+# (the HTML preview's SVG and the PNG thumbnails). Geometry comes from the
+# PDF visuals' cached layout functions, flipped so y points down; all
+# coordinates are in points:
+#
+#   ('line', x0, y0, x1, y1, color, width, round_cap)
+#   ('circle', cx, cy, r, fill, stroke, stroke_width)    fill or stroke may be None
+#   ('rect', x, y, w, h, fill, stroke, stroke_width)
+#   ('polygon', points, fill, stroke, stroke_width)
+#   ('wedge', cx, cy, r, start, extent, fill)            degrees, counter-clockwise from 3 o'clock
+#   ('text', x, y, text, size, anchor, bold, color)      y is the baseline; anchor is start, middle or end
+#   ('use', symbol, x, y)                                 symbol_shapes(symbol) drawn with its origin at x, y
+#
+# Glyphs repeated across a sheet (coins, the clock dial, ruler strips, base
+# ten blocks, the pictograph icon) are symbols, like the PDF's form XObjects.
+
+import math
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+from .visuals import BarGraph, BaseTenBlocks, ClockFace, CoinRow, FractionShape, NumberLine, Pictograph, Ruler
+from .visuals import base_ten, clock, coins, fraction_shapes, graphs, scales
+
+Shape = Tuple[Any, ...]
+# (width, height, shapes)
+Scene = Tuple[float, float, List[Shape]]
+
+
+def hex_color(color) -> str:
+    """A ReportLab color as #rrggbb"""
+    return '#' + color.hexval()[2:]
+
+
+def _line(x0, y0, x1, y1, color, width, round_cap=False) -> Shape:
+    return ('line', x0, y0, x1, y1, color, width, round_cap)
+
+
+# ── Symbols ───────────────────────────────────────────────────────────────────
+
+def _clock_dial() -> List[Shape]:
+    """Circle, ticks, numerals and centre pin, centred on the origin"""
+    color = hex_color(clock.FACE_COLOR)
+    minute_ticks, hour_ticks, numerals = clock.dial_geometry()
+    shapes = [('circle', 0, 0, clock.DIAL_RADIUS, None, color, 1.5)]
+    for line_w, ticks in ((0.5, minute_ticks), (1.2, hour_ticks)):
+        shapes.extend(_line(x0, -y0, x1, -y1, color, line_w) for (x0, y0), (x1, y1) in ticks)
+    _, size = clock.NUMERAL_FONT
+    shapes.extend(('text', x, -y + size * 0.35, label, size, 'middle', True, color) for label, (x, y) in numerals)
+    shapes.append(('circle', 0, 0, 1.8, color, None, 0))
+    return shapes
+
+
+def _coin(name: str) -> List[Shape]:
+    """A coin glyph centred on the origin"""
+    _, fill, label = coins.COIN_SPECS[name]
+    edge = hex_color(coins.EDGE_COLOR)
+    r = coins.coin_radius(name)
+    size = max(6, r * 0.6)
+    return [('circle', 0, 0, r, hex_color(fill), edge, 1),
+            ('circle', 0, 0, r - 2.5, None, edge, 0.4),
+            ('text', 0, size * 0.35, label, size, 'middle', True, edge)]
+
+
+def _number_line() -> List[Shape]:
+    """Line, ticks and arrows of the shared number line strip"""
+    geometry = scales.number_line_geometry()
+    height = scales.NUMBER_LINE_H
+    color = hex_color(scales.LINE_COLOR)
+    axis_y = height - geometry['axis_y']
+    shapes = [_line(4, axis_y, scales.NUMBER_LINE_W - 4, axis_y, color, 1.2)]
+    shapes.extend(_line(x0, height - y0, x1, height - y1, color, 1.2) for (x0, y0), (x1, y1) in geometry['ticks'])
+    shapes.extend(('polygon', [(x, height - y) for x, y in head], color, None, 0) for head in geometry['arrows'])
+    return shapes
+
+
+def _ruler(unit: str) -> List[Shape]:
+    """Body, ticks and numerals of a ruler; origin at the top of the flowable"""
+    geometry = scales.ruler_geometry(unit)
+    height = scales.RULER_BODY_H + 12
+    color = hex_color(scales.LINE_COLOR)
+    shapes = [('rect', 0, height - scales.RULER_BODY_H, scales.RULER_W + 2 * scales.RULER_MARGIN,
+               scales.RULER_BODY_H, hex_color(scales.RULER_FILL), color, 1)]
+    shapes.extend(_line(x0, height - y0, x1, height - y1, color, 0.6) for (x0, y0), (x1, y1) in geometry['ticks'])
+    shapes.extend(('text', x, height - y, text, 5, 'middle', False, color) for text, x, y in geometry['numerals'])
+    return shapes
+
+
+def _block(kind: str) -> List[Shape]:
+    """A base ten block with its unit grid, origin at the top left"""
+    w, h = base_ten.BLOCK_SIZES[kind]
+    line = hex_color(base_ten.LINE_COLOR)
+    shapes = [('rect', 0, 0, w, h, hex_color(base_ten.BLOCK_FILL), line, 0.6)]
+    shapes.extend(_line(i * base_ten.UNIT, 0, i * base_ten.UNIT, h, line, 0.25)
+                  for i in range(1, int(w // base_ten.UNIT)))
+    shapes.extend(_line(0, i * base_ten.UNIT, w, i * base_ten.UNIT, line, 0.25)
+                  for i in range(1, int(h // base_ten.UNIT)))
+    return shapes
+
+
+def _pictograph_icon() -> List[Shape]:
+    size = graphs.ICON_SIZE
+    return [('polygon', [(x, size - y) for x, y in graphs.icon_points()],
+             hex_color(graphs.ICON_COLOR), hex_color(graphs.LINE_COLOR), 0.5)]
+
+
+@lru_cache(maxsize=None)
+def symbol_shapes(symbol: str) -> List[Shape]:
+    """The shapes of a shared glyph, by its symbol name"""
+    kind, _, name = symbol.partition(':')
+    if kind == 'clock_dial':
+        return _clock_dial()
+    if kind == 'coin':
+        return _coin(name)
+    if kind == 'number_line':
+        return _number_line()
+    if kind == 'ruler':
+        return _ruler(name)
+    if kind == 'base_ten':
+        return _block(name)
+    if kind == 'pictograph_icon':
+        return _pictograph_icon()
+    raise ValueError(f"Unknown symbol: {symbol}")
+
+
+# ── Visuals ───────────────────────────────────────────────────────────────────
+
+def _clock_scene(width: float, hour: int, minute: int) -> Scene:
+    face = ClockFace(hour, minute)
+    color = hex_color(clock.FACE_COLOR)
+    centre = face.width / 2
+    shapes = [('use', 'clock_dial', centre, centre)]
+    for (x, y), (_, line_w) in zip(clock.hand_segments(face.hour, face.minute), (clock.HOUR_HAND, clock.MINUTE_HAND)):
+        shapes.append(_line(centre, centre, centre + x, centre - y, color, line_w, True))
+    return face.width, face.height, shapes
+
+
+def _coins_scene(width: float, names: List[str]) -> Scene:
+    row = CoinRow(names)
+    placed, height = coins.layout_coins(row.coins, width)
+    return width, height, [('use', f'coin:{name}', x, y) for name, x, y in placed]
+
+
+def _fraction_scene(width: float, shape: str, total_parts: int, shaded_parts: int) -> Scene:
+    figure = FractionShape(shape, total_parts, shaded_parts)
+    parts, dividers = fraction_shapes.fraction_geometry(figure.shape, figure.total)
+    w, h = fraction_shapes.SHAPE_SIZES[figure.shape]
+    shade, line = hex_color(fraction_shapes.SHADE_COLOR), hex_color(fraction_shapes.LINE_COLOR)
+
+    shapes = []
+    for part in parts[:figure.shaded]:
+        if part[0] == 'wedge':
+            _, cx, cy, r, start, extent = part
+            if extent >= 360:
+                shapes.append(('circle', 1 + cx, 1 + h - cy, r, shade, None, 0))
+            else:
+                shapes.append(('wedge', 1 + cx, 1 + h - cy, r, start, extent, shade))
+        else:
+            _, x, y, pw, ph = part
+            shapes.append(('rect', 1 + x, 1 + h - y - ph, pw, ph, shade, None, 0))
+
+    if figure.shape == 'circle':
+        shapes.append(('circle', 1 + w / 2, 1 + h / 2, w / 2, None, line, 1.5))
+    else:
+        shapes.append(('rect', 1, 1, w, h, None, line, 1.5))
+    shapes.extend(_line(1 + x0, 1 + h - y0, 1 + x1, 1 + h - y1, line, 1) for (x0, y0), (x1, y1) in dividers)
+    return figure.width, figure.height, shapes
+
+
+def _number_line_scene(width: float, number: int, blank_offset: Optional[int]) -> Scene:
+    strip = NumberLine(number, blank_offset)
+    geometry = scales.number_line_geometry()
+    color = hex_color(scales.LINE_COLOR)
+    label_y = strip.height - (geometry['axis_y'] - 15)
+
+    shapes = [('use', 'number_line', 0, 0)]
+    for x, label in zip(geometry['xs'], strip.labels):
+        if label is None:
+            shapes.append(_line(x - 9, label_y + 1, x + 9, label_y + 1, color, 0.6))
+        else:
+            shapes.append(('text', x, label_y, label, 8, 'middle', False, color))
+    return strip.width, strip.height, shapes
+
+
+def _ruler_scene(width: float, unit: str, measurement: float) -> Scene:
+    ruler = Ruler(unit, measurement)
+    geometry = scales.ruler_geometry(ruler.unit)
+    length = min(ruler.measurement, scales.RULER_SCALES[ruler.unit][0]) * geometry['per_unit']
+    line_y = ruler.height - scales.RULER_BODY_H - 6
+    return ruler.width, ruler.height, [
+        ('use', f'ruler:{ruler.unit}', 0, 0),
+        _line(scales.RULER_MARGIN, line_y, scales.RULER_MARGIN + length, line_y, hex_color(scales.OBJECT_COLOR), 4),
+    ]
+
+
+def _base_ten_scene(width: float, number: int) -> Scene:
+    blocks = BaseTenBlocks(number)
+    placements, _, _ = base_ten.base_ten_layout(blocks.number)
+    shapes = [('use', f'base_ten:{kind}', x + 1, blocks.height - (y + 1) - base_ten.BLOCK_SIZES[kind][1])
+              for kind, x, y in placements]
+    return blocks.width, blocks.height, shapes
+
+
+def _bar_graph_scene(width: float, items: List[str], values: Dict[str, Any]) -> Scene:
+    graph = BarGraph(items, values)
+    layout = graphs.bar_graph_layout(graph.items, graph.values, width)
+    height = graphs.BAR_GRAPH_HEIGHT
+    line, grid = hex_color(graphs.LINE_COLOR), hex_color(graphs.GRID_COLOR)
+    plot_x, plot_w = layout['plot']
+
+    shapes = [_line(plot_x, height - y, plot_x + plot_w, height - y, grid, 0.5) for y in layout['gridlines']]
+    shapes.extend(('rect', x, height - y - h, w, h, hex_color(graphs.BAR_COLOR), line, 0.5) for x, y, w, h in layout['bars'])
+    shapes.extend(_line(x0, height - y0, x1, height - y1, line, 1) for (x0, y0), (x1, y1) in layout['axes'])
+    shapes.extend(('text', x, height - y, text, graphs.LABEL_SIZE, 'end', False, line)
+                  for text, x, y in layout['tick_labels'])
+    shapes.extend(('text', x, height - y, text, size, 'middle', False, line)
+                  for text, x, y, size in layout['item_labels'])
+    return width, height, shapes
+
+
+def _pictograph_scene(width: float, items: List[str], values: Dict[str, Any]) -> Scene:
+    graph = Pictograph(items, values)
+    layout = graphs.pictograph_layout(graph.items, graph.values, width)
+    height = layout['height']
+    line = hex_color(graphs.LINE_COLOR)
+    size = graphs.ICON_SIZE
+
+    shapes = [('text', x, height - y, text, font_size, 'start', False, line)
+              for text, x, y, font_size in layout['labels']]
+    shapes.extend(('use', 'pictograph_icon', x, height - y - size) for x, y in layout['icons'])
+    fill, stroke = hex_color(graphs.ICON_COLOR), line
+    shapes.extend(('polygon', [(x + px, height - y - py) for px, py in graphs.partial_icon_points(fraction)],
+                   fill, stroke, 0.5)
+                  for x, y, fraction in layout['partial'])
+    if layout['key'] is None:
+        return width, height, shapes
+    x, y = layout['key']
+    shapes.append(('use', 'pictograph_icon', x + graphs.PICTOGRAPH_LABEL_W, height - y - size))
+    shapes.append(('text', x + graphs.PICTOGRAPH_LABEL_W + size + 4, height - y - 3, f"= {layout['scale']}",
+                   graphs.LABEL_SIZE, 'start', False, line))
+    shapes.append(('text', x, height - y - 3, 'Key:', graphs.LABEL_SIZE, 'start', False, line))
+    return width, height, shapes
+
+
+_SCENES = {
+    'bar_graph':   _bar_graph_scene,
+    'pictograph':  _pictograph_scene,
+    'base_ten':    _base_ten_scene,
+    'number_line': _number_line_scene,
+    'clock':       _clock_scene,
+    'coins':       _coins_scene,
+    'fraction':    _fraction_scene,
+    'ruler':       _ruler_scene,
+}
+
+
+def visual_scene(kind: str, args: Tuple[Any, ...], width: float) -> Scene:
+    """Size and shapes of a layout block's visual, laid out in `width` points like its flowable"""
+    return _SCENES[kind](width, *args)
+
+
+def wedge_points(cx: float, cy: float, r: float, start: float, extent: float) -> Tuple[Tuple[float, float], ...]:
+    """Where a wedge's arc starts and ends (y down)"""
+    a0, a1 = math.radians(start), math.radians(start + extent)
+    return ((cx + r * math.cos(a0), cy - r * math.sin(a0)),
+            (cx + r * math.cos(a1), cy - r * math.sin(a1)))
\ No newline at end of file
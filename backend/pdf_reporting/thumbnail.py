@@ -0,0 +1,473 @@
+# pdf_reporting/thumbnail.py
+#
+# First-page thumbnails drawn with Pillow. Page 1 is laid out with the PDF's
+# own styles, paddings and drawing geometry (scene.py), but without running
+# ReportLab's layout or rasterizing the PDF: text is measured with the PDF
+# font metrics and drawn "greeked", as bars the size of each word, which is
+# all a thumbnail can show anyway. Only what fits on the first page is drawn,
+# and thumbnail_source() records just that much of a worksheet to draw later.
+
+import html
+import io
+import re
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from reportlab.lib.enums import TA_CENTER
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from .layout import escape_markup, group_by_category, problem_blocks, section_label, worksheet_title
+from .pdf_generator import CONTENT_W, MARGIN, PAGE_H, PAGE_W, DARK_GRAY, _build_styles
+from .scene import hex_color, symbol_shapes, visual_scene
+
+# Default thumbnail width in pixels; the height follows the page
+THUMBNAIL_WIDTH = 240
+
+# Drawn this many times larger, then downsampled, for anti-aliasing
+SUPERSAMPLE = 3
+
+# Page border inset (see _draw_page_border)
+BORDER_INSET = 25.2
+
+# Greeked words keep this much of their color (the rest is white), so the
+# page reads as text rather than solid bars
+TEXT_STRENGTH = 0.55
+
+# Same grid geometry as _worksheet_elements
+COL_W = (CONTENT_W - 4) / 2
+MAX_SECTION_H = PAGE_H - 2 * MARGIN - 8
+PAGE_BOTTOM = PAGE_H - MARGIN
+
+# Courier-Bold at 20 pt; see _vertical_math
+MATH_CHAR_W = 12.5
+
+_TAG = re.compile(r'<(/?)(b|font|br)\b([^>]*)>')
+_FONT_SIZE = re.compile(r'size="(\d+)"')
+
+# (width, height, painter(page, x, y)); coordinates in points, y down
+Box = Tuple[float, float, Callable[['_Page', float, float], None]]
+
+
+class _Page:
+    """A Pillow canvas in page points (y down), drawn at SUPERSAMPLE x the thumbnail size"""
+
+    def __init__(self, width: int):
+        # Imported here so builds recording thumbnail sources never load Pillow
+        from PIL import Image, ImageDraw
+
+        self.scale = width * SUPERSAMPLE / PAGE_W
+        self.image = Image.new('RGB', (round(PAGE_W * self.scale), round(PAGE_H * self.scale)), 'white')
+        self.draw = ImageDraw.Draw(self.image)
+
+    def _stroke(self, width: float) -> int:
+        return max(1, round(width * self.scale))
+
+    def line(self, x0, y0, x1, y1, color, width, round_cap=False):
+        s = self.scale
+        self.draw.line([(x0 * s, y0 * s), (x1 * s, y1 * s)], fill=color, width=self._stroke(width))
+        if round_cap:
+            r = width * s / 2
+            for x, y in ((x0, y0), (x1, y1)):
+                self.draw.ellipse([x * s - r, y * s - r, x * s + r, y * s + r], fill=color)
+
+    def rect(self, x, y, w, h, fill=None, stroke=None, stroke_width=1):
+        s = self.scale
+        self.draw.rectangle([x * s, y * s, (x + w) * s, (y + h) * s], fill=fill,
+                            outline=stroke, width=self._stroke(stroke_width) if stroke else 0)
+
+    def shape(self, shape, dx: float, dy: float):
+        """Paint one scene shape, offset by (dx, dy)"""
+        s = self.scale
+        kind = shape[0]
+        if kind == 'line':
+            _, x0, y0, x1, y1, color, width, round_cap = shape
+            self.line(dx + x0, dy + y0, dx + x1, dy + y1, color, width, round_cap)
+        elif kind == 'circle':
+            _, cx, cy, r, fill, stroke, stroke_width = shape
+            box = [(dx + cx - r) * s, (dy + cy - r) * s, (dx + cx + r) * s, (dy + cy + r) * s]
+            self.draw.ellipse(box, fill=fill, outline=stroke, width=self._stroke(stroke_width) if stroke else 0)
+        elif kind == 'rect':
+            _, x, y, w, h, fill, stroke, stroke_width = shape
+            self.rect(dx + x, dy + y, w, h, fill, stroke, stroke_width)
+        elif kind == 'polygon':
+            _, points, fill, stroke, stroke_width = shape
+            points = [((dx + x) * s, (dy + y) * s) for x, y in points]
+            self.draw.polygon(points, fill=fill, outline=stroke, width=self._stroke(stroke_width) if stroke else 0)
+        elif kind == 'wedge':
+            # Pillow measures angles clockwise on screen; scene wedges run counter-clockwise
+            _, cx, cy, r, start, extent, fill = shape
+            box = [(dx + cx - r) * s, (dy + cy - r) * s, (dx + cx + r) * s, (dy + cy + r) * s]
+            self.draw.pieslice(box, -(start + extent), -start, fill=fill)
+        elif kind == 'text':
+            _, x, y, text, size, anchor, bold, color = shape
+            w = stringWidth(text, 'Helvetica-Bold' if bold else 'Helvetica', size)
+            x -= {'start': 0, 'middle': w / 2, 'end': w}[anchor]
+            self.word(dx + x, dy + y, w, size, color)
+        elif kind == 'use':
+            _, symbol, x, y = shape
+            for part in symbol_shapes(symbol):
+                self.shape(part, dx + x, dy + y)
+
+    def word(self, x, baseline, w, size, color, blank=False):
+        """A greeked word: a bar over its x-height, or an underline for an answer blank"""
+        if blank:
+            self.line(x, baseline, x + w, baseline, color, 0.6)
+        else:
+            self.rect(x, baseline - 0.6 * size, w, 0.6 * size, fill=_tint(color))
+
+    def thumbnail(self, width: int) -> bytes:
+        from PIL import Image
+
+        height = round(width * PAGE_H / PAGE_W)
+        out = io.BytesIO()
+        self.image.resize((width, height), Image.LANCZOS).save(out, 'PNG', optimize=True)
+        return out.getvalue()
+
+
+def _tint(color: str) -> Tuple[int, int, int]:
+    rgb = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return tuple(round(255 - (255 - c) * TEXT_STRENGTH) for c in rgb)
+
+
+# ── Text ──────────────────────────────────────────────────────────────────────
+
+def _words(markup: str, style) -> List[Optional[List[Tuple[str, float, float]]]]:
+    """
+    Paragraph markup as words of (character, width, font size), with None
+    for a <br/>. Words break at plain spaces only, like ReportLab (&nbsp; joins).
+    """
+    family = style.fontName.replace('-Bold', '')
+    bold, sizes = style.fontName.endswith('-Bold'), [style.fontSize]
+    words: List[Optional[List[Tuple[str, float, float]]]] = []
+    word: List[Tuple[str, float, float]] = []
+
+    position = 0
+    for match in list(_TAG.finditer(markup)) + [None]:
+        chunk = html.unescape(markup[position:match.start() if match else len(markup)])
+        font = family + ('-Bold' if bold else '')
+        for char in chunk:
+            if char == ' ':
+                if word:
+                    words.append(word)
+                word = []
+            else:
+                word.append((char, stringWidth(char, font, sizes[-1]), sizes[-1]))
+        if match is None:
+            break
+        position = match.end()
+        closing, tag, attrs = match.groups()
+        if tag == 'br':
+            if word:
+                words.append(word)
+            word = []
+            words.append(None)
+        elif tag == 'b':
+            bold = not closing
+        elif closing:
+            sizes.pop()
+        else:
+            font_size = _FONT_SIZE.search(attrs)
+            sizes.append(float(font_size.group(1)) if font_size else sizes[-1])
+    if word:
+        words.append(word)
+    return words
+
+
+def _runs(chars: List[Tuple[float, str, float, float]]) -> List[Tuple[float, float, float, bool]]:
+    """A line's placed characters as greeked runs (x, width, size, is a blank); spaces separate them"""
+    runs: List[Tuple[float, float, float, bool]] = []
+    end = None
+    for x, char, w, size in chars:
+        if char == '\xa0':
+            end = None
+            continue
+        blank = char == '_'
+        if runs and end is not None and abs(x - end) < 0.01 and runs[-1][3] == blank:
+            rx, rw, rsize, _ = runs[-1]
+            runs[-1] = (rx, rw + w, max(rsize, size), blank)
+        else:
+            runs.append((x, w, size, blank))
+        end = x + w
+    return runs
+
+
+def _paragraph(markup: str, style, width: float) -> Box:
+    """
+    Word-wrapped paragraph; height is lines x leading. Breaks where ReportLab
+    does: lines may overrun by the style's space shrinkage, and words longer
+    than a line are split between characters.
+    """
+    space = stringWidth(' ', style.fontName, style.fontSize)
+    shrink = getattr(style, 'spaceShrinkage', 0) * space
+    # (width, word count, placed characters) per line
+    lines: List[Tuple[float, int, List[Tuple[float, str, float, float]]]] = [(0.0, 0, [])]
+    for word in _words(markup, style):
+        if word is None:
+            lines.append((0.0, 0, []))
+            continue
+        line_w, count, chars = lines[-1]
+        x = line_w + space if count else 0.0
+        word_w = sum(w for _, w, _ in word)
+        if word_w > width:
+            for char, w, size in word:
+                if x + w > width and x > 0:
+                    lines[-1] = (x, count + 1, chars)
+                    chars, count, x = [], 0, 0.0
+                    lines.append((0.0, 0, chars))
+                chars.append((x, char, w, size))
+                x += w
+        elif count and x + word_w > width + shrink * count:
+            x, chars, count = 0.0, [], 0
+            lines.append((0.0, 0, chars))
+        if word_w <= width:
+            for char, w, size in word:
+                chars.append((x, char, w, size))
+                x += w
+        lines[-1] = (x, count + 1, chars)
+
+    color = hex_color(style.textColor)
+    laid_out = [(line_w, _runs(chars)) for line_w, _, chars in lines]
+
+    def paint(page, x, y):
+        for i, (line_w, runs) in enumerate(laid_out):
+            indent = (width - line_w) / 2 if style.alignment == TA_CENTER else 0
+            baseline = y + style.fontSize + i * style.leading
+            for rx, w, size, blank in runs:
+                page.word(x + indent + rx, baseline, w, size, color, blank)
+
+    return width, len(lines) * style.leading, paint
+
+
+def _vertical_math(op_char: str, top: str, bottom: str, style) -> Box:
+    """Same rows, paddings and answer bar as pdf_generator._vertical_math"""
+    w = max(len(top), len(bottom))
+    rows = (top.rjust(w + 1), op_char + bottom.rjust(w))
+    char_w = stringWidth(' ', style.fontName, style.fontSize)
+    color = hex_color(style.textColor)
+
+    def paint(page, x, y):
+        for i, row in enumerate(rows):
+            baseline = y + 2 + i * (style.leading + 4) + style.fontSize
+            for match in re.finditer(r'\S+', row):
+                page.word(x + match.start() * char_w, baseline, len(match.group()) * char_w, style.fontSize, color)
+        page.line(x, y + 60, x + (w + 3) * MATH_CHAR_W, y + 60, '#000000', 2)
+
+    return (w + 3) * MATH_CHAR_W, 2 * (style.leading + 4) + 30, paint
+
+
+def _visual(kind: str, args, width: float) -> Box:
+    scene_w, scene_h, shapes = visual_scene(kind, args, width)
+
+    def paint(page, x, y):
+        for shape in shapes:
+            page.shape(shape, x, y)
+
+    return scene_w, scene_h, paint
+
+
+def _block(block, styles, width: float) -> Tuple[Box, float]:
+    """The box for one layout block and the space after it"""
+    kind = block[0]
+    if kind == 'text':
+        style = styles[block[2]]
+        return _paragraph(block[1], style, width), style.spaceAfter
+    if kind == 'space':
+        return (0, block[1], lambda page, x, y: None), 0
+    if kind == 'vmath':
+        return _vertical_math(*block[1:], styles['math']), 0
+    return _visual(block[1], block[2:], width), 0
+
+
+def _stack(items: List[Tuple[Box, float]]) -> Box:
+    """Boxes one under another, as a table cell stacks flowables (no space after the last)"""
+    height = sum(box[1] + after for box, after in items) - (items[-1][1] if items else 0)
+
+    def paint(page, x, y):
+        for (_, h, draw), after in items:
+            draw(page, x, y)
+            y += h + after
+
+    return max((box[0] for box, _ in items), default=0), height, paint
+
+
+def _spacer(height: float) -> Tuple[Box, float]:
+    return (0, height, lambda page, x, y: None), 0
+
+
+def _problem(problem, num: int, styles, width: float) -> List[Tuple[Box, float]]:
+    return [_block(block, styles, width) for block in problem_blocks(problem, num)]
+
+
+# ── Sections and page ─────────────────────────────────────────────────────────
+
+def _section(category: str, problems: List[Dict[str, Any]], styles) -> Optional[Box]:
+    """
+    A boxed section as in _make_section: 8 pt above and below, 10 pt at the
+    sides. None when it is taller than a page, so it must be laid out long
+    (measuring stops there).
+    """
+    inner_w = COL_W - 20
+    items = [_block(('text', section_label(category), 'sec_label'), styles, inner_w), _spacer(6)]
+    height = sum(box[1] + after for box, after in items)
+    for i, problem in enumerate(problems):
+        blocks = _problem(problem, i + 1, styles, inner_w) + [_spacer(6)]
+        height += sum(box[1] + after for box, after in blocks)
+        if height + 16 > MAX_SECTION_H:
+            return None
+        items.extend(blocks)
+    _, content_h, content = _stack(items)
+
+    def paint(page, x, y):
+        content(page, x + 10, y + 8)
+        page.rect(x, y, COL_W, content_h + 16, stroke='#000000', stroke_width=1.5)
+
+    return COL_W, content_h + 16, paint
+
+
+class _Layout:
+    """
+    Places flowables down page 1 and stops at the first one that moves to
+    page 2, keeping the problems it placed. Without a page it only measures.
+    """
+
+    def __init__(self, page: Optional[_Page]):
+        self.page = page
+        self.y = MARGIN
+        self.full = False
+        self.placed: List[Dict[str, Any]] = []
+
+    def add(self, box: Box, x: float = MARGIN, before: float = 0, after: float = 0) -> bool:
+        if self.full or self.y + before + box[1] > PAGE_BOTTOM:
+            self.full = True
+            return False
+        if self.page is not None:
+            box[2](self.page, x, self.y + before)
+        self.y += before + box[1] + after
+        return True
+
+    def grid(self, sections: List[Tuple[Box, List[Dict[str, Any]]]]):
+        """Two sections per row, 2 pt cell padding, splitting between rows like a Table"""
+        for i in range(0, len(sections), 2):
+            pair = sections[i:i + 2]
+            height = max(box[1] for box, _ in pair) + 4
+
+            def paint(page, x, y, pair=pair):
+                for col, (box, _) in enumerate(pair):
+                    box[2](page, x + col * COL_W + 2, y + 2)
+
+            if not self.add((CONTENT_W, height, paint)):
+                return
+            for _, problems in pair:
+                self.placed.extend(problems)
+
+    def long_section(self, category: str, problems: List[Dict[str, Any]], styles):
+        """_make_long_section: a spanning label row, then two problems per row, 4 pt padding"""
+        inner_w = CONTENT_W / 2 - 20
+        label = _paragraph(section_label(category), styles['sec_label'], CONTENT_W - 20)
+        top = None
+        # Rows are measured as they are placed, so a long section stops at the page end
+        for start in range(0, len(problems), 2):
+            pair = problems[start:start + 2]
+            cells = [_stack(_problem(problem, start + i + 1, styles, inner_w) + [_spacer(6)])
+                     for i, problem in enumerate(pair)]
+            height = max(cell[1] for cell in cells) + 8
+            if top is None:
+                # The label row only goes on a page with at least one row of problems
+                if self.full or self.y + label[1] + 8 + height > PAGE_BOTTOM:
+                    self.full = True
+                    return
+                top = self.y
+                self.add((CONTENT_W, label[1] + 8, lambda page, x, y: label[2](page, x + 10, y + 4)))
+
+            def paint(page, x, y, cells=cells):
+                for col, (_, _, draw) in enumerate(cells):
+                    draw(page, x + col * CONTENT_W / 2 + 10, y + 4)
+
+            if not self.add((CONTENT_W, height, paint)):
+                break
+            self.placed.extend(pair)
+        if top is not None and self.page is not None:
+            self.page.rect(MARGIN, top, CONTENT_W, self.y - top, stroke='#000000', stroke_width=1.5)
+
+
+def _lay_out(layout: _Layout, problems: List[Dict[str, Any]], worksheet_type: str, number_range: str,
+             student_name: Optional[str], problem_count: int, long_sections: Optional[List[str]]) -> List[str]:
+    """Lay page 1 out (painting if the layout has a page); returns the long sections placed"""
+    styles = _build_styles()
+
+    # ── Title, name line and rule ─────────────────────────────────────────────
+    layout.add(_paragraph(worksheet_title(worksheet_type, number_range), styles['title'], CONTENT_W),
+               after=styles['title'].spaceAfter + 4)
+    name_field = (f'Name: <b>{escape_markup(student_name)}</b>' if student_name
+                  else 'Name: ____________________________________')
+    fields = [(name_field, 0.45), ('Date: _________________', 0.33), (f'Score: _____ / {problem_count}', 0.22)]
+    cells = [(_paragraph(text, styles['name'], CONTENT_W * share - 12), CONTENT_W * share) for text, share in fields]
+    info_h = max(box[1] for box, _ in cells) + 4
+
+    def info(page, x, y):
+        for box, col_w in cells:
+            box[2](page, x + 6, y + (info_h - box[1]) / 2)
+            x += col_w
+
+    layout.add((CONTENT_W, info_h, info))
+    layout.add((CONTENT_W, 1.5, lambda page, x, y: page.line(x, y + 1.5, x + CONTENT_W, y + 1.5, hex_color(DARK_GRAY), 1.5)),
+               before=1, after=6)
+
+    # ── Sections ──────────────────────────────────────────────────────────────
+    if not problem_count:
+        layout.add(_paragraph('No problems generated.', styles['q'], CONTENT_W))
+    placed_long = []
+    sections: List[Tuple[Box, List[Dict[str, Any]]]] = []
+    for category, probs in group_by_category(problems).items():
+        if layout.full:
+            break
+        # Recorded sources are cut at page 1, so a long section may no longer measure long
+        section = None if long_sections is not None and category in long_sections else _section(category, probs, styles)
+        if section is not None:
+            sections.append((section, probs))
+            continue
+        layout.grid(sections)
+        sections = []
+        placed = len(layout.placed)
+        layout.long_section(category, probs, styles)
+        if len(layout.placed) > placed:
+            placed_long.append(category)
+    layout.grid(sections)
+    return placed_long
+
+
+def thumbnail_source(problems: List[Dict[str, Any]], worksheet_type: str, number_range: str,
+                     student_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    What render_thumbnail needs to draw a worksheet's first page later: the
+    problems that reach page 1, the total for the Score line, and which
+    sections are laid out long (decided by their full height, which the
+    cut-down problems no longer show). Measures only as far as page 1.
+    """
+    layout = _Layout(None)
+    long_sections = _lay_out(layout, problems, worksheet_type, number_range, student_name, len(problems), None)
+    return {
+        "problems": layout.placed,
+        "problem_count": len(problems),
+        "long_sections": long_sections,
+        "worksheet_type": worksheet_type,
+        "number_range": number_range,
+        "student_name": student_name,
+    }
+
+
+def render_thumbnail(problems: List[Dict[str, Any]], worksheet_type: str, number_range: str,
+                     student_name: Optional[str] = None, width: int = THUMBNAIL_WIDTH,
+                     problem_count: Optional[int] = None, long_sections: Optional[List[str]] = None) -> bytes:
+    """
+    A PNG of the worksheet's first page, `width` pixels wide.
+
+    Follows the PDF's page layout (same styles, paddings, section grid and
+    drawings) without rendering the PDF; text is greeked. Takes either the
+    whole worksheet or a thumbnail_source() record's fields.
+    """
+    page = _Page(width)
+    page.rect(BORDER_INSET, BORDER_INSET, PAGE_W - 2 * BORDER_INSET, PAGE_H - 2 * BORDER_INSET,
+              stroke='#000000', stroke_width=2)
+    _lay_out(_Layout(page), problems, worksheet_type, number_range, student_name,
+             len(problems) if problem_count is None else problem_count, long_sections)
+    return page.thumbnail(width)
\ No newline at end of file
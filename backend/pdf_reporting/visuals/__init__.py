@@ -0,0 +1,9 @@
+# Worksheet Visuals Module
+
+from .forms import ensure_form
+from .clock import ClockFace
+from .coins import CoinRow
+from .fraction_shapes import FractionShape
+from .graphs import BarGraph, Pictograph
+from .scales import NumberLine, Ruler
+from .base_ten import BaseTenBlocks
\ No newline at end of file
@@ -0,0 +1,116 @@
+# pdf_reporting/visuals/base_ten.py
+
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from reportlab.lib import colors
+from reportlab.platypus import Flowable
+
+from .forms import ensure_form
+
+# Side of one unit cube
+UNIT = 3
+# Gap between blocks, and between the hundreds, tens and ones groups
+BLOCK_GAP = 3
+GROUP_GAP = 10
+# Blocks per row within each group
+FLATS_PER_ROW = 3
+RODS_PER_ROW = 10
+UNITS_PER_ROW = 3
+
+BLOCK_FILL = colors.HexColor('#A5D6A7')
+LINE_COLOR = colors.HexColor('#333333')
+
+# Width and height of each block kind
+BLOCK_SIZES = {
+    'flat': (10 * UNIT, 10 * UNIT),
+    'rod':  (UNIT, 10 * UNIT),
+    'unit': (UNIT, UNIT),
+}
+
+
+@lru_cache(maxsize=1024)
+def base_ten_layout(number: int) -> Tuple[List[Tuple[str, float, float]], float, float]:
+    """
+    Place the hundreds flats, tens rods and ones units for a number.
+
+    Groups sit left to right and are bottom-aligned; flats and units wrap
+    into rows. A number up to 999 needs at most 27 placements.
+
+    Returns:
+        ([(kind, x, y), ...] with lower-left corners, width, height)
+    """
+    hundreds, rest = divmod(max(0, number), 100)
+    tens, ones = divmod(rest, 10)
+
+    placements = []
+    x = 0.0
+    height = 0.0
+    for kind, count, per_row in (('flat', hundreds, FLATS_PER_ROW), ('rod', tens, RODS_PER_ROW),
+                                 ('unit', ones, UNITS_PER_ROW)):
+        if not count:
+            continue
+        w, h = BLOCK_SIZES[kind]
+        for i in range(count):
+            col, row = i % per_row, i // per_row
+            placements.append((kind, x + col * (w + BLOCK_GAP), row * (h + BLOCK_GAP)))
+        cols = min(count, per_row)
+        rows = (count + per_row - 1) // per_row
+        x += cols * (w + BLOCK_GAP) - BLOCK_GAP + GROUP_GAP
+        height = max(height, rows * (h + BLOCK_GAP) - BLOCK_GAP)
+
+    return placements, max(x - GROUP_GAP, 0), height
+
+
+def _block_drawer(kind: str):
+    def draw(canv):
+        w, h = BLOCK_SIZES[kind]
+        canv.setFillColor(BLOCK_FILL)
+        canv.setStrokeColor(LINE_COLOR)
+        canv.setLineWidth(0.6)
+        canv.rect(0, 0, w, h, stroke=1, fill=1)
+
+        canv.setLineWidth(0.25)
+        path = canv.beginPath()
+        for i in range(1, int(w // UNIT)):
+            path.moveTo(i * UNIT, 0)
+            path.lineTo(i * UNIT, h)
+        for i in range(1, int(h // UNIT)):
+            path.moveTo(0, i * UNIT)
+            path.lineTo(w, i * UNIT)
+        canv.drawPath(path, stroke=1, fill=0)
+    return draw
+
+
+def block_forms(canv) -> Dict[str, str]:
+    """The document's forms for the three block kinds, defining them on first use"""
+    return {kind: ensure_form(canv, f'base_ten_{kind}', (-1, -1, w + 1, h + 1), _block_drawer(kind))
+            for kind, (w, h) in BLOCK_SIZES.items()}
+
+
+class BaseTenBlocks(Flowable):
+    """
+    A number shown as hundreds flats, tens rods and ones units.
+
+    Each block kind, grid lines included, is a form defined once per
+    document, so a block on the page is a single form reference.
+    """
+
+    def __init__(self, number: int):
+        super().__init__()
+        self.number = number
+        self._placements, self.width, self.height = base_ten_layout(number)
+        self.width += 2
+        self.height += 2
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        canv = self.canv
+        forms = block_forms(canv)
+        for kind, x, y in self._placements:
+            canv.saveState()
+            canv.translate(x + 1, y + 1)
+            canv.doForm(forms[kind])
+            canv.restoreState()
\ No newline at end of file
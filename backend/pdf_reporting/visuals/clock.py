@@ -0,0 +1,116 @@
+# pdf_reporting/visuals/clock.py
+
+import math
+from functools import lru_cache
+from typing import List, Tuple
+
+from reportlab.lib import colors
+from reportlab.platypus import Flowable
+
+from .forms import ensure_form
+
+# The dial form is drawn at this radius and scaled for other sizes
+DIAL_RADIUS = 36
+
+# Hand lengths and line widths, relative to DIAL_RADIUS
+HOUR_HAND = (0.5, 2.5)
+MINUTE_HAND = (0.8, 1.5)
+
+NUMERAL_FONT = ('Helvetica-Bold', 8)
+FACE_COLOR = colors.HexColor('#333333')
+
+Point = Tuple[float, float]
+Segment = Tuple[Point, Point]
+
+
+def _polar(radius: float, turns: float) -> Point:
+    """Point at `turns` of a full turn clockwise from 12 o'clock (y up)"""
+    angle = 2 * math.pi * turns
+    return radius * math.sin(angle), radius * math.cos(angle)
+
+
+@lru_cache(maxsize=None)
+def dial_geometry(radius: float = DIAL_RADIUS) -> Tuple[List[Segment], List[Segment], List[Tuple[str, Point]]]:
+    """
+    Geometry of a clock dial centred on the origin.
+
+    Returns:
+        (minute_ticks, hour_ticks, numerals): 48 short and 12 long tick
+        segments, and the 12 numerals with their centre points
+    """
+    minute_ticks, hour_ticks = [], []
+    for i in range(60):
+        inner = radius * (0.85 if i % 5 == 0 else 0.92)
+        segment = (_polar(inner, i / 60), _polar(radius, i / 60))
+        (hour_ticks if i % 5 == 0 else minute_ticks).append(segment)
+
+    numerals = [(str(h), _polar(radius * 0.68, h / 12)) for h in range(1, 13)]
+    return minute_ticks, hour_ticks, numerals
+
+
+def hand_segments(hour: int, minute: int, radius: float = DIAL_RADIUS) -> Tuple[Point, Point]:
+    """Tips of the hour and minute hands (from the dial centre) for a time"""
+    hour_tip = _polar(radius * HOUR_HAND[0], ((hour % 12) + minute / 60) / 12)
+    minute_tip = _polar(radius * MINUTE_HAND[0], minute / 60)
+    return hour_tip, minute_tip
+
+
+def _draw_dial(canv):
+    """Circle, ticks, numerals and centre pin, centred on the origin"""
+    minute_ticks, hour_ticks, numerals = dial_geometry()
+    canv.setStrokeColor(FACE_COLOR)
+    canv.setFillColor(FACE_COLOR)
+
+    canv.setLineWidth(1.5)
+    canv.circle(0, 0, DIAL_RADIUS)
+
+    for width, ticks in ((0.5, minute_ticks), (1.2, hour_ticks)):
+        canv.setLineWidth(width)
+        path = canv.beginPath()
+        for (x0, y0), (x1, y1) in ticks:
+            path.moveTo(x0, y0)
+            path.lineTo(x1, y1)
+        canv.drawPath(path, stroke=1, fill=0)
+
+    font, size = NUMERAL_FONT
+    canv.setFont(font, size)
+    for label, (x, y) in numerals:
+        canv.drawCentredString(x, y - size * 0.35, label)
+
+    canv.circle(0, 0, 1.8, stroke=0, fill=1)
+
+
+class ClockFace(Flowable):
+    """
+    An analog clock showing a time.
+
+    The dial is a form XObject shared by every clock in the document, so
+    each clock adds only a form reference and its two hand lines.
+    """
+
+    def __init__(self, hour: int, minute: int, radius: float = DIAL_RADIUS):
+        super().__init__()
+        self.hour = hour
+        self.minute = minute
+        self.radius = radius
+        self.width = self.height = 2 * radius + 4
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        canv = self.canv
+        pad = DIAL_RADIUS + 2
+        form = ensure_form(canv, 'clock_dial', (-pad, -pad, pad, pad), _draw_dial)
+
+        canv.saveState()
+        canv.translate(self.width / 2, self.height / 2)
+        canv.scale(self.radius / DIAL_RADIUS, self.radius / DIAL_RADIUS)
+        canv.doForm(form)
+
+        canv.setStrokeColor(FACE_COLOR)
+        canv.setLineCap(1)
+        for (x, y), (_, width) in zip(hand_segments(self.hour, self.minute), (HOUR_HAND, MINUTE_HAND)):
+            canv.setLineWidth(width)
+            canv.line(0, 0, x, y)
+        canv.restoreState()
\ No newline at end of file
@@ -0,0 +1,113 @@
+# pdf_reporting/visuals/coins.py
+
+from functools import lru_cache
+from typing import List, Tuple
+
+from reportlab.lib import colors
+from reportlab.platypus import Flowable
+
+from .forms import ensure_form
+
+# Drawn size per millimetre of real coin diameter
+PT_PER_MM = 1.3
+
+# name: (real diameter in mm, face color, label)
+COIN_SPECS = {
+    'penny':   (19.05, colors.HexColor('#C98B5B'), '1¢'),
+    'nickel':  (21.21, colors.HexColor('#C9CCD1'), '5¢'),
+    'dime':    (17.91, colors.HexColor('#DADDE2'), '10¢'),
+    'quarter': (24.26, colors.HexColor('#D1D4D9'), '25¢'),
+}
+
+COIN_GAP = 4
+EDGE_COLOR = colors.HexColor('#333333')
+
+
+def coin_radius(name: str) -> float:
+    """Drawn radius of a coin glyph"""
+    return COIN_SPECS[name][0] * PT_PER_MM / 2
+
+
+@lru_cache(maxsize=1024)
+def layout_coins(coins: Tuple[str, ...], width: float) -> Tuple[List[Tuple[str, float, float]], float]:
+    """
+    Flow coins left to right into rows no wider than `width`.
+
+    Returns:
+        ([(name, centre_x, centre_y_from_top), ...], total_height); each row
+        is as tall as its largest coin and coins sit on a common baseline
+    """
+    rows: List[List[str]] = [[]]
+    x = 0.0
+    for name in coins:
+        d = 2 * coin_radius(name)
+        if rows[-1] and x + d > width:
+            rows.append([])
+            x = 0.0
+        rows[-1].append(name)
+        x += d + COIN_GAP
+
+    placed = []
+    top = 0.0
+    for row in rows:
+        row_h = max((2 * coin_radius(n) for n in row), default=0)
+        x = 0.0
+        for name in row:
+            r = coin_radius(name)
+            placed.append((name, x + r, top + row_h - r))
+            x += 2 * r + COIN_GAP
+        top += row_h + COIN_GAP
+    return placed, max(top - COIN_GAP, 0)
+
+
+def _coin_drawer(name: str):
+    def draw(canv):
+        _, fill, label = COIN_SPECS[name]
+        r = coin_radius(name)
+        canv.setStrokeColor(EDGE_COLOR)
+        canv.setFillColor(fill)
+        canv.setLineWidth(1)
+        canv.circle(0, 0, r, stroke=1, fill=1)
+        canv.setLineWidth(0.4)
+        canv.circle(0, 0, r - 2.5, stroke=1, fill=0)
+        size = max(6, r * 0.6)
+        canv.setFillColor(EDGE_COLOR)
+        canv.setFont('Helvetica-Bold', size)
+        canv.drawCentredString(0, -size * 0.35, label)
+    return draw
+
+
+def coin_form(canv, name: str) -> str:
+    """Name of the document's form for a coin glyph, defining it on first use"""
+    r = coin_radius(name) + 1
+    return ensure_form(canv, f'coin_{name}', (-r, -r, r, r), _coin_drawer(name))
+
+
+class CoinRow(Flowable):
+    """
+    Coins flowed into rows.
+
+    Each coin type is a form XObject defined once per document; a coin on
+    the page is a translate and a form reference, so sheets with hundreds
+    of coins never repeat a glyph's paths.
+    """
+
+    def __init__(self, coins: List[str]):
+        super().__init__()
+        self.coins = tuple(coins)
+        self.width = self.height = 0
+        self._placed = []
+
+    def wrap(self, availWidth, availHeight):
+        self._placed, self.height = layout_coins(self.coins, availWidth)
+        self.width = availWidth
+        return self.width, self.height
+
+    def draw(self):
+        canv = self.canv
+        for name, x, y in self._placed:
+            form = coin_form(canv, name)
+            canv.saveState()
+            canv.translate(x, self.height - y)
+            canv.doForm(form)
+            canv.restoreState()
\ No newline at end of file
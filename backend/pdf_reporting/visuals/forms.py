@@ -0,0 +1,22 @@
+# pdf_reporting/visuals/forms.py
+
+def ensure_form(canv, name, bbox, draw):
+    """
+    Define a reusable form XObject on the canvas unless the document has it.
+
+    The form is drawn once by `draw(canv)` in its own coordinate space
+    (clipped to `bbox` = (x0, y0, x1, y1)); every later use is a single
+    `canv.doForm(name)` reference. Canvas state is saved around the
+    definition so fonts and colors set inside the form don't leak into the
+    page being drawn.
+
+    Returns:
+        The form name, for passing to `canv.doForm`
+    """
+    if not canv.hasForm(name):
+        canv.saveState()
+        canv.beginForm(name, *bbox)
+        draw(canv)
+        canv.endForm()
+        canv.restoreState()
+    return name
\ No newline at end of file
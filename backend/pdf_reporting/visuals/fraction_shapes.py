@@ -0,0 +1,127 @@
+# pdf_reporting/visuals/fraction_shapes.py
+
+import math
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+from reportlab.lib import colors
+from reportlab.platypus import Flowable
+
+from .forms import ensure_form
+
+# Outline sizes (width, height) of each shape
+SHAPE_SIZES = {
+    'circle':    (52, 52),
+    'rectangle': (72, 36),
+    'square':    (52, 52),
+}
+
+SHADE_COLOR = colors.HexColor('#BBBBBB')
+LINE_COLOR = colors.HexColor('#333333')
+
+Segment = Tuple[Tuple[float, float], Tuple[float, float]]
+
+
+@lru_cache(maxsize=None)
+def fraction_geometry(shape: str, total: int) -> Tuple[List[Tuple[Any, ...]], List[Segment]]:
+    """
+    Equal parts of a shape, with origin at the shape's lower-left corner.
+
+    Returns:
+        (parts, dividers): parts are ('wedge', cx, cy, r, start_deg, extent_deg)
+        for circles (counter-clockwise degrees, first part starting at 12 o'clock
+        and continuing clockwise) or ('rect', x, y, w, h) strips/quadrants;
+        dividers are the partition line segments
+    """
+    if shape not in SHAPE_SIZES:
+        raise ValueError(f"Unsupported fraction shape: {shape}")
+    w, h = SHAPE_SIZES[shape]
+
+    if shape == 'circle':
+        r = w / 2
+        extent = 360 / total
+        parts = [('wedge', r, r, r, 90 - (i + 1) * extent, extent) for i in range(total)]
+        dividers = []
+        if total > 1:
+            for i in range(total):
+                angle = 2 * math.pi * i / total
+                dividers.append(((r, r), (r + r * math.sin(angle), r + r * math.cos(angle))))
+        return parts, dividers
+
+    if shape == 'square' and total == 4:
+        half_w, half_h = w / 2, h / 2
+        parts = [('rect', 0, half_h, half_w, half_h), ('rect', half_w, half_h, half_w, half_h),
+                 ('rect', half_w, 0, half_w, half_h), ('rect', 0, 0, half_w, half_h)]
+        dividers = [((half_w, 0), (half_w, h)), ((0, half_h), (w, half_h))]
+        return parts, dividers
+
+    strip = w / total
+    parts = [('rect', i * strip, 0, strip, h) for i in range(total)]
+    dividers = [((i * strip, 0), (i * strip, h)) for i in range(1, total)]
+    return parts, dividers
+
+
+def _shape_drawer(shape: str, total: int, shaded: int):
+    def draw(canv):
+        parts, dividers = fraction_geometry(shape, total)
+        w, h = SHAPE_SIZES[shape]
+
+        canv.setFillColor(SHADE_COLOR)
+        for part in parts[:shaded]:
+            if part[0] == 'wedge':
+                _, cx, cy, r, start, extent = part
+                if extent >= 360:
+                    canv.circle(cx, cy, r, stroke=0, fill=1)
+                else:
+                    canv.wedge(cx - r, cy - r, cx + r, cy + r, start, extent, stroke=0, fill=1)
+            else:
+                canv.rect(*part[1:], stroke=0, fill=1)
+
+        canv.setStrokeColor(LINE_COLOR)
+        canv.setLineWidth(1.5)
+        if shape == 'circle':
+            canv.circle(w / 2, h / 2, w / 2, stroke=1, fill=0)
+        else:
+            canv.rect(0, 0, w, h, stroke=1, fill=0)
+
+        canv.setLineWidth(1)
+        path = canv.beginPath()
+        for (x0, y0), (x1, y1) in dividers:
+            path.moveTo(x0, y0)
+            path.lineTo(x1, y1)
+        canv.drawPath(path, stroke=1, fill=0)
+    return draw
+
+
+class FractionShape(Flowable):
+    """
+    A shape cut into equal parts with some of them shaded.
+
+    Geometry is cached per (shape, total_parts) and each (shape, total,
+    shaded) combination is a form XObject, so every problem on a sheet is a
+    single form reference.
+    """
+
+    def __init__(self, shape: str, total_parts: int, shaded_parts: int):
+        super().__init__()
+        self.shape = shape if shape in SHAPE_SIZES else 'square'
+        self.total = max(1, total_parts)
+        self.shaded = min(max(0, shaded_parts), self.total)
+        self.width, self.height = SHAPE_SIZES[self.shape]
+        # Room for the outline stroke
+        self.width += 2
+        self.height += 2
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        canv = self.canv
+        w, h = SHAPE_SIZES[self.shape]
+        form = ensure_form(canv, f'fraction_{self.shape}_{self.total}_{self.shaded}',
+                           (-1, -1, w + 1, h + 1),
+                           _shape_drawer(self.shape, self.total, self.shaded))
+        canv.saveState()
+        canv.translate(1, 1)
+        canv.doForm(form)
+        canv.restoreState()
\ No newline at end of file
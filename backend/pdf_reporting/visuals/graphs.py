@@ -0,0 +1,289 @@
+# pdf_reporting/visuals/graphs.py
+
+import math
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
+
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable
+
+from .forms import ensure_form
+
+LINE_COLOR = colors.HexColor('#333333')
+GRID_COLOR = colors.HexColor('#CCCCCC')
+BAR_COLOR = colors.HexColor('#9FA8DA')
+ICON_COLOR = colors.HexColor('#F9A825')
+
+LABEL_FONT = 'Helvetica'
+LABEL_SIZE = 7
+
+BAR_GRAPH_HEIGHT = 120
+# Left gutter for tick labels and bottom gutter for item labels
+AXIS_GUTTER = 20
+LABEL_GUTTER = 12
+
+ICON_SIZE = 12
+ICON_GAP = 2
+PICTOGRAPH_ROW = 16
+PICTOGRAPH_LABEL_W = 62
+
+
+@lru_cache(maxsize=None)
+def nice_ticks(max_value: int, max_ticks: int = 6) -> Tuple[int, ...]:
+    """Axis tick values from 0 up past max_value, stepping 1, 2 or 5 times a power of ten"""
+    max_value = max(1, max_value)
+    for magnitude in (10 ** p for p in range(0, 7)):
+        for base in (1, 2, 5):
+            step = base * magnitude
+            count = math.ceil(max_value / step)
+            if count + 1 <= max_ticks:
+                return tuple(range(0, (count + 1) * step, step))
+    return (0, max_value)
+
+
+def _fit_label(text: str, width: float) -> float:
+    """Font size (at most LABEL_SIZE) at which a label fits a width"""
+    natural = stringWidth(text, LABEL_FONT, LABEL_SIZE)
+    return LABEL_SIZE if natural <= width else max(4, LABEL_SIZE * width / natural)
+
+
+@lru_cache(maxsize=1024)
+def bar_graph_layout(items: Tuple[str, ...], values: Tuple[int, ...],
+                     width: float, height: float = BAR_GRAPH_HEIGHT) -> Dict[str, Any]:
+    """
+    Positions of everything in a vertical bar graph, origin at lower left.
+
+    Returns:
+        {'gridlines': [y], 'tick_labels': [(text, x, y)], 'bars': [(x, y, w, h)],
+         'item_labels': [(text, x, y, font_size)], 'axes': [segment, segment]}
+    """
+    ticks = nice_ticks(max(values, default=1))
+    plot_x, plot_y = AXIS_GUTTER, LABEL_GUTTER
+    plot_w, plot_h = width - AXIS_GUTTER - 2, height - LABEL_GUTTER - 4
+    per_unit = plot_h / ticks[-1]
+
+    gridlines = [plot_y + t * per_unit for t in ticks[1:]]
+    tick_labels = [(str(t), plot_x - 3, plot_y + t * per_unit - LABEL_SIZE * 0.35) for t in ticks]
+
+    slot = plot_w / max(1, len(items))
+    bar_w = slot * 0.6
+    bars, item_labels = [], []
+    for i, (item, value) in enumerate(zip(items, values)):
+        centre = plot_x + slot * (i + 0.5)
+        bars.append((centre - bar_w / 2, plot_y, bar_w, value * per_unit))
+        item_labels.append((item, centre, plot_y - LABEL_SIZE - 2, _fit_label(item, slot - 2)))
+
+    axes = [((plot_x, plot_y), (plot_x, plot_y + plot_h)),
+            ((plot_x, plot_y), (plot_x + plot_w, plot_y))]
+    return {'gridlines': gridlines, 'plot': (plot_x, plot_w), 'tick_labels': tick_labels,
+            'bars': bars, 'item_labels': item_labels, 'axes': axes}
+
+
+def _icon_scale(max_value: int, per_row: int) -> int:
+    """Smallest 1, 2 or 5 times a power of ten that fits the longest row in `per_row` icons"""
+    needed = max(1, math.ceil(max_value / per_row))
+    for magnitude in (10 ** p for p in range(0, 7)):
+        for base in (1, 2, 5):
+            if base * magnitude >= needed:
+                return base * magnitude
+    return needed
+
+
+@lru_cache(maxsize=1024)
+def pictograph_layout(items: Tuple[str, ...], values: Tuple[int, ...],
+                      width: float) -> Dict[str, Any]:
+    """
+    Rows of a pictograph, origin at lower left.
+
+    Each icon stands for `scale` items, chosen so the longest row fits; a
+    value that isn't a multiple of the scale ends in a partial icon cut to
+    the remainder (half an icon for 1 at scale 2). The key row is only
+    there when the scale isn't 1.
+
+    Returns:
+        {'scale': n, 'height': h, 'labels': [(text, x, y, font_size)],
+         'icons': [(x, y)], 'partial': [(x, y, fraction)], 'key': (x, y) or None}
+    """
+    room = width - PICTOGRAPH_LABEL_W
+    per_row = max(1, int((room + ICON_GAP) // (ICON_SIZE + ICON_GAP)))
+    scale = _icon_scale(max(values, default=1), per_row)
+
+    key_rows = 1 if scale > 1 else 0
+    height = PICTOGRAPH_ROW * (len(items) + key_rows)
+    labels, icons, partial = [], [], []
+    for row, (item, value) in enumerate(zip(items, values)):
+        y = height - PICTOGRAPH_ROW * (row + 1)
+        labels.append((item, 0, y + 3, _fit_label(item, PICTOGRAPH_LABEL_W - 4)))
+        full, remainder = divmod(max(0, value), scale)
+        for i in range(full):
+            icons.append((PICTOGRAPH_LABEL_W + i * (ICON_SIZE + ICON_GAP), y))
+        if remainder:
+            partial.append((PICTOGRAPH_LABEL_W + full * (ICON_SIZE + ICON_GAP), y, remainder / scale))
+    return {'scale': scale, 'height': height, 'labels': labels, 'icons': icons, 'partial': partial,
+            'key': (0, 0) if key_rows else None}
+
+
+@lru_cache(maxsize=None)
+def icon_points() -> Tuple[Tuple[float, float], ...]:
+    """Corners of the five-pointed star filling the icon box, origin at lower left"""
+    r = ICON_SIZE / 2
+    points = []
+    for i in range(10):
+        radius = r if i % 2 == 0 else r * 0.45
+        angle = math.pi / 2 + i * math.pi / 5
+        points.append((r + radius * math.cos(angle), r + radius * math.sin(angle)))
+    return tuple(points)
+
+
+@lru_cache(maxsize=64)
+def partial_icon_points(fraction: float) -> Tuple[Tuple[float, float], ...]:
+    """The star's left `fraction` of its width, cut straight down, origin at lower left"""
+    cut = ICON_SIZE * fraction
+    star = icon_points()
+    points = []
+    for i, (x0, y0) in enumerate(star):
+        x1, y1 = star[(i + 1) % len(star)]
+        if x0 <= cut:
+            points.append((x0, y0))
+        if (x0 <= cut) != (x1 <= cut):
+            crossing = (cut, y0 + (cut - x0) / (x1 - x0) * (y1 - y0))
+            # A cut through a corner would repeat it
+            if not points or max(abs(crossing[0] - points[-1][0]), abs(crossing[1] - points[-1][1])) > 1e-6:
+                points.append(crossing)
+    return tuple(points)
+
+
+def _star_path(canv, points, dx: float = 0, dy: float = 0):
+    path = canv.beginPath()
+    path.moveTo(points[0][0] + dx, points[0][1] + dy)
+    for x, y in points[1:]:
+        path.lineTo(x + dx, y + dy)
+    path.close()
+    return path
+
+
+def _draw_icon(canv):
+    """Five-pointed star filling the icon box"""
+    canv.setFillColor(ICON_COLOR)
+    canv.setStrokeColor(LINE_COLOR)
+    canv.setLineWidth(0.5)
+    canv.drawPath(_star_path(canv, icon_points()), stroke=1, fill=1)
+
+
+def _draw_labels(canv, labels, align):
+    draw = canv.drawString if align == 'left' else canv.drawCentredString
+    canv.setFillColor(LINE_COLOR)
+    size = None
+    for text, x, y, font_size in labels:
+        if font_size != size:
+            canv.setFont(LABEL_FONT, font_size)
+            size = font_size
+        draw(x, y, text)
+
+
+def _item_values(problem_items: List[str], values: Dict[str, Any]) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+    items = tuple(problem_items)
+    return items, tuple(int(values.get(item, 0)) for item in items)
+
+
+class BarGraph(Flowable):
+    """A vertical bar graph drawn from plain rects, lines and strings"""
+
+    def __init__(self, items: List[str], values: Dict[str, Any]):
+        super().__init__()
+        self.items, self.values = _item_values(items, values)
+        self.width, self.height = 0, BAR_GRAPH_HEIGHT
+        self._layout = None
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self._layout = bar_graph_layout(self.items, self.values, availWidth)
+        return self.width, self.height
+
+    def draw(self):
+        canv = self.canv
+        layout = self._layout
+        plot_x, plot_w = layout['plot']
+
+        canv.setStrokeColor(GRID_COLOR)
+        canv.setLineWidth(0.5)
+        grid = canv.beginPath()
+        for y in layout['gridlines']:
+            grid.moveTo(plot_x, y)
+            grid.lineTo(plot_x + plot_w, y)
+        canv.drawPath(grid, stroke=1, fill=0)
+
+        canv.setFillColor(BAR_COLOR)
+        canv.setStrokeColor(LINE_COLOR)
+        bars = canv.beginPath()
+        for x, y, w, h in layout['bars']:
+            bars.rect(x, y, w, h)
+        canv.drawPath(bars, stroke=1, fill=1)
+
+        canv.setLineWidth(1)
+        axes = canv.beginPath()
+        for (x0, y0), (x1, y1) in layout['axes']:
+            axes.moveTo(x0, y0)
+            axes.lineTo(x1, y1)
+        canv.drawPath(axes, stroke=1, fill=0)
+
+        canv.setFillColor(LINE_COLOR)
+        canv.setFont(LABEL_FONT, LABEL_SIZE)
+        for text, x, y in layout['tick_labels']:
+            canv.drawRightString(x, y, text)
+        _draw_labels(canv, layout['item_labels'], 'centre')
+
+
+class Pictograph(Flowable):
+    """
+    A pictograph: one row of icons per item, plus a key when an icon
+    stands for more than one.
+
+    The icon is a form XObject shared across the document; each icon on the
+    page is a form reference.
+    """
+
+    def __init__(self, items: List[str], values: Dict[str, Any]):
+        super().__init__()
+        self.items, self.values = _item_values(items, values)
+        self.width = self.height = 0
+        self._layout = None
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self._layout = pictograph_layout(self.items, self.values, availWidth)
+        self.height = self._layout['height']
+        return self.width, self.height
+
+    def draw(self):
+        canv = self.canv
+        layout = self._layout
+        form = ensure_form(canv, 'pictograph_icon', (0, 0, ICON_SIZE, ICON_SIZE), _draw_icon)
+
+        _draw_labels(canv, layout['labels'], 'left')
+        for x, y in layout['icons']:
+            canv.saveState()
+            canv.translate(x, y)
+            canv.doForm(form)
+            canv.restoreState()
+
+        if layout['partial']:
+            canv.setFillColor(ICON_COLOR)
+            canv.setStrokeColor(LINE_COLOR)
+            canv.setLineWidth(0.5)
+            for x, y, fraction in layout['partial']:
+                canv.drawPath(_star_path(canv, partial_icon_points(fraction), x, y), stroke=1, fill=1)
+
+        if layout['key'] is None:
+            return
+        # Key: "<icon> = n"
+        x, y = layout['key']
+        canv.saveState()
+        canv.translate(x + PICTOGRAPH_LABEL_W, y)
+        canv.doForm(form)
+        canv.restoreState()
+        canv.setFillColor(LINE_COLOR)
+        canv.setFont(LABEL_FONT, LABEL_SIZE)
+        canv.drawString(x + PICTOGRAPH_LABEL_W + ICON_SIZE + 4, y + 3, f"= {layout['scale']}")
+        canv.drawString(x, y + 3, 'Key:')
\ No newline at end of file
@@ -0,0 +1,190 @@
+# pdf_reporting/visuals/scales.py
+
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+from reportlab.lib import colors
+from reportlab.platypus import Flowable
+
+from .forms import ensure_form
+
+LINE_COLOR = colors.HexColor('#333333')
+RULER_FILL = colors.HexColor('#FFF3C4')
+OBJECT_COLOR = colors.HexColor('#1A237E')
+
+# Drawn length of every ruler, whatever its unit, plus a margin at each end
+RULER_W = 216
+RULER_MARGIN = 6
+RULER_BODY_H = 22
+
+# Units shown and tick subdivisions per unit: (length in units, [(every, tick length)])
+RULER_SCALES = {
+    'inches':      (12, [(1, 10), (1 / 2, 7), (1 / 4, 4)]),
+    'centimeters': (30, [(1, 8), (1 / 2, 4)]),
+}
+
+NUMBER_LINE_W = 220
+NUMBER_LINE_TICKS = 7
+NUMBER_LINE_H = 34
+
+Segment = Tuple[Tuple[float, float], Tuple[float, float]]
+
+
+@lru_cache(maxsize=None)
+def ruler_geometry(unit: str) -> Dict[str, Any]:
+    """
+    Ticks and numerals of a ruler strip, origin at the body's lower-left corner.
+
+    Returns:
+        {'per_unit': pt, 'ticks': [segment], 'numerals': [(text, x, y)]}; each
+        tick position appears once, at its longest length
+    """
+    length, subdivisions = RULER_SCALES[unit]
+    per_unit = RULER_W / length
+
+    ticks: List[Segment] = []
+    seen = set()
+    for every, tick_len in subdivisions:
+        steps = int(round(length / every))
+        for i in range(steps + 1):
+            pos = round(i * every, 4)
+            if pos in seen:
+                continue
+            seen.add(pos)
+            x = RULER_MARGIN + pos * per_unit
+            ticks.append(((x, RULER_BODY_H), (x, RULER_BODY_H - tick_len)))
+
+    numerals = [(str(n), RULER_MARGIN + n * per_unit, 3) for n in range(length + 1)]
+    return {'per_unit': per_unit, 'ticks': ticks, 'numerals': numerals}
+
+
+@lru_cache(maxsize=None)
+def number_line_geometry() -> Dict[str, Any]:
+    """Tick x positions, tick segments and arrowheads of the shared number line strip"""
+    spacing = (NUMBER_LINE_W - 2 * 14) / (NUMBER_LINE_TICKS - 1)
+    xs = [14 + i * spacing for i in range(NUMBER_LINE_TICKS)]
+    axis_y = NUMBER_LINE_H - 10
+    ticks = [((x, axis_y - 4), (x, axis_y + 4)) for x in xs]
+    arrows = [[(0, axis_y), (6, axis_y + 3), (6, axis_y - 3)],
+              [(NUMBER_LINE_W, axis_y), (NUMBER_LINE_W - 6, axis_y + 3), (NUMBER_LINE_W - 6, axis_y - 3)]]
+    return {'xs': xs, 'axis_y': axis_y, 'ticks': ticks, 'arrows': arrows}
+
+
+def number_line_labels(number: int, blank_offset: Optional[int]) -> List[Optional[str]]:
+    """
+    Labels for the ticks around `number`; the tick for `number + blank_offset`
+    is left for the student. Near zero the window shifts right (the blank
+    moving with it) so no tick is negative.
+    """
+    first = max(number - NUMBER_LINE_TICKS // 2, 0)
+    blank = None if blank_offset is None else number + blank_offset
+    return [None if value == blank else str(value)
+            for value in range(first, first + NUMBER_LINE_TICKS)]
+
+
+def _stroke_segments(canv, segments):
+    path = canv.beginPath()
+    for (x0, y0), (x1, y1) in segments:
+        path.moveTo(x0, y0)
+        path.lineTo(x1, y1)
+    canv.drawPath(path, stroke=1, fill=0)
+
+
+def _ruler_drawer(unit: str):
+    def draw(canv):
+        geometry = ruler_geometry(unit)
+        canv.setStrokeColor(LINE_COLOR)
+        canv.setFillColor(RULER_FILL)
+        canv.setLineWidth(1)
+        canv.rect(0, 0, RULER_W + 2 * RULER_MARGIN, RULER_BODY_H, stroke=1, fill=1)
+        canv.setLineWidth(0.6)
+        _stroke_segments(canv, geometry['ticks'])
+        canv.setFillColor(LINE_COLOR)
+        canv.setFont('Helvetica', 5)
+        for text, x, y in geometry['numerals']:
+            canv.drawCentredString(x, y, text)
+    return draw
+
+
+def _draw_number_line(canv):
+    geometry = number_line_geometry()
+    axis_y = geometry['axis_y']
+    canv.setStrokeColor(LINE_COLOR)
+    canv.setFillColor(LINE_COLOR)
+    canv.setLineWidth(1.2)
+    _stroke_segments(canv, [((4, axis_y), (NUMBER_LINE_W - 4, axis_y))] + geometry['ticks'])
+    for head in geometry['arrows']:
+        path = canv.beginPath()
+        path.moveTo(*head[0])
+        for point in head[1:]:
+            path.lineTo(*point)
+        path.close()
+        canv.drawPath(path, stroke=0, fill=1)
+
+
+class Ruler(Flowable):
+    """
+    A ruler with a line to measure above it.
+
+    The ruler body, ticks and numerals are one form per unit, shared across
+    the document; each problem adds only its measured line.
+    """
+
+    def __init__(self, unit: str, measurement: float):
+        super().__init__()
+        self.unit = unit if unit in RULER_SCALES else 'inches'
+        self.measurement = measurement
+        self.width = RULER_W + 2 * RULER_MARGIN
+        self.height = RULER_BODY_H + 12
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        canv = self.canv
+        form = ensure_form(canv, f'ruler_{self.unit}',
+                           (-1, -1, self.width + 1, RULER_BODY_H + 1), _ruler_drawer(self.unit))
+        canv.doForm(form)
+
+        length = min(self.measurement, RULER_SCALES[self.unit][0]) * ruler_geometry(self.unit)['per_unit']
+        canv.saveState()
+        canv.setStrokeColor(OBJECT_COLOR)
+        canv.setLineWidth(4)
+        canv.line(RULER_MARGIN, RULER_BODY_H + 6, RULER_MARGIN + length, RULER_BODY_H + 6)
+        canv.restoreState()
+
+
+class NumberLine(Flowable):
+    """
+    A number line centred on a number (shifted right near zero), with
+    one tick left blank.
+
+    The line, ticks and arrows are a single shared form; each problem
+    overlays only its tick labels.
+    """
+
+    def __init__(self, number: int, blank_offset: Optional[int] = None):
+        super().__init__()
+        self.labels = number_line_labels(number, blank_offset)
+        self.width = NUMBER_LINE_W
+        self.height = NUMBER_LINE_H
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        canv = self.canv
+        form = ensure_form(canv, 'number_line', (0, 0, NUMBER_LINE_W, NUMBER_LINE_H), _draw_number_line)
+        canv.doForm(form)
+
+        geometry = number_line_geometry()
+        canv.setFillColor(LINE_COLOR)
+        canv.setStrokeColor(LINE_COLOR)
+        canv.setFont('Helvetica', 8)
+        label_y = geometry['axis_y'] - 15
+        for x, label in zip(geometry['xs'], self.labels):
+            if label is None:
+                canv.setLineWidth(0.6)
+                canv.line(x - 9, label_y - 1, x + 9, label_y - 1)
+            else:
+                canv.drawCentredString(x, label_y, label)
\ No newline at end of file
@@ -1,8 +1,10 @@
 # problem_generators/base.py (enhanced with visualization support)
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, TYPE_CHECKING
 import random
-from reportlab.graphics.shapes import Drawing
+
+if TYPE_CHECKING:
+    from reportlab.graphics.shapes import Drawing
 
 # Constants for difficulty levels
 BEGINNER = "beginner"
@@ -33,7 +35,7 @@ class BaseProblemGenerator:
         """
         raise NotImplementedError("Subclasses must implement generate_problem")
     
-    def generate_visualization(self, problem: Dict[str, Any]) -> Drawing:
+    def generate_visualization(self, problem: Dict[str, Any]) -> "Drawing":
         """
         Generate a ReportLab Drawing object to visualize the problem.
         
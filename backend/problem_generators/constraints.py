@@ -0,0 +1,141 @@
+# problem_generators/constraints.py
+
+import random
+from typing import Dict, Any, Optional, List, Callable, Sequence, Union
+
+# A bound is either a fixed integer or an expression over earlier slots,
+# e.g. "9 - num1" or "min(150, num1)".
+Bound = Union[int, str, Callable[[Dict[str, Any]], int]]
+
+# Names available inside bound expressions
+_EXPRESSION_GLOBALS = {"__builtins__": {}, "min": min, "max": max, "abs": abs}
+
+
+def compile_expression(expression: Union[int, str, Callable], label: str = "<expr>") -> Callable[[Dict[str, Any]], Any]:
+    """
+    Compile a bound or answer expression into a callable taking the slot values.
+
+    Args:
+        expression: An integer constant, an arithmetic expression string over
+            earlier slot names, or an already-callable bound
+        label: Name used in error messages
+
+    Returns:
+        A callable mapping the current slot values to a value
+    """
+    if callable(expression):
+        return expression
+    if isinstance(expression, int):
+        return lambda values, constant=expression: constant
+    code = compile(str(expression), label, "eval")
+    return lambda values: eval(code, _EXPRESSION_GLOBALS, values)
+
+
+class Slot:
+    """
+    One variable of a problem family.
+
+    A slot is either an integer range whose bounds may depend on slots sampled
+    before it, or a choice from a fixed list of options. Choices can be kept
+    distinct from earlier slots (e.g. two different names in one story).
+    """
+
+    def __init__(self, name: str, low: Optional[Bound] = None, high: Optional[Bound] = None,
+                 choices: Optional[Sequence[Any]] = None, distinct_from: Sequence[str] = ()):
+        if choices is None and (low is None or high is None):
+            raise ValueError(f"Slot '{name}' needs either a range or a list of choices")
+
+        self.name = name
+        self.choices = list(choices) if choices is not None else None
+        self.distinct_from = list(distinct_from)
+        self._low = compile_expression(low, f"{name}.low") if low is not None else None
+        self._high = compile_expression(high, f"{name}.high") if high is not None else None
+
+    def sample(self, values: Dict[str, Any], rng=random) -> Any:
+        """Sample a value for this slot given the values of earlier slots."""
+        if self.choices is not None:
+            taken = {values[other] for other in self.distinct_from}
+            options = [option for option in self.choices if option not in taken]
+            if not options:
+                raise ValueError(f"No choices left for slot '{self.name}'")
+            return rng.choice(options)
+
+        low = self._low(values)
+        high = self._high(values)
+        if low > high:
+            raise ValueError(f"Empty range for slot '{self.name}': {low}..{high}")
+        return rng.randint(low, high)
+
+
+class ProblemFamily:
+    """
+    A family of problems described by ordered operand slots.
+
+    Each slot's range is narrowed by the values already chosen for the slots
+    before it, so every draw is valid by construction. Sampling costs one
+    random draw per slot and never retries, which keeps generation time flat
+    even for tight constraints.
+    """
+
+    def __init__(self, slots: List[Slot], derive: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+        self.slots = slots
+        self.derive = derive
+
+    def sample(self, rng=random) -> Dict[str, Any]:
+        """Sample one valid assignment of all slots (plus any derived values)."""
+        values: Dict[str, Any] = {}
+        for slot in self.slots:
+            values[slot.name] = slot.sample(values, rng)
+        if self.derive:
+            values.update(self.derive(values))
+        return values
+
+
+def place_value_family(digits: int, operation: str, regroup: bool = True) -> ProblemFamily:
+    """
+    Build a family of two-operand problems with a fixed number of digits.
+
+    Without regrouping, operands are sampled digit by digit so that no column
+    carries (addition) or borrows (subtraction). With regrouping allowed, the
+    only constraint is a non-negative difference for subtraction.
+
+    Args:
+        digits: Number of digits in the first operand
+        operation: "addition" or "subtraction"
+        regroup: Whether carrying/borrowing is allowed
+
+    Returns:
+        A ProblemFamily whose samples contain "first_number" and "second_number"
+    """
+    if operation not in ("addition", "subtraction"):
+        raise ValueError(f"Unsupported operation: {operation}")
+
+    low = 10 ** (digits - 1) if digits > 1 else 0
+    high = 10 ** digits - 1
+
+    if regroup:
+        if operation == "subtraction":
+            slots = [Slot("first_number", max(low, 1), high), Slot("second_number", 0, "first_number")]
+        else:
+            slots = [Slot("first_number", low, high), Slot("second_number", low, high)]
+        return ProblemFamily(slots)
+
+    # Digit slots run from the highest place down; the leading digit of the
+    # first operand is non-zero so the operand keeps its digit count.
+    slots = []
+    for place in reversed(range(digits)):
+        leading = place == digits - 1 and digits > 1
+        slots.append(Slot(f"a{place}", 1 if leading else 0, 9))
+    for place in reversed(range(digits)):
+        if operation == "subtraction":
+            slots.append(Slot(f"b{place}", 0, f"a{place}"))
+        else:
+            slots.append(Slot(f"b{place}", 0, f"9 - a{place}"))
+
+    def derive(values: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "first_number": sum(values[f"a{p}"] * 10 ** p for p in range(digits)),
+            "second_number": sum(values[f"b{p}"] * 10 ** p for p in range(digits)),
+        }
+
+    return ProblemFamily(slots, derive)
@@ -0,0 +1,178 @@
+# problem_generators/history.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import ExitStack, closing, contextmanager
+from typing import Dict, Any, Optional, List, Iterable
+
+# Metadata added by generate_problems; not part of what the student sees
+_NON_CANONICAL_KEYS = ("category", "subcategory")
+
+# Default location of the history database (overridable per deployment)
+DEFAULT_HISTORY_PATH = os.environ.get("PROBLEM_HISTORY_DB", "problem_history.db")
+
+# SQLite's default limit on bound parameters per statement is 999
+_MAX_QUERY_PARAMS = 900
+
+
+def canonical_problem_key(problem: Dict[str, Any]) -> bytes:
+    """Return a stable hash of the student-visible content of a problem."""
+    content = {k: v for k, v in problem.items() if k not in _NON_CANONICAL_KEYS}
+    encoded = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over byte keys using double hashing"""
+
+    def __init__(self, size_bits: int = 9600, hash_count: int = 7, bits: Optional[bytes] = None):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.bits = bytearray(bits) if bits is not None else bytearray((size_bits + 7) // 8)
+
+    def _positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, key: bytes) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class StudentHistory:
+    """
+    Recently seen problems for one student.
+
+    Two generations of Bloom filters are kept: once the current one holds
+    `capacity` problems it becomes the previous one and a fresh filter takes
+    over. Membership checks both, so a problem counts as "recent" for between
+    one and two capacities' worth of later problems, at a fixed size per student.
+    """
+
+    def __init__(self, student_id: str, capacity: int = 1000,
+                 current: Optional[bytes] = None, previous: Optional[bytes] = None,
+                 current_count: int = 0):
+        self.student_id = student_id
+        self.capacity = capacity
+        self.current = BloomFilter(bits=current)
+        self.previous = BloomFilter(bits=previous)
+        self.current_count = current_count
+
+    def seen(self, problem: Dict[str, Any]) -> bool:
+        """Whether the problem (probably) appeared recently"""
+        key = canonical_problem_key(problem)
+        return key in self.current or key in self.previous
+
+    def add(self, problem: Dict[str, Any]) -> None:
+        """Record a problem as issued to this student"""
+        if self.current_count >= self.capacity:
+            self.previous = self.current
+            self.current = BloomFilter()
+            self.current_count = 0
+        self.current.add(canonical_problem_key(problem))
+        self.current_count += 1
+
+
+class ProblemHistory:
+    """SQLite-backed store of per-student problem history filters"""
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH):
+        self.path = path
+        # One lock per student with a request in progress; dropped once nobody holds it
+        self._locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+        self._locks_guard = threading.Lock()
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS student_history ("
+                " student_id TEXT PRIMARY KEY,"
+                " current BLOB NOT NULL,"
+                " previous BLOB NOT NULL,"
+                " current_count INTEGER NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+
+    def _lock(self, student_id: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(student_id)
+            if lock is None:
+                lock = self._locks[student_id] = threading.Lock()
+            return lock
+
+    @contextmanager
+    def locked(self, student_ids: Iterable[str]):
+        """
+        Hold students' histories for a load, generate and save cycle.
+
+        Saving replaces the stored filters, so overlapping requests for one
+        student must take turns or one would forget the other's problems.
+        Locks are taken in sorted order, so class requests can't deadlock.
+        """
+        with ExitStack() as stack:
+            for student_id in sorted(set(student_ids)):
+                lock = self._lock(student_id)
+                stack.enter_context(lock)
+            yield
+
+    def load(self, student_id: str) -> StudentHistory:
+        """Load a student's history, or an empty one for a new student"""
+        return self.load_many([student_id])[student_id]
+
+    def load_many(self, student_ids: List[str]) -> Dict[str, StudentHistory]:
+        """Load several students' histories, one query per 900 students"""
+        histories = {sid: StudentHistory(sid) for sid in student_ids}
+        if not histories:
+            return histories
+
+        unique_ids = list(histories)
+        with closing(sqlite3.connect(self.path)) as conn:
+            for start in range(0, len(unique_ids), _MAX_QUERY_PARAMS):
+                chunk = unique_ids[start:start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    "SELECT student_id, current, previous, current_count FROM student_history"
+                    f" WHERE student_id IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for student_id, current, previous, current_count in rows:
+                    histories[student_id] = StudentHistory(student_id, current=current, previous=previous,
+                                                           current_count=current_count)
+        return histories
+
+    def save(self, history: StudentHistory) -> None:
+        """Persist a student's history in a single write"""
+        self.save_many([history])
+
+    def save_many(self, histories: Iterable[StudentHistory]) -> None:
+        """Persist several students' histories in one transaction"""
+        now = time.time()
+        rows = [(h.student_id, bytes(h.current.bits), bytes(h.previous.bits), h.current_count, now)
+                for h in histories]
+        with closing(sqlite3.connect(self.path)) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO student_history"
+                " (student_id, current, previous, current_count, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+
+
+_history_store: Optional[ProblemHistory] = None
+
+
+def get_history_store() -> ProblemHistory:
+    """Return the process-wide history store, creating it on first use"""
+    global _history_store
+    if _history_store is None:
+        _history_store = ProblemHistory()
+    return _history_store
@@ -0,0 +1,159 @@
+# problem_generators/mastery.py
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Optional, List, Iterable, Tuple
+
+from .base import BEGINNER, INTERMEDIATE, ADVANCED
+
+# Default location of the mastery database (overridable per deployment)
+DEFAULT_MASTERY_PATH = os.environ.get("MASTERY_DB", "mastery.db")
+
+# Weight of the newest result in the running mastery score
+SCORE_SMOOTHING = 0.3
+
+# SQLite's default limit on bound parameters per statement is 999
+_MAX_QUERY_PARAMS = 900
+
+_DIFFICULTY_ORDER = [BEGINNER, INTERMEDIATE, ADVANCED]
+
+
+class MasteryStore:
+    """
+    Per-student, per-subcategory mastery scores in SQLite.
+
+    The database runs in WAL mode so readers building worksheets are not
+    blocked by result uploads. Results are written in one transaction per
+    batch, and lookups for a whole class are a single indexed query.
+    """
+
+    def __init__(self, path: str = DEFAULT_MASTERY_PATH):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS mastery ("
+                " student_id TEXT NOT NULL,"
+                " subcategory TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL,"
+                " score REAL NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (student_id, subcategory)"
+                ") WITHOUT ROWID"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record_results(self, results: Iterable[Tuple[str, str, bool]]) -> int:
+        """
+        Record graded results in a single transaction.
+
+        Args:
+            results: (student_id, subcategory, correct) tuples
+
+        Returns:
+            Number of results recorded
+        """
+        now = time.time()
+        rows = [(student_id, subcategory, 1.0 if correct else 0.0, now)
+                for student_id, subcategory, correct in results]
+        if not rows:
+            return 0
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT INTO mastery (student_id, subcategory, attempts, score, updated_at)"
+                " VALUES (?1, ?2, 1, ?3, ?4)"
+                " ON CONFLICT (student_id, subcategory) DO UPDATE SET"
+                f" score = score * {1 - SCORE_SMOOTHING} + excluded.score * {SCORE_SMOOTHING},"
+                " attempts = attempts + 1,"
+                " updated_at = excluded.updated_at",
+                rows
+            )
+        return len(rows)
+
+    def get_mastery(self, student_ids: List[str]) -> Dict[str, Dict[str, Tuple[int, float]]]:
+        """
+        Look up mastery for many students at once.
+
+        Returns:
+            {student_id: {subcategory: (attempts, score)}}; students with no
+            results map to an empty dict
+        """
+        mastery: Dict[str, Dict[str, Tuple[int, float]]] = {sid: {} for sid in student_ids}
+        unique_ids = list(mastery)
+
+        with closing(self._connect()) as conn:
+            for start in range(0, len(unique_ids), _MAX_QUERY_PARAMS):
+                chunk = unique_ids[start:start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    "SELECT student_id, subcategory, attempts, score FROM mastery"
+                    f" WHERE student_id IN ({placeholders})",
+                    chunk
+                )
+                for student_id, subcategory, attempts, score in rows:
+                    mastery[student_id][subcategory] = (attempts, score)
+        return mastery
+
+
+class AdaptivePlan:
+    """Per-subcategory difficulty and extra review picks for one student's worksheet"""
+
+    # A subcategory needs this many attempts before its score is trusted
+    MIN_ATTEMPTS = 3
+    # Below this score the student steps down a level and gets extra review
+    STRUGGLING = 0.6
+    # At or above this score the student steps up a level
+    MASTERED = 0.9
+    # Most extra review problems added to a spiral worksheet
+    MAX_REVIEW = 3
+
+    def __init__(self, records: Dict[str, Tuple[int, float]], base_difficulty: str):
+        self.records = records
+        self.base_difficulty = base_difficulty
+
+    def difficulty_for(self, subcategory: str, levels: Optional[Iterable[str]] = None) -> str:
+        """
+        Difficulty to use for a subcategory, shifted one level from the base by mastery.
+
+        `levels` are the difficulties whose generator offers the subcategory;
+        a shift to any other level is dropped and the base difficulty kept.
+        """
+        attempts, score = self.records.get(subcategory, (0, 0.0))
+        level = _DIFFICULTY_ORDER.index(self.base_difficulty)
+        if attempts >= self.MIN_ATTEMPTS:
+            if score < self.STRUGGLING:
+                level = max(level - 1, 0)
+            elif score >= self.MASTERED:
+                level = min(level + 1, len(_DIFFICULTY_ORDER) - 1)
+        difficulty = _DIFFICULTY_ORDER[level]
+        if levels is not None and difficulty not in levels:
+            return self.base_difficulty
+        return difficulty
+
+    def review_subcategories(self, subcategories: List[str]) -> List[str]:
+        """The weakest of the given subcategories that deserve a second problem"""
+        weak = [
+            sub for sub in subcategories
+            if self.records.get(sub, (0, 1.0))[0] >= self.MIN_ATTEMPTS
+            and self.records[sub][1] < self.STRUGGLING
+        ]
+        weak.sort(key=lambda sub: self.records[sub][1])
+        return weak[:self.MAX_REVIEW]
+
+
+_mastery_store: Optional[MasteryStore] = None
+
+
+def get_mastery_store() -> MasteryStore:
+    """Return the process-wide mastery store, creating it on first use"""
+    global _mastery_store
+    if _mastery_store is None:
+        _mastery_store = MasteryStore()
+    return _mastery_store
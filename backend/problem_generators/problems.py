@@ -1,10 +1,10 @@
 # problem_generators/problems.py
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import random
-import json
-import os
-import logging
+import threading
+import itertools
+import time
 
 # Import problem generators
 from .addition import AdditionProblemGenerator
@@ -21,6 +21,12 @@ from .measurement import MeasurementProblemGenerator
 from .patterns import PatternsProblemGenerator
 from .graphing import GraphingProblemGenerator
 from .odd_even import OddEvenProblemGenerator
+from .history import StudentHistory, get_history_store
+from .mastery import AdaptivePlan, get_mastery_store
+
+# How many times to redraw a problem the student has recently seen before
+# accepting a repeat (small subcategories can run out of fresh problems)
+_MAX_HISTORY_RETRIES = 5
 
 # Create instances of all problem generators
 _generators = {
@@ -60,6 +66,7 @@ _subconcept_to_category = {
     "subtract_one": "subtraction",
     "same_number_subtraction": "subtraction",
     "near_doubles_subtraction": "subtraction",
+    "subtract_no_regrouping": "subtraction",
     
     # Time Telling
     "whole_hours": "time_telling",
@@ -231,31 +238,81 @@ _subconcept_to_category = {
     
 #     return all_problems
 
-def generate_problems(
+def expand_concepts(concepts: List[str]) -> List[str]:
+    """
+    Expand category names (like "addition") into their subcategories.
+    
+    Unknown concepts are dropped and duplicates removed, keeping first-seen order.
+    """
+    expanded = []
+    for concept in concepts:
+        if concept in _generators:
+            subcategories = [subcat for subcat, cat in _subconcept_to_category.items() if cat == concept]
+        elif concept in _subconcept_to_category:
+            subcategories = [concept]
+        else:
+            subcategories = []
+        expanded.extend(sub for sub in subcategories if sub not in expanded)
+    return expanded
+
+def concept_category(concept: str) -> Optional[str]:
+    """The category a concept belongs to (a category maps to itself), or None if unknown"""
+    if concept in _generators:
+        return concept
+    return _subconcept_to_category.get(concept)
+
+def _difficulties_offering(generator, subcategory: str) -> List[str]:
+    """Difficulties at which a generator makes `subcategory` problems"""
+    subcategories = generator.subcategories
+    if not isinstance(subcategories, dict):
+        # One list shared by every difficulty
+        return list(generator.number_ranges) if subcategory in subcategories else []
+    return [difficulty for difficulty, subs in subcategories.items() if subcategory in subs]
+
+def _generate_fresh_problem(generator, number_range: str, subcategory: str,
+                            history: Optional[StudentHistory]) -> Dict[str, Any]:
+    """Generate a problem, redrawing a bounded number of times if the student saw it recently"""
+    problem = generator.generate_problem(number_range, subcategory)
+    if history is not None:
+        for _ in range(_MAX_HISTORY_RETRIES):
+            if not history.seen(problem):
+                break
+            problem = generator.generate_problem(number_range, subcategory)
+        history.add(problem)
+    return problem
+
+def _iter_worksheet_problems(
     worksheet_type: str,
     number_range: str,
     concepts: List[str],
-    problem_count: Optional[int] = None
-) -> List[Dict[str, Any]]:
-    """
-    Generate problems for a worksheet based on specified parameters.
+    problem_count: Optional[int],
+    history: Optional[StudentHistory],
+    plan: Optional[AdaptivePlan]
+) -> Iterator[Dict[str, Any]]:
+    """Yield one worksheet's problems in order, using a student's history and adaptive plan if given"""
+    def difficulty_for(generator, subcategory: str) -> str:
+        if not plan:
+            return number_range
+        # Only shift to levels that still make this subcategory's problems
+        return plan.difficulty_for(subcategory, _difficulties_offering(generator, subcategory))
     
-    Args:
-        worksheet_type: "spiral" or "fluency"
-        number_range: "beginner", "intermediate", or "advanced"
-        concepts: List of concept identifiers
-        problem_count: Number of problems for fluency worksheets (default: 15)
+    def make_problem(generator, category: str, subcategory: str) -> Optional[Dict[str, Any]]:
+        try:
+            problem = _generate_fresh_problem(generator, difficulty_for(generator, subcategory), subcategory, history)
+        except Exception as e:
+            print(f"Error generating {subcategory} problem: {str(e)}")
+            return None
         
-    Returns:
-        List of problem dictionaries containing question, answer, and display info
-    """
-    all_problems = []
+        # Add metadata to the problem
+        problem["category"] = category
+        problem["subcategory"] = subcategory
+        return problem
     
     # For fluency sheets: single concept, multiple problems
     if worksheet_type == "fluency":
         # Make sure we have at least one concept
         if not concepts:
-            return []
+            return
             
         # Get the first concept (fluency focuses on one concept)
         concept = concepts[0]
@@ -263,107 +320,266 @@ def generate_problems(
         # Determine which category this concept belongs to
         category = _subconcept_to_category.get(concept)
         if not category:
-            return []
+            return
         
         # Get the corresponding problem generator
         generator = _generators.get(category)
         if not generator:
-            return []
+            return
         
         # Generate multiple problems of the same concept
         count = problem_count if problem_count is not None else 15
         
         for _ in range(count):
-            try:
-                # Generate a problem with the specified subcategory
-                problem = generator.generate_problem(number_range, concept)
-                
-                # Add metadata to the problem
-                problem["category"] = category
-                problem["subcategory"] = concept
-                
-                all_problems.append(problem)
-            except Exception as e:
-                print(f"Error generating {concept} problem: {str(e)}")
+            problem = make_problem(generator, category, concept)
+            if problem is not None:
+                yield problem
     
     # For spiral review: multiple concepts, one problem each
     else:  # worksheet_type == "spiral"
-        # Track subcategories we've already generated
-        used_subcategories = set()
+        # Track subcategories we've already generated, in worksheet order
+        used_subcategories = []
         
         for concept in concepts:
             # Check if this is a category name instead of a subcategory
             if concept in _generators:
                 # This is a main category (like "addition"), generate one problem for each subcategory
                 category = concept
-                generator = _generators[category]
-                
-                # Find all subcategories for this category
                 subcategories = [subcat for subcat, cat in _subconcept_to_category.items() if cat == category]
-                
-                # Generate one problem for each subcategory
-                for subcategory in subcategories:
-                    if subcategory not in used_subcategories:  # Avoid duplicates
-                        try:
-                            problem = generator.generate_problem(number_range, subcategory)
-                            problem["category"] = category
-                            problem["subcategory"] = subcategory
-                            all_problems.append(problem)
-                            used_subcategories.add(subcategory)
-                        except Exception as e:
-                            print(f"Error generating {subcategory} problem: {str(e)}")
             else:
                 # This is a specific subcategory (like "add_one")
                 category = _subconcept_to_category.get(concept)
-                if not category:
-                    continue
-                
-                # Get the generator for this category
-                generator = _generators.get(category)
-                if not generator:
-                    continue
-                
-                if concept not in used_subcategories:  # Avoid duplicates
-                    try:
-                        # Generate one problem of this concept
-                        problem = generator.generate_problem(number_range, concept)
-                        
-                        # Add metadata to the problem
-                        problem["category"] = category
-                        problem["subcategory"] = concept
-                        
-                        all_problems.append(problem)
-                        used_subcategories.add(concept)
-                    except Exception as e:
-                        print(f"Error generating {concept} problem: {str(e)}")
+                subcategories = [concept]
+            
+            generator = _generators.get(category)
+            if not generator:
+                continue
+            
+            for subcategory in subcategories:
+                if subcategory not in used_subcategories:  # Avoid duplicates
+                    problem = make_problem(generator, category, subcategory)
+                    if problem is not None:
+                        used_subcategories.append(subcategory)
+                        yield problem
+        
+        # Adaptive worksheets get a second problem for the weakest concepts
+        if plan:
+            for subcategory in plan.review_subcategories(used_subcategories):
+                category = _subconcept_to_category[subcategory]
+                problem = make_problem(_generators[category], category, subcategory)
+                if problem is not None:
+                    yield problem
+
+def _generate_worksheet_problems(
+    worksheet_type: str,
+    number_range: str,
+    concepts: List[str],
+    problem_count: Optional[int],
+    history: Optional[StudentHistory],
+    plan: Optional[AdaptivePlan]
+) -> List[Dict[str, Any]]:
+    """Generate one worksheet's problems, using a student's history and adaptive plan if given"""
+    all_problems = list(_iter_worksheet_problems(
+        worksheet_type, number_range, concepts, problem_count, history, plan))
 
     print(f"Generated {len(all_problems)} problems:")
     for i, problem in enumerate(all_problems):
         print(f"  Problem {i+1}: {problem.get('category', 'unknown')} - {problem.get('subcategory', 'unknown')}")
     
-    # Save problems to a single JSON file in the backend/problem_generators folder
-    try:
-        # Create the directory path if it doesn't exist
-        os.makedirs("backend/problem_generators", exist_ok=True)
+    return all_problems
+
+# Generators draw from the shared `random` module, so in-process generation is
+# serialized; otherwise a concurrent build could consume a seeded build's numbers
+_random_lock = threading.Lock()
+
+def generate_problems(
+    worksheet_type: str,
+    number_range: str,
+    concepts: List[str],
+    problem_count: Optional[int] = None,
+    student_id: Optional[str] = None,
+    adaptive: bool = False,
+    seed: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Generate problems for a worksheet based on specified parameters.
+    
+    Args:
+        worksheet_type: "spiral" or "fluency"
+        number_range: "beginner", "intermediate", or "advanced"
+        concepts: List of concept identifiers
+        problem_count: Number of problems for fluency worksheets (default: 15)
+        student_id: Optional student identifier; when given, problems the
+            student has seen recently are skipped where possible
+        adaptive: Adjust difficulty and review mix to the student's mastery
+            (requires student_id)
+        seed: Optional seed; the same settings, seed and student history
+            always produce the same problems
         
-        # Use a fixed filename for all problem sets
-        filepath = "backend/problem_generators/generated_problems.json"
+    Returns:
+        List of problem dictionaries containing question, answer, and display info
+    """
+    history_store = get_history_store()
+    with history_store.locked([student_id] if student_id else []):
+        history = history_store.load(student_id) if student_id else None
+        plan = None
+        if adaptive and student_id:
+            records = get_mastery_store().get_mastery([student_id])[student_id]
+            plan = AdaptivePlan(records, number_range)
         
-        # Save the problems to the JSON file (overwriting any existing file)
-        with open(filepath, "w") as f:
-            json.dump(all_problems, f, indent=2)
-        print(f"\nDetailed problems saved to {filepath}")
+        with _random_lock:
+            # A seeded sheet leaves the shared generator as it found it
+            state = random.getstate() if seed is not None else None
+            if seed is not None:
+                random.seed(seed)
+            try:
+                all_problems = _generate_worksheet_problems(
+                    worksheet_type, number_range, concepts, problem_count, history, plan)
+            finally:
+                if state is not None:
+                    random.setstate(state)
         
-        # If logging is configured, log the save action
-        try:
-            logging.info(f"Detailed problems saved to {filepath}")
-        except:
-            pass  # Skip logging if it's not configured
-    except Exception as e:
-        print(f"Error saving problems to JSON: {e}")
-        try:
-            logging.error(f"Error saving problems to JSON: {e}")
-        except:
-            pass  # Skip logging if it's not configured
+        if history is not None:
+            history_store.save(history)
+    
+    return all_problems
+
+def iter_problems(
+    worksheet_type: str,
+    number_range: str,
+    concepts: List[str],
+    problem_count: Optional[int] = None,
+    student_id: Optional[str] = None,
+    adaptive: bool = False,
+    seed: Optional[int] = None,
+    chunk_size: int = 100,
+    save_history: bool = True
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield a worksheet's problems one at a time, for streaming exports.
+    
+    Takes the same settings as generate_problems and, for the same seed,
+    yields the same problems. Problems are generated `chunk_size` at a time
+    under the generation lock, which is handed on between chunks, so a long
+    stream never blocks other builds; a seeded stream carries its own random
+    state from chunk to chunk.
+    Memory stays flat however many problems are requested. The student's
+    history is saved
+    once the stream has been read to the end, their other requests waiting
+    until then (unless save_history is False, as for previews, so the
+    confirmed sheet repeats the same problems).
+    """
+    history_store = get_history_store()
+    # Previews don't save, so they needn't wait for the student's other requests
+    with history_store.locked([student_id] if student_id and save_history else []):
+        history = history_store.load(student_id) if student_id else None
+        plan = None
+        if adaptive and student_id:
+            records = get_mastery_store().get_mastery([student_id])[student_id]
+            plan = AdaptivePlan(records, number_range)
+    
+        problems = _iter_worksheet_problems(
+            worksheet_type, number_range, concepts, problem_count, history, plan)
+    
+        stream_state = None
+        if seed is not None:
+            stream_state = random.Random(seed).getstate()
+    
+        while True:
+            with _random_lock:
+                if stream_state is not None:
+                    shared_state = random.getstate()
+                    random.setstate(stream_state)
+                try:
+                    chunk = list(itertools.islice(problems, chunk_size))
+                finally:
+                    if stream_state is not None:
+                        stream_state = random.getstate()
+                        random.setstate(shared_state)
+            if len(chunk) == chunk_size:
+                # Threading locks aren't fair: yield so a waiting build can take
+                # the lock before this stream asks for its next chunk
+                time.sleep(0)
+            yield from chunk
+            if len(chunk) < chunk_size:
+                break
+    
+        if history is not None and save_history:
+            history_store.save(history)
+
+def generate_class_problems(
+    worksheet_type: str,
+    number_range: str,
+    concepts: List[str],
+    student_ids: List[str],
+    problem_count: Optional[int] = None,
+    adaptive: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate one worksheet's problems for each student in a class.
     
+    Mastery and history for the whole class are read with one query each
+    and histories are written back in a single transaction, so the number of
+    database round trips does not grow with class size or problem count.
+    
+    Args:
+        worksheet_type: "spiral" or "fluency"
+        number_range: Base difficulty ("beginner", "intermediate", or "advanced")
+        concepts: List of concept identifiers
+        student_ids: Students to build worksheets for
+        problem_count: Number of problems for fluency worksheets (default: 15)
+        adaptive: Adjust each student's worksheet to their mastery
+        
+    Returns:
+        Mapping of student_id to that student's list of problems
+    """
+    if len(set(student_ids)) != len(student_ids):
+        raise ValueError("Duplicate student IDs; each student gets one worksheet")
+    
+    history_store = get_history_store()
+    with history_store.locked(student_ids):
+        histories = history_store.load_many(student_ids)
+        mastery = get_mastery_store().get_mastery(student_ids) if adaptive else {}
+        
+        worksheets = {}
+        with _random_lock:
+            for student_id in student_ids:
+                plan = AdaptivePlan(mastery[student_id], number_range) if adaptive else None
+                worksheets[student_id] = _generate_worksheet_problems(
+                    worksheet_type, number_range, concepts, problem_count, histories[student_id], plan)
+        
+        history_store.save_many(histories.values())
+    return worksheets
+
+def generate_mixed_problems(
+    number_range: str,
+    concept_counts: List[Tuple[str, int]],
+    student_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Generate a worksheet with a chosen number of problems per subcategory.
+    
+    Used for scheduled spiral review, where a concept's weight on a given day
+    decides how many of its problems appear.
+    
+    Args:
+        number_range: "beginner", "intermediate", or "advanced"
+        concept_counts: (subcategory, count) pairs in worksheet order
+        student_id: Optional student identifier for skipping recently seen problems
+        
+    Returns:
+        List of problem dictionaries containing question, answer, and display info
+    """
+    history_store = get_history_store()
+    with history_store.locked([student_id] if student_id else []):
+        history = history_store.load(student_id) if student_id else None
+        
+        all_problems = []
+        with _random_lock:
+            for concept, count in concept_counts:
+                all_problems.extend(_generate_worksheet_problems(
+                    "fluency", number_range, [concept], count, history, None))
+        
+        if history is not None:
+            history_store.save(history)
     return all_problems
\ No newline at end of file
@@ -3,6 +3,7 @@
 import random
 from typing import Dict, Any, Optional, List
 from .base import BaseProblemGenerator, BEGINNER, INTERMEDIATE, ADVANCED
+from .constraints import ProblemFamily, Slot, place_value_family
 
 class SubtractionProblemGenerator(BaseProblemGenerator):
     """Generator for subtraction problems"""
@@ -11,7 +12,21 @@ class SubtractionProblemGenerator(BaseProblemGenerator):
         super().__init__()
         
         # Single list of all available subcategories (including the new random numbers category)
-        self.subcategories = ["subtract_zero", "subtract_one", "same_number_subtraction", "near_doubles_subtraction", "subtract_random_numbers"]
+        self.subcategories = ["subtract_zero", "subtract_one", "same_number_subtraction", "near_doubles_subtraction", "subtract_random_numbers", "subtract_no_regrouping"]
+        
+        # Operand families sampled by range narrowing (second number never exceeds the first)
+        self.random_number_families = {
+            BEGINNER: ProblemFamily([Slot("first_number", 1, 20), Slot("second_number", 0, "first_number")]),
+            INTERMEDIATE: ProblemFamily([Slot("first_number", 10, 100), Slot("second_number", 0, "first_number")]),
+            ADVANCED: ProblemFamily([Slot("first_number", 100, 999), Slot("second_number", 0, "first_number")])
+        }
+        
+        # No-borrow families: 1, 2 or 3 digits, every column of the second number <= the first
+        self.no_regrouping_families = {
+            BEGINNER: place_value_family(1, "subtraction", regroup=False),
+            INTERMEDIATE: place_value_family(2, "subtraction", regroup=False),
+            ADVANCED: place_value_family(3, "subtraction", regroup=False)
+        }
     
     def generate_problem(self, difficulty: str, subcategory: Optional[str] = None) -> Dict[str, Any]:
         """Generate a subtraction problem for the given difficulty and subcategory"""
@@ -34,6 +49,8 @@ class SubtractionProblemGenerator(BaseProblemGenerator):
             return self._generate_near_doubles_problem(difficulty)
         elif selected_subcategory == "subtract_random_numbers":
             return self._generate_random_numbers_problem(difficulty)
+        elif selected_subcategory == "subtract_no_regrouping":
+            return self._generate_no_regrouping_problem(difficulty)
         else:
             raise ValueError(f"Unsupported subtraction subcategory: {selected_subcategory}")
     
@@ -98,21 +115,23 @@ class SubtractionProblemGenerator(BaseProblemGenerator):
     def _generate_random_numbers_problem(self, difficulty: str) -> Dict[str, Any]:
         """Generate a subtraction problem with two random numbers within the difficulty range,
         ensuring the result is a positive number"""
-        if difficulty == BEGINNER:
-            # For beginner, use numbers 0-20
-            num1 = random.randint(1, 20)
-            # Ensure num2 is less than or equal to num1
-            num2 = random.randint(0, num1)
-        elif difficulty == INTERMEDIATE:
-            # For intermediate, use numbers 10-100
-            num1 = random.randint(10, 100)
-            # Ensure num2 is less than or equal to num1
-            num2 = random.randint(0, num1)
-        else:  # ADVANCED
-            # For advanced, use numbers 100-999
-            num1 = random.randint(100, 999)
-            # Ensure num2 is less than or equal to num1
-            num2 = random.randint(0, num1)
+        values = self.random_number_families[difficulty].sample()
+        num1 = values["first_number"]
+        num2 = values["second_number"]
+        
+        return {
+            "first_number": num1,
+            "second_number": num2,
+            "answer": str(num1 - num2),
+            "type": "subtraction",
+            "display_type": "vertical"
+        }
+    
+    def _generate_no_regrouping_problem(self, difficulty: str) -> Dict[str, Any]:
+        """Generate a subtraction problem that needs no borrowing in any column"""
+        values = self.no_regrouping_families[difficulty].sample()
+        num1 = values["first_number"]
+        num2 = values["second_number"]
         
         return {
             "first_number": num1,
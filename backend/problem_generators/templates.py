@@ -0,0 +1,99 @@
+# problem_generators/templates.py
+
+import json
+import os
+import random
+import string
+from typing import Dict, Any, List, Tuple
+
+from .constraints import ProblemFamily, Slot, compile_expression
+
+# Default catalog shipped next to the generators
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "word_problem_templates.json")
+
+
+class CompiledTemplate:
+    """
+    A word-problem template compiled for fast rendering.
+
+    Slot ranges and the answer expression are compiled once when the catalog
+    is loaded; producing a problem is one family sample plus a single
+    format call on the sentence text.
+    """
+
+    def __init__(self, template_id: str, steps: int, operation: str, text: str,
+                 answer: Any, families: Dict[str, ProblemFamily]):
+        self.id = template_id
+        self.steps = steps
+        self.operation = operation
+        self.families = families
+        self._format = text.format_map
+        self._answer = compile_expression(answer, f"{template_id}.answer")
+
+    def generate(self, difficulty: str, rng=random) -> Tuple[str, Any]:
+        """Render the template for a difficulty level, returning (text, answer)."""
+        values = self.families[difficulty].sample(rng)
+        return self._format(values), self._answer(values)
+
+
+class TemplateCatalog:
+    """Word-problem templates indexed by step count, operation and difficulty"""
+
+    def __init__(self, data: Dict[str, Any]):
+        pools = data.get("pools", {})
+        self._index: Dict[Tuple[int, str, str], List[CompiledTemplate]] = {}
+        self._operations: Dict[Tuple[int, str], List[str]] = {}
+
+        for raw in data.get("templates", []):
+            template = self._compile(raw, pools)
+            for difficulty in template.families:
+                key = (template.steps, template.operation, difficulty)
+                if key not in self._index:
+                    self._operations.setdefault((template.steps, difficulty), []).append(template.operation)
+                self._index.setdefault(key, []).append(template)
+
+    @staticmethod
+    def _compile(raw: Dict[str, Any], pools: Dict[str, List[str]]) -> CompiledTemplate:
+        """Compile one catalog entry, validating that the text only uses declared slots"""
+        template_id = raw["id"]
+
+        shared = []
+        for spec in raw.get("slots", []):
+            if spec["pool"] not in pools:
+                raise ValueError(f"Template '{template_id}' uses unknown pool '{spec['pool']}'")
+            shared.append(Slot(spec["name"], choices=pools[spec["pool"]],
+                               distinct_from=spec.get("distinct_from", ())))
+
+        families = {}
+        slot_names = set()
+        for difficulty, quantities in raw["quantities"].items():
+            slots = shared + [Slot(q["name"], q["low"], q["high"]) for q in quantities]
+            families[difficulty] = ProblemFamily(slots)
+            slot_names.update(slot.name for slot in slots)
+
+        fields = {field for _, field, _, _ in string.Formatter().parse(raw["text"]) if field}
+        missing = fields - slot_names
+        if missing:
+            raise ValueError(f"Template '{template_id}' references undeclared slots: {sorted(missing)}")
+
+        return CompiledTemplate(template_id, raw["steps"], raw["operation"],
+                                raw["text"], raw["answer"], families)
+
+    def operations(self, steps: int, difficulty: str) -> List[str]:
+        """Operations that have at least one template for the given steps and difficulty"""
+        return self._operations.get((steps, difficulty), [])
+
+    def templates(self, steps: int, operation: str, difficulty: str) -> List[CompiledTemplate]:
+        """Templates for the given steps, operation and difficulty"""
+        return self._index.get((steps, operation, difficulty), [])
+
+
+_catalogs: Dict[str, TemplateCatalog] = {}
+
+
+def load_catalog(path: str = CATALOG_PATH) -> TemplateCatalog:
+    """Load and compile a template catalog, caching it per path"""
+    if path not in _catalogs:
+        with open(path) as f:
+            _catalogs[path] = TemplateCatalog(json.load(f))
+    return _catalogs[path]
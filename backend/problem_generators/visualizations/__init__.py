@@ -0,0 +1,4 @@
+# Problem Visualizations Module
+#
+# ReportLab drawings for generators' generate_visualization. Generators import
+# these modules on demand so generating problems never loads ReportLab.
\ No newline at end of file
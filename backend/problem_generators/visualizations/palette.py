@@ -0,0 +1,14 @@
+# problem_generators/visualizations/palette.py
+
+from reportlab.lib import colors
+
+# Kid-friendly colors for visualizations
+KID_COLORS = [
+    colors.HexColor('#FF9AA2'),  # soft red
+    colors.HexColor('#FFB7B2'),  # salmon
+    colors.HexColor('#FFDAC1'),  # peach
+    colors.HexColor('#E2F0CB'),  # light green
+    colors.HexColor('#B5EAD7'),  # mint
+    colors.HexColor('#C7CEEA'),  # lavender
+    colors.HexColor('#9ADCFF'),  # light blue
+]
\ No newline at end of file
@@ -0,0 +1,5 @@
+# Profiling Module
+
+from .memory import (
+    PROFILE_HEADER, should_profile, memory_profile, profile_stage, note, memory_metrics,
+)
\ No newline at end of file
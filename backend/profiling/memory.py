@@ -0,0 +1,215 @@
+# profiling/memory.py
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import random
+import threading
+import tracemalloc
+from collections import deque
+from typing import Dict, Any, Optional, List
+
+# Request header that forces profiling on ("1") or off ("0") for one request
+PROFILE_HEADER = "x-memory-profile"
+
+# MEMORY_PROFILE=1 profiles a sample of requests (MEMORY_PROFILE_RATE, default
+# 5%). Tracing slows a PDF build several times over (and every request running
+# alongside it), so keep the rate low in production and use the header for
+# one-off investigations.
+ENABLED = os.environ.get("MEMORY_PROFILE") == "1"
+SAMPLE_RATE = float(os.environ.get("MEMORY_PROFILE_RATE", "0.05")) if ENABLED else 0.0
+
+# Allocation sites reported per stage, and stack frames kept per allocation
+TOP_SITES = int(os.environ.get("MEMORY_PROFILE_TOP", "5"))
+TRACE_FRAMES = 1
+
+logger = logging.getLogger("k2.memory")
+
+_active: contextvars.ContextVar = contextvars.ContextVar("memory_profile", default=None)
+
+# tracemalloc is process-wide: it traces (and slows) every thread, so while a
+# profile runs, concurrent requests' allocations land in its numbers. Only one
+# request is profiled at a time, sampled profiles only start when no other
+# request is in flight, and a profile another request overlaps is flagged and
+# left out of the per-stage metrics.
+_profiling = threading.Lock()
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+_running: Optional["MemoryProfile"] = None
+
+_recent: deque = deque(maxlen=50)
+_stage_totals: Dict[str, Dict[str, float]] = {}
+_overlapped = {"count": 0}
+_totals_lock = threading.Lock()
+
+_IGNORE_SELF = [tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__)]
+
+
+class MemoryProfile:
+    """Per-stage tracemalloc measurements for one request"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.stages: List[Dict[str, Any]] = []
+        self.notes: Dict[str, Any] = {}
+        self.peak_bytes = 0
+        # Set when another request ran during the profile, whose allocations it includes
+        self.overlapped = False
+        self._stack: List[Dict[str, Any]] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "peak_kb": round(self.peak_bytes / 1024, 1),
+            "overlapped": self.overlapped,
+            "stages": self.stages,
+            "notes": self.notes,
+        }
+
+
+def should_profile(header_value: Optional[str] = None) -> bool:
+    """Whether to profile a request, given its PROFILE_HEADER value (if any)"""
+    if header_value is not None:
+        return header_value.strip().lower() in ("1", "true", "yes", "on")
+    return SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE
+
+
+@contextlib.contextmanager
+def memory_profile(label: str, enabled: bool = True, forced: bool = False):
+    """
+    Wrap one request, tracing its allocations if it is profiled, and publish the result.
+
+    Every request passes through here so overlap can be detected. Yields
+    the MemoryProfile, or None when profiling is disabled, another profile
+    is already running, or (unless `forced`, as by the request header)
+    other requests are in flight. When done, the profile is logged as one
+    JSON line and, unless another request overlapped it, folded into the
+    per-stage metrics.
+    """
+    global _in_flight, _running
+    with _in_flight_lock:
+        _in_flight += 1
+        alone = _in_flight == 1
+        if _running is not None:
+            _running.overlapped = True
+    try:
+        if not enabled or not (alone or forced) or not _profiling.acquire(blocking=False):
+            yield None
+            return
+
+        profile = MemoryProfile(label)
+        with _in_flight_lock:
+            profile.overlapped = _in_flight > 1
+            _running = profile
+        token = _active.set(profile)
+        tracemalloc.start(TRACE_FRAMES)
+        try:
+            yield profile
+        finally:
+            profile.peak_bytes = max(profile.peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            with _in_flight_lock:
+                _running = None
+            _active.reset(token)
+            _profiling.release()
+            _publish(profile)
+    finally:
+        with _in_flight_lock:
+            _in_flight -= 1
+
+
+def _top_sites(before, after) -> List[Dict[str, Any]]:
+    stats = after.filter_traces(_IGNORE_SELF).compare_to(before.filter_traces(_IGNORE_SELF), "lineno")
+    grown = sorted((stat for stat in stats if stat.size_diff > 0), key=lambda stat: -stat.size_diff)
+    sites = []
+    for stat in grown[:TOP_SITES]:
+        frame = stat.traceback[0]
+        path = os.path.join(*frame.filename.split(os.sep)[-2:])
+        sites.append({"site": f"{path}:{frame.lineno}",
+                      "size_kb": round(stat.size_diff / 1024, 1),
+                      "count": stat.count_diff})
+    return sites
+
+
+@contextlib.contextmanager
+def profile_stage(name: str):
+    """
+    Measure one stage of the active profile; a no-op when nothing is profiled.
+
+    Records the stage's peak traced memory above what was live when it
+    started, the memory it left allocated, and the sites whose live
+    allocations grew most over the stage. Stages may nest.
+    """
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+
+    before = tracemalloc.take_snapshot()
+    start, outer_peak = tracemalloc.get_traced_memory()
+    profile.peak_bytes = max(profile.peak_bytes, outer_peak)
+    frame = {"peak": 0}
+    profile._stack.append(frame)
+    tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, frame["peak"])
+        profile._stack.pop()
+        # reset_peak() above hid the enclosing stage's peak; hand ours back up
+        if profile._stack:
+            profile._stack[-1]["peak"] = max(profile._stack[-1]["peak"], peak)
+        profile.peak_bytes = max(profile.peak_bytes, peak)
+
+        profile.stages.append({
+            "stage": name,
+            "peak_kb": round((peak - start) / 1024, 1),
+            "retained_kb": round((current - start) / 1024, 1),
+            "top_sites": _top_sites(before, tracemalloc.take_snapshot()),
+        })
+
+
+def note(key: str, value: Any) -> None:
+    """Attach a value (e.g. output size) to the active profile, if any"""
+    profile = _active.get()
+    if profile is not None:
+        profile.notes[key] = value
+
+
+def _publish(profile: MemoryProfile) -> None:
+    data = profile.to_dict()
+    logger.info("memory profile %s", json.dumps(data))
+    _recent.append(data)
+    with _totals_lock:
+        if profile.overlapped:
+            _overlapped["count"] += 1
+            return
+        for stage in profile.stages:
+            totals = _stage_totals.setdefault(stage["stage"], {"count": 0, "total_peak_kb": 0.0, "max_peak_kb": 0.0})
+            totals["count"] += 1
+            totals["total_peak_kb"] += stage["peak_kb"]
+            totals["max_peak_kb"] = max(totals["max_peak_kb"], stage["peak_kb"])
+
+
+def memory_metrics() -> Dict[str, Any]:
+    """
+    Aggregated per-stage peaks and the most recent profiles.
+
+    Stage peaks come only from profiles no other request overlapped;
+    overlapped profiles are counted and still listed in `recent` (flagged),
+    as their numbers include the other requests' allocations.
+    """
+    with _totals_lock:
+        stages = {
+            name: {"count": t["count"],
+                   "mean_peak_kb": round(t["total_peak_kb"] / t["count"], 1),
+                   "max_peak_kb": t["max_peak_kb"]}
+            for name, t in _stage_totals.items()
+        }
+        overlapped = _overlapped["count"]
+    return {"sample_rate": SAMPLE_RATE, "stages": stages, "overlapped_profiles": overlapped,
+            "recent": list(_recent)}
\ No newline at end of file
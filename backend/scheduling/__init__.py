@@ -0,0 +1,4 @@
+# Spiral Scheduling Module
+
+from .planner import SpiralScheduler, DayPlan
+from .builder import build_semester
@@ -0,0 +1,120 @@
+# scheduling/builder.py
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, Callable
+
+from problem_generators.problems import generate_mixed_problems
+
+from .planner import DayPlan
+
+
+def day_cache_key(day_plan: DayPlan, number_range: str, include_answer_key: bool) -> str:
+    """Short hash of everything that determines a day's worksheet"""
+    spec = {
+        "date": day_plan.day.isoformat(),
+        "concepts": day_plan.concepts,
+        "number_range": number_range,
+        "include_answer_key": include_answer_key,
+    }
+    encoded = json.dumps(spec, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _render_day(problems: List[Dict[str, Any]], number_range: str, concepts: List[str],
+                output_path: str, include_answer_key: bool) -> str:
+    """Render one day's worksheet (runs in a worker process)"""
+    from pdf_reporting.pdf_generator import create_worksheet_pdf
+    from pdf_reporting.thumbnail import thumbnail_source
+    from downloads import save_thumbnail_source
+
+    # Write to a temporary name first so an interrupted build never leaves a
+    # partial file that looks like a cached result
+    tmp_path = output_path + ".tmp"
+    create_worksheet_pdf(
+        problems=problems,
+        worksheet_type="spiral",
+        number_range=number_range,
+        concepts=concepts,
+        output_path=tmp_path,
+        include_answer_key=include_answer_key
+    )
+    os.replace(tmp_path, output_path)
+    save_thumbnail_source(output_path, thumbnail_source(problems, "spiral", number_range))
+    return output_path
+
+
+def build_semester(
+    days: List[DayPlan],
+    number_range: str,
+    output_dir: str,
+    include_answer_key: bool = False,
+    max_workers: Optional[int] = None,
+    on_day_done: Optional[Callable[[str, str], None]] = None
+) -> Dict[str, str]:
+    """
+    Build every day's worksheet for a planned term.
+
+    Problems for all days are generated first (cheap, single process), then
+    the PDFs are rendered in parallel across worker processes. Each day's
+    file name includes a hash of its plan, so days that were already built
+    are reused and an interrupted build picks up where it stopped.
+
+    Args:
+        days: The term plan from SpiralScheduler.plan()
+        number_range: "beginner", "intermediate", or "advanced"
+        output_dir: Directory for the PDFs
+        include_answer_key: Whether each worksheet gets an answer key page
+        max_workers: Render processes (default: one per CPU)
+        on_day_done: Called with (ISO date, file name) as each day completes
+
+    Returns:
+        Mapping of ISO date to PDF file name (relative to output_dir)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    results: Dict[str, str] = {}
+
+    def done(iso_date: str, filename: str):
+        results[iso_date] = filename
+        if on_day_done:
+            on_day_done(iso_date, filename)
+
+    # ── Phase 1: problems for every day that still needs building ────────────
+    pending = []
+    for day_plan in days:
+        iso_date = day_plan.day.isoformat()
+        filename = f"semester_{iso_date}_{day_cache_key(day_plan, number_range, include_answer_key)}.pdf"
+        if os.path.exists(os.path.join(output_dir, filename)):
+            done(iso_date, filename)
+            continue
+
+        problems = generate_mixed_problems(number_range, day_plan.concepts)
+        concepts = [concept for concept, _ in day_plan.concepts]
+        pending.append((iso_date, filename, problems, concepts))
+
+    # ── Phase 2: render in parallel ──────────────────────────────────────────
+    if pending:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(_render_day, problems, number_range, concepts,
+                            os.path.join(output_dir, filename), include_answer_key): (iso_date, filename)
+                for iso_date, filename, problems, concepts in pending
+            }
+            failures = {}
+            for future in as_completed(futures):
+                iso_date, filename = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    failures[iso_date] = str(e)
+                    continue
+                done(iso_date, filename)
+
+        # Finished days stay cached, so a rerun only retries the failures
+        if failures:
+            first = min(failures)
+            raise RuntimeError(f"{len(failures)} day(s) failed to render; first ({first}): {failures[first]}")
+
+    return dict(sorted(results.items()))
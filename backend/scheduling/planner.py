@@ -0,0 +1,132 @@
+# scheduling/planner.py
+
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+
+# School days after a concept's introduction on which it comes back for review
+REVIEW_OFFSETS = (1, 3, 7, 14, 28)
+
+# After the last review offset, a concept is revisited this often (school days)
+MAINTENANCE_INTERVAL = 14
+
+# Problems per concept on its introduction day, early reviews and later reviews
+INTRODUCTION_WEIGHT = 3
+EARLY_REVIEW_WEIGHT = 2
+LATE_REVIEW_WEIGHT = 1
+
+# Reviews at or before this offset count as early
+EARLY_REVIEW_LIMIT = 7
+
+
+class DayPlan:
+    """The concepts on one day's worksheet and how many problems each gets"""
+
+    def __init__(self, day: date, index: int, concepts: List[Tuple[str, int]]):
+        self.day = day
+        self.index = index
+        self.concepts = concepts
+
+    @property
+    def problem_count(self) -> int:
+        return sum(count for _, count in self.concepts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "date": self.day.isoformat(),
+            "index": self.index,
+            "concepts": [{"concept": c, "count": n} for c, n in self.concepts],
+        }
+
+
+class SpiralScheduler:
+    """
+    Spaced-repetition plan for a term of daily spiral worksheets.
+
+    Concepts are introduced in the given order, one every `introduce_every`
+    school days. After its introduction a concept returns on an expanding
+    schedule (REVIEW_OFFSETS, then every MAINTENANCE_INTERVAL days), with more
+    problems while it is new. Any room left on a worksheet goes to the
+    introduced concepts that have gone longest without practice, so each day
+    interleaves several concepts rather than blocking on one.
+    """
+
+    def __init__(self, concepts: List[str], start_date: date, school_days: int = 90,
+                 problems_per_day: int = 12, introduce_every: Optional[int] = None):
+        if not concepts:
+            raise ValueError("A schedule needs at least one concept")
+        if school_days < 1 or problems_per_day < 1:
+            raise ValueError("school_days and problems_per_day must be positive")
+
+        self.concepts = list(dict.fromkeys(concepts))
+        self.start_date = start_date
+        self.school_days = school_days
+        self.problems_per_day = problems_per_day
+
+        # By default, introduce everything within the first two thirds of the
+        # term so the final third is pure review
+        if introduce_every is None:
+            introduce_every = max(1, (school_days * 2 // 3) // len(self.concepts))
+        self.introduce_every = introduce_every
+
+    def school_dates(self) -> List[date]:
+        """The first `school_days` weekdays on or after the start date"""
+        dates = []
+        day = self.start_date
+        while len(dates) < self.school_days:
+            if day.weekday() < 5:
+                dates.append(day)
+            day += timedelta(days=1)
+        return dates
+
+    def _review_weight(self, age: int) -> int:
+        """Problems for a concept introduced `age` school days ago (0 if not due)"""
+        if age == 0:
+            return INTRODUCTION_WEIGHT
+        if age in REVIEW_OFFSETS:
+            return EARLY_REVIEW_WEIGHT if age <= EARLY_REVIEW_LIMIT else LATE_REVIEW_WEIGHT
+        last = REVIEW_OFFSETS[-1]
+        if age > last and (age - last) % MAINTENANCE_INTERVAL == 0:
+            return LATE_REVIEW_WEIGHT
+        return 0
+
+    def plan(self) -> List[DayPlan]:
+        """Compute the plan for every school day of the term"""
+        introduced_on = {c: i * self.introduce_every for i, c in enumerate(self.concepts)}
+        last_seen: Dict[str, int] = {}
+        days = []
+
+        for index, day in enumerate(self.school_dates()):
+            available = [c for c in self.concepts if introduced_on[c] <= index]
+
+            # Concepts due today, highest weight (newest) first
+            due = []
+            for concept in available:
+                weight = self._review_weight(index - introduced_on[concept])
+                if weight:
+                    due.append((concept, weight))
+            due.sort(key=lambda item: -item[1])
+
+            # Trim to the page budget, keeping the newest material
+            counts: List[Tuple[str, int]] = []
+            remaining = self.problems_per_day
+            for concept, weight in due:
+                if remaining <= 0:
+                    break
+                take = min(weight, remaining)
+                counts.append((concept, take))
+                remaining -= take
+
+            # Fill the rest with the least recently practiced concepts
+            scheduled = {c for c, _ in counts}
+            fillers = sorted(
+                (c for c in available if c not in scheduled),
+                key=lambda c: last_seen.get(c, -1)
+            )
+            for concept in fillers[:remaining]:
+                counts.append((concept, 1))
+
+            for concept, _ in counts:
+                last_seen[concept] = index
+            days.append(DayPlan(day, index, counts))
+
+        return days
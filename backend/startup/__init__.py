@@ -0,0 +1,3 @@
+# Startup Module
+
+from .warmup import mark_imports_done, readiness, run_warmup, start_warmup
\ No newline at end of file
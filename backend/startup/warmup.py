@@ -0,0 +1,100 @@
+# startup/warmup.py
+
+import importlib
+import io
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+# main.py imports this package first, so this approximates when app imports began
+_IMPORTS_STARTED = time.perf_counter()
+
+# Set WARMUP=0 to skip the warmup render (the instance is then ready at once)
+ENABLED = os.environ.get("WARMUP", "1") != "0"
+
+logger = logging.getLogger("k2.startup")
+
+
+class _WarmupState:
+    def __init__(self):
+        self.status = "pending"
+        self.import_ms: Optional[float] = None
+        self.warmup_ms: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+
+
+_state = _WarmupState()
+
+
+def mark_imports_done() -> None:
+    """Record how long the app's imports took; call once main.py has imported everything"""
+    if _state.import_ms is None:
+        _state.import_ms = round((time.perf_counter() - _IMPORTS_STARTED) * 1000, 1)
+
+
+def _step(name: str, fn):
+    started = time.perf_counter()
+    result = fn()
+    _state.steps[name] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def run_warmup() -> None:
+    """
+    Exercise the cold paths of a worksheet build once.
+
+    Imports the PDF renderer (ReportLab loads lazily, on first render),
+    generates a problem for every subcategory (first calls into each
+    generator and the template catalog), builds the shared paragraph styles
+    and renders a spiral worksheet with an answer key into memory, which
+    loads font metrics and fills the visuals' geometry caches. A failed
+    warmup is logged and the instance still reports ready: requests would
+    only pay the cold-start cost it was meant to hide.
+    """
+    from problem_generators.problems import _generators, expand_concepts, generate_mixed_problems
+
+    _state.status = "warming"
+    started = time.perf_counter()
+    try:
+        pdf_generator = _step("imports", lambda: importlib.import_module("pdf_reporting.pdf_generator"))
+        concepts = expand_concepts(list(_generators))
+        problems = _step("generators", lambda: generate_mixed_problems(
+            "intermediate", [(concept, 1) for concept in concepts]))
+        _step("styles", pdf_generator._build_styles)
+        _step("render", lambda: pdf_generator.create_worksheet_pdf(
+            problems, "spiral", "intermediate", [], io.BytesIO(), include_answer_key=True))
+    except Exception as e:
+        _state.error = f"{type(e).__name__}: {e}"
+        logger.exception("warmup failed")
+    _state.warmup_ms = round((time.perf_counter() - started) * 1000, 1)
+    _state.status = "ready"
+    _state.done.set()
+    logger.info("warmup finished in %.0f ms (imports %s ms)", _state.warmup_ms, _state.import_ms)
+
+
+def start_warmup() -> None:
+    """Run the warmup on a background thread so the server can answer health checks meanwhile"""
+    mark_imports_done()
+    if not ENABLED:
+        _state.status = "ready"
+        _state.done.set()
+        return
+    if _state.status == "pending":
+        _state.status = "warming"
+        threading.Thread(target=run_warmup, name="warmup", daemon=True).start()
+
+
+def readiness() -> Dict[str, Any]:
+    """Warmup status and timings, for the /ready endpoint"""
+    return {
+        "ready": _state.done.is_set(),
+        "status": _state.status,
+        "import_ms": _state.import_ms,
+        "warmup_ms": _state.warmup_ms,
+        "steps": dict(_state.steps),
+        "error": _state.error,
+    }
\ No newline at end of file